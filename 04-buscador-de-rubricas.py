@@ -1,8 +1,36 @@
-import streamlit as st
-import pdfplumber
 import re
+import time
+
+import streamlit as st
 import pandas as pd
 
+from catalogo_rubricas import buscar_catalogo, montar_catalogo
+from cubo_hiscre import STATUS_CUBO, detalhar, gerar_planilha_cubo, montar_cubo, tabela_competencias
+from cache_hiscre import gravar_documento, ler_documento, limpar_cache, resumo_cache
+from lote_hiscre import (
+    arquivos_do_lote,
+    gerar_planilha,
+    processar_arquivos,
+    registros_consolidados,
+    tabela_situacao,
+    totais_por_competencia,
+)
+from extrator_hiscre import (
+    BACKEND_PADRAO,
+    BACKENDS,
+    COLUNAS_REGISTROS,
+    PAGINAS_JANELA,
+    compilar_filtro_rubricas,
+    extrair_documento,
+    extrair_documento_incremental,
+    filtrar_rubricas,
+    formatar_exibicao,
+    formatar_moeda_serie,
+    hash_conteudo,
+    ler_conteudo,
+    resumir_rubricas,
+)
+
 # Configuração da página
 st.set_page_config(
     page_title="Buscador de rubricas do HISCRE",
@@ -111,109 +139,75 @@ if 'dados_extracao' not in st.session_state:
 if 'rubricas_analise' not in st.session_state:
     st.session_state.rubricas_analise = None
 
+# Documento processado uma única vez por hash do arquivo; análise e busca
+# são consultas em memória sobre a tabela de registros
+@st.cache_data(show_spinner=False, max_entries=8)
+def carregar_documento(hash_arquivo, _conteudo, usar_cache_local=True, backend=BACKEND_PADRAO,
+                       baixa_memoria=False, paginas_janela=PAGINAS_JANELA):
+    # Reenvio de um PDF já processado: lê a tabela do cache local sem abrir o PDF
+    if usar_cache_local:
+        documento = ler_documento(hash_arquivo, backend)
+        if documento is not None:
+            return documento
+    documento = extrair_documento(_conteudo, backend=backend, baixa_memoria=baixa_memoria, paginas_janela=paginas_janela)
+    if usar_cache_local:
+        gravar_documento(documento)
+    return documento
+
+def documento_processado(conteudo):
+    """Documento já extraído nesta sessão ou no cache local, sem abrir o PDF"""
+    hash_arquivo = hash_conteudo(conteudo)
+    backend = st.session_state.get("backend_pdf", BACKEND_PADRAO)
+    documento = st.session_state.get("documento_hiscre")
+    if documento is not None and documento['hash'] == hash_arquivo and documento['backend'] == backend:
+        return documento
+    if st.session_state.get("usar_cache_local", True):
+        documento = ler_documento(hash_arquivo, backend)
+        if documento is not None:
+            st.session_state.documento_hiscre = documento
+        return documento
+    return None
+
+def obter_documento(file):
+    conteudo = ler_conteudo(file)
+    documento = documento_processado(conteudo)
+    if documento is None:
+        documento = carregar_documento(
+            hash_conteudo(conteudo),
+            conteudo,
+            st.session_state.get("usar_cache_local", True),
+            st.session_state.get("backend_pdf", BACKEND_PADRAO),
+            st.session_state.get("baixa_memoria", False),
+            st.session_state.get("paginas_janela", PAGINAS_JANELA)
+        )
+        st.session_state.documento_hiscre = documento
+    return documento
+
 # Função para extrair dados da busca
 def extrair_dados_pdf(file, rubricas_filtrar):
-    dados = []
-    nome = ""
-    nbs = set()
-    competencia_atual = None
-    status_atual = None
-
-    with pdfplumber.open(file) as pdf:
-        for num_pagina, pagina in enumerate(pdf.pages, start=1):
-            texto = pagina.extract_text()
-            if texto:
-                linhas = texto.split('\n')
-                for linha in linhas:
-                    # Capturar Nome
-                    nome_match = re.search(r'Nome:\s*([A-Z\s\.\-ÇÃÁÉÍÓÚÂÊÔ]+)', linha)
-                    if nome_match:
-                        nome = nome_match.group(1).strip()
-
-                    # Capturar NB
-                    nb_match = re.findall(r'NB:\s*([\d\.\-]+)', linha)
-                    if nb_match:
-                        nbs.update(nb_match)
-
-                    # Ignorar linhas irrelevantes
-                    if (
-                        re.search(r'Compet\.\s*Inicial', linha, re.IGNORECASE)
-                        or re.search(r'Compet\.\s*Final', linha, re.IGNORECASE)
-                        or re.search(r'Nasc', linha, re.IGNORECASE)
-                        or re.search(r'Data de Nascimento', linha, re.IGNORECASE)
-                        or re.search(r'\d{2}/[A-Za-z]{3}/\d{4}\s+\d{2}:\d{2}:\d{2}', linha)
-                    ):
-                        continue
-
-                    # Atualizar competência
-                    comp_match = re.match(r'^(\d{2}/\d{4})', linha.strip())
-                    if comp_match and not re.match(r'^\d{3}\s', linha.strip()):
-                        competencia_atual = comp_match.group(1)
-
-                    # Status
-                    if "Pago" in linha:
-                        status_atual = "Pago"
-                    elif "Não Pago" in linha:
-                        status_atual = "Não Pago"
-
-                    # Rubrica
-                    rubrica_match = re.match(r'^(\d{3})\s+([A-Z0-9\s\.\-ÇÃÁÉÍÓÚÂÊÔ\/]+)\s+R\$[\s]*([\d\.,]+)', linha)
-                    if rubrica_match:
-                        rubrica = rubrica_match.group(1)
-                        descricao = rubrica_match.group(2).strip()
-                        valor_texto = rubrica_match.group(3).replace('.', '').replace(',', '.')
-                        valor_float = float(valor_texto)
-                        if not rubricas_filtrar or rubrica in rubricas_filtrar:
-                            dados.append({
-                                'p.p HISCRE': num_pagina,
-                                'Comp.': competencia_atual if competencia_atual else "Não encontrada",
-                                'Rubrica': rubrica,
-                                'Descrição': descricao,
-                                'Valor (R$)': valor_float,
-                                'Status': status_atual if status_atual else "Não encontrado"
-                            })
-
-    df = pd.DataFrame(dados)
-    if not df.empty:
-        # Ordenar por competência
-        df['Ordenar'] = pd.to_datetime(df['Comp.'].str.extract(r'(\d{2})/(\d{4})').apply(
-            lambda x: f"{x[1]}-{x[0]}-01", axis=1), errors='coerce')
-        df = df.sort_values(by='Ordenar').drop(columns=['Ordenar'])
-
-        # Formatar valor para Real
-        df['Valor (R$)'] = df['Valor (R$)'].map(lambda x: f"R$ {x:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
-
-        df = df.reset_index(drop=True)
-
-    return nome, list(nbs), df
+    documento = obter_documento(file)
+    df = filtrar_rubricas(documento['registros'], rubricas_filtrar)
+    return documento['nome'], documento['nbs'], df
+
+# Busca página a página: gera (páginas lidas, total de páginas, novas linhas da
+# busca, documento completo no último passo) para a tela ir mostrando o resultado
+def extrair_dados_pdf_incremental(file, rubricas_filtrar):
+    filtro = set(rubricas_filtrar)
+    posicao_rubrica = COLUNAS_REGISTROS.index('rubrica')
+    backend = st.session_state.get("backend_pdf", BACKEND_PADRAO)
+    for evento in extrair_documento_incremental(
+        ler_conteudo(file),
+        backend,
+        st.session_state.get("baixa_memoria", False),
+        st.session_state.get("paginas_janela", PAGINAS_JANELA)
+    ):
+        novos = [r for r in evento['registros'] if not filtro or r[posicao_rubrica] in filtro]
+        yield evento['pagina'], evento['total_paginas'], novos, evento.get('documento')
 
 # Função para extrair todas as rubricas para análise
 def extrair_todas_rubricas(file):
-    rubricas_encontradas = {}
-    
-    with pdfplumber.open(file) as pdf:
-        for num_pagina, pagina in enumerate(pdf.pages, start=1):
-            texto = pagina.extract_text()
-            if texto:
-                linhas = texto.split('\n')
-                for linha in linhas:
-                    # Padrão para identificar rubricas
-                    rubrica_match = re.match(r'^(\d{3})\s+([A-Z0-9\s\.\-ÇÃÁÉÍÓÚÂÊÔ\/]+)\s+R\$[\s]*([\d\.,]+)', linha)
-                    if rubrica_match:
-                        rubrica = rubrica_match.group(1)
-                        descricao = rubrica_match.group(2).strip()
-                        
-                        if rubrica in rubricas_encontradas:
-                            rubricas_encontradas[rubrica]["ocorrencias"] += 1
-                        else:
-                            descricao_ref = descricoes_rubricas.get(rubrica, "Não encontrada na referência")
-                            rubricas_encontradas[rubrica] = {
-                                "descricao_doc": descricao,
-                                "descricao_ref": descricao_ref,
-                                "ocorrencias": 1
-                            }
-    
-    return rubricas_encontradas
+    documento = obter_documento(file)
+    return resumir_rubricas(documento['registros'], descricoes_rubricas)
 
 # Upload de arquivo na sidebar
 with st.sidebar:
@@ -243,8 +237,50 @@ with st.sidebar:
                 st.session_state.uploaded_file = None
                 st.session_state.dados_extracao = None
                 st.session_state.rubricas_analise = None
+                st.session_state.documento_hiscre = None
                 st.rerun()
 
+    # Leitor de PDF e cache local dos documentos já processados
+    st.markdown("---")
+    st.selectbox(
+        "📖 Leitor de PDF",
+        list(BACKENDS),
+        index=list(BACKENDS).index(BACKEND_PADRAO),
+        format_func=BACKENDS.get,
+        key="backend_pdf",
+        help="O PyMuPDF é mais rápido; páginas com layout duvidoso são relidas "
+             "automaticamente pelo pdfplumber."
+    )
+    st.checkbox(
+        "💾 Guardar documentos processados no cache local",
+        value=True,
+        key="usar_cache_local",
+        help="Reenvios do mesmo PDF não precisam ser lidos novamente. "
+             "O cache fica na pasta definida por HISCRE_CACHE_DIR."
+    )
+    resumo = resumo_cache()
+    st.caption(f"Cache local: {resumo['documentos']} documento(s), {resumo['tamanho'] / (1024 * 1024):.1f} MB")
+    if st.button("🧹 Limpar cache local", use_container_width=True):
+        limpar_cache()
+        carregar_documento.clear()
+        st.rerun()
+
+    # Documentos muito grandes: PDF lido em janelas de páginas e registros em colunas
+    st.markdown("---")
+    st.checkbox(
+        "🪶 Modo de baixa memória",
+        value=False,
+        key="baixa_memoria",
+        help="Para HISCRE com milhares de páginas: o processamento fica em um só "
+             "processo e só uma janela de páginas do PDF é mantida aberta."
+    )
+    if st.session_state.baixa_memoria:
+        st.number_input("Páginas abertas por vez", min_value=10, max_value=1000, value=PAGINAS_JANELA,
+                        step=10, key="paginas_janela")
+    memoria = (st.session_state.get("documento_hiscre") or {}).get('memoria')
+    if memoria and memoria['pico_rss_mb'] is not None:
+        st.caption(f"Pico de memória do processo: {memoria['pico_rss_mb']:.0f} MB")
+
 # CATEGORIAS DE REFERÊNCIA DE RUBRICAS
 rubrica_exemplos_mais_comuns = """
 **Exemplos de rubrica:**
@@ -404,8 +440,22 @@ categorias_rubricas = {
     "Exemplos": rubrica_exemplos_mais_comuns
 }
 
+# Códigos de cada categoria, lidos das tabelas acima (faixas como 219-250 são expandidas)
+def codigos_markdown(texto):
+    codigos = set()
+    for inicio, fim in re.findall(r'^(?:\|\s*|- \*\*)(\d{3})(?:\s*-\s*(\d{3}))?', texto, re.MULTILINE):
+        codigos.update(f"{codigo:03d}" for codigo in range(int(inicio), int(fim or inicio) + 1))
+    return frozenset(codigos)
+
+codigos_por_categoria = {categoria: codigos_markdown(conteudo) for categoria, conteudo in categorias_rubricas.items()}
+
+# Catálogo estruturado com índice de busca, montado uma vez por processo
+@st.cache_resource
+def catalogo_referencia():
+    return montar_catalogo(descricoes_rubricas, categorias_rubricas)
+
 # NOVA ORDEM DAS ABAS
-aba1, aba2, aba3 = st.tabs(["📋 Referência de Rubricas", "📊 Análise de Rubricas", "🔍 Buscador de Rubricas"])
+aba1, aba2, aba3, aba4 = st.tabs(["📋 Referência de Rubricas", "📊 Análise de Rubricas", "🔍 Buscador de Rubricas", "📦 Processamento em Lote"])
 
 with aba1:
     st.title("📋 Referência de Rubricas do HISCRE")
@@ -422,20 +472,19 @@ with aba1:
     # Adicionar campo de busca
     busca_rubrica = st.text_input("🔍 Buscar rubrica por código ou descrição:", placeholder="Ex: 101 ou mensalidade", key="busca_ref")
     
-    # Criar abas para as categorias
-    tabs = st.tabs(list(categorias_rubricas.keys()))
-    
-    for i, (categoria, conteudo) in enumerate(categorias_rubricas.items()):
-        with tabs[i]:
-            # Se houver uma busca, filtrar o conteúdo
-            if busca_rubrica:
-                linhas = conteudo.split('\n')
-                linhas_filtradas = [linha for linha in linhas if busca_rubrica.lower() in linha.lower()]
-                if linhas_filtradas:
-                    st.markdown("\n".join(linhas_filtradas))
-                else:
-                    st.info(f"Nenhuma rubrica encontrada com '{busca_rubrica}' na categoria {categoria}")
-            else:
+    if busca_rubrica:
+        encontradas = buscar_catalogo(catalogo_referencia(), busca_rubrica)
+        if encontradas.empty:
+            st.info(f"Nenhuma rubrica encontrada com '{busca_rubrica}'")
+        else:
+            st.caption(f"{len(encontradas)} resultado(s) em {encontradas['Categoria'].nunique()} categoria(s)")
+            st.dataframe(encontradas, use_container_width=True, hide_index=True)
+    else:
+        # Criar abas para as categorias
+        tabs = st.tabs(list(categorias_rubricas.keys()))
+        
+        for i, conteudo in enumerate(categorias_rubricas.values()):
+            with tabs[i]:
                 st.markdown(conteudo)
 
 with aba2:
@@ -501,13 +550,70 @@ with aba2:
             rubricas_nao_encontradas = df_rubricas[df_rubricas['Descrição de Referência'] == "Não encontrada na referência"]
             st.dataframe(rubricas_nao_encontradas[['Rubrica', 'Descrição no Documento']], use_container_width=True)
 
+        # Totais por competência × rubrica × status, montados a partir dos registros já extraídos
+        documento = documento_processado(ler_conteudo(st.session_state.uploaded_file))
+        if documento is not None and not documento['registros'].empty:
+            st.markdown("---")
+            st.subheader("📅 Totais por Competência")
+            cubo = montar_cubo(documento['registros'])
+
+            col1, col2 = st.columns([1, 2])
+            with col1:
+                status_cubo = st.radio("Status", ["Todos", *STATUS_CUBO], horizontal=True, key="status_cubo")
+            with col2:
+                rubricas_cubo = st.multiselect("Rubricas", sorted(cubo['rubrica'].unique()), key="rubricas_cubo",
+                                               placeholder="Todas as rubricas")
+
+            tabela_cubo = tabela_competencias(cubo, None if status_cubo == "Todos" else status_cubo, rubricas_cubo)
+            if tabela_cubo.empty:
+                st.info("Nenhum valor para o filtro selecionado.")
+            else:
+                exibicao_cubo = tabela_cubo.copy()
+                for coluna in exibicao_cubo.columns[1:]:
+                    exibicao_cubo[coluna] = formatar_moeda_serie(exibicao_cubo[coluna])
+                st.dataframe(exibicao_cubo, use_container_width=True, hide_index=True)
+
+            # Drill-down: ano inteiro ou uma competência, com as linhas do documento
+            periodos = cubo['periodo'].dropna()
+            col1, col2 = st.columns(2)
+            with col1:
+                ano_cubo = st.selectbox("Detalhar ano", sorted(periodos.dt.year.unique(), reverse=True), key="ano_cubo")
+            with col2:
+                meses = sorted(periodos[periodos.dt.year == ano_cubo].dt.month.unique())
+                mes_cubo = st.selectbox("Competência", [None, *meses], key="mes_cubo",
+                                        format_func=lambda mes: "Ano inteiro" if mes is None else f"{mes:02d}/{ano_cubo}")
+
+            detalhe = detalhar(cubo, ano_cubo, mes_cubo)
+            for coluna in detalhe.columns[1:-1]:
+                detalhe[coluna] = formatar_moeda_serie(detalhe[coluna])
+            st.dataframe(detalhe, use_container_width=True, hide_index=True)
+
+            with st.expander("Linhas do documento"):
+                linhas = filtrar_rubricas(documento['registros'], rubricas_cubo)
+                if not linhas.empty:
+                    selecao = linhas['Período'].dt.year == ano_cubo
+                    if mes_cubo:
+                        selecao &= linhas['Período'].dt.month == mes_cubo
+                    if status_cubo != "Todos":
+                        selecao &= linhas['Status'] == status_cubo
+                    linhas = formatar_exibicao(linhas[selecao])
+                st.dataframe(linhas, use_container_width=True, hide_index=True)
+
+            st.download_button(
+                label="⬇️ Baixar Totais por Competência (XLSX)",
+                data=gerar_planilha_cubo(cubo),
+                file_name='totais_competencia_hiscre.xlsx',
+                mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+                key="download_cubo"
+            )
+
 with aba3:
     st.title("🔍 Buscador de Rubricas no HISCRE")
 
     st.markdown("""
     ---
     ### ℹ️ **Como funciona:**
-    - Informe até 4 rubricas específicas para buscar (ou deixe em branco para trazer todas)
+    - Informe rubricas, faixas (ex.: 201-217) ou categorias para buscar (ou deixe em branco para trazer todas)
     - O sistema identifica o **Nome**, os **NBs**, e traz as rubricas com suas **competências, descrição, valor, status e página**
     - Organiza em ordem cronológica por competência
     - Você pode baixar o resultado em CSV
@@ -517,59 +623,85 @@ with aba3:
     # Seção de entrada de rubricas
     st.subheader("🔎 Rubricas para Busca")
 
-    col1, col2 = st.columns(2)
-    with col1:
-        rubrica1 = st.text_input("Rubrica 1 (ex.: 101)", key="r1")
-        if rubrica1.strip() != "":
-            descricao = descricoes_rubricas.get(rubrica1.strip())
-            if descricao:
-                st.caption(f"Descrição: {descricao}")
-            else:
-                st.caption("Rubrica não encontrada.")
-
-        rubrica3 = st.text_input("Rubrica 3", key="r3")
-        if rubrica3.strip() != "":
-            descricao = descricoes_rubricas.get(rubrica3.strip())
-            if descricao:
-                st.caption(f"Descrição: {descricao}")
-            else:
-                st.caption("Rubrica não encontrada.")
-
-    with col2:
-        rubrica2 = st.text_input("Rubrica 2", key="r2")
-        if rubrica2.strip() != "":
-            descricao = descricoes_rubricas.get(rubrica2.strip())
-            if descricao:
-                st.caption(f"Descrição: {descricao}")
-            else:
-                st.caption("Rubrica não encontrada.")
-
-        rubrica4 = st.text_input("Rubrica 4", key="r4")
-        if rubrica4.strip() != "":
-            descricao = descricoes_rubricas.get(rubrica4.strip())
-            if descricao:
-                st.caption(f"Descrição: {descricao}")
-            else:
-                st.caption("Rubrica não encontrada.")
-
-    rubricas_busca = [r.strip() for r in [rubrica1, rubrica2, rubrica3, rubrica4] if r.strip() != '']
+    termos_busca = st.text_area(
+        "Rubricas, faixas ou categorias (separadas por vírgula)",
+        placeholder="Ex.: 101, 201-217, Consignações",
+        height=68,
+        key="termos_busca"
+    )
+    categorias_busca = st.multiselect(
+        "Incluir categorias inteiras",
+        list(codigos_por_categoria),
+        key="categorias_busca"
+    )
+
+    # A busca é compilada uma vez em um conjunto de códigos
+    rubricas_busca, termos_invalidos = compilar_filtro_rubricas(
+        ", ".join([termos_busca] + categorias_busca), codigos_por_categoria
+    )
+    if termos_invalidos:
+        st.warning(f"Termos não reconhecidos: {', '.join(termos_invalidos)}")
+    if rubricas_busca:
+        with st.expander(f"📌 {len(rubricas_busca)} rubrica(s) selecionada(s)"):
+            st.dataframe(
+                pd.DataFrame(
+                    [(codigo, descricoes_rubricas.get(codigo, "Rubrica não encontrada.")) for codigo in sorted(rubricas_busca)],
+                    columns=["Rubrica", "Descrição"]
+                ),
+                hide_index=True,
+                use_container_width=True
+            )
 
     # Botão de execução da busca
     executar_busca = st.button("🚀 Executar Busca", use_container_width=True, key="exec_busca")
     
+    # O botão de cancelar interrompe a execução em andamento (o Streamlit
+    # reinicia o script) e a busca parcial é descartada
+    if st.session_state.get("cancelar_busca"):
+        st.info("⏹️ Busca cancelada. Clique em 'Executar Busca' para recomeçar.")
+
     if executar_busca:
         if st.session_state.uploaded_file is None:
             st.warning("⚠️ Por favor, faça upload do PDF primeiro na sidebar.")
+        elif documento_processado(ler_conteudo(st.session_state.uploaded_file)) is not None:
+            # Documento já lido: a busca é só uma consulta na tabela em memória
+            nome, lista_nbs, df = extrair_dados_pdf(st.session_state.uploaded_file, rubricas_busca)
+            st.session_state.dados_extracao = {
+                'nome': nome,
+                'lista_nbs': lista_nbs,
+                'df': df,
+                'mostrar_pagos': False
+            }
+            st.success("Busca concluída!")
         else:
-            with st.spinner("⏳ Processando busca..."):
-                nome, lista_nbs, df = extrair_dados_pdf(st.session_state.uploaded_file, rubricas_busca)
-                st.session_state.dados_extracao = {
-                    'nome': nome,
-                    'lista_nbs': lista_nbs,
-                    'df': df,
-                    'mostrar_pagos': False
-                }
-                st.success("Busca concluída!")
+            st.button("⏹️ Cancelar busca", key="cancelar_busca")
+            progresso = st.progress(0.0, text="⏳ Lendo o documento...")
+            parcial = st.empty()
+            linhas = []
+            ultima_exibicao = 0.0
+            for pagina, total_paginas, novos, documento in extrair_dados_pdf_incremental(
+                st.session_state.uploaded_file, rubricas_busca
+            ):
+                progresso.progress(pagina / total_paginas, text=f"⏳ Página {pagina} de {total_paginas}")
+                linhas.extend(novos)
+                # Redesenha a tabela parcial no máximo a cada meio segundo
+                if novos and (not ultima_exibicao or time.monotonic() - ultima_exibicao > 0.5):
+                    df_parcial = pd.DataFrame.from_records(linhas, columns=COLUNAS_REGISTROS)
+                    parcial.dataframe(formatar_exibicao(filtrar_rubricas(df_parcial, [])))
+                    ultima_exibicao = time.monotonic()
+            progresso.empty()
+            parcial.empty()
+
+            st.session_state.documento_hiscre = documento
+            if st.session_state.get("usar_cache_local", True):
+                gravar_documento(documento)
+            st.session_state.dados_extracao = {
+                'nome': documento['nome'],
+                'lista_nbs': documento['nbs'],
+                'df': filtrar_rubricas(documento['registros'], rubricas_busca),
+                'mostrar_pagos': False
+            }
+            st.success("Busca concluída!")
     
     # Exibição dos resultados da busca
     if st.session_state.dados_extracao is not None:
@@ -599,14 +731,97 @@ with aba3:
         if len(df_filtrado) == 0:
             st.info("Nenhuma rubrica encontrada para o filtro selecionado.")
         else:
-            st.dataframe(df_filtrado)
+            # Valores continuam numéricos na sessão; o formato em Real é aplicado só aqui
+            df_exibicao = formatar_exibicao(df_filtrado)
+            st.dataframe(df_exibicao)
             st.write(f"Quantidade de ocorrências exibidas: **{len(df_filtrado)}**")
 
             # Exportar o CSV
-            csv = df_filtrado.to_csv(index=False, sep=";", encoding='utf-8-sig')
+            csv = df_exibicao.to_csv(index=False, sep=";", encoding='utf-8-sig')
             st.download_button(
                 label="⬇️ Baixar CSV",
                 data=csv,
                 file_name='rubricas_por_competencia.csv',
                 mime='text/csv',
             )
+
+with aba4:
+    st.title("📦 Processamento de HISCRE em Lote")
+
+    st.markdown("""
+    ---
+    ### ℹ️ **Como funciona:**
+    - Envie vários PDFs de HISCRE de uma vez (ou um arquivo ZIP com os PDFs)
+    - Os documentos são processados em paralelo; os já lidos antes vêm do cache local
+    - O resultado é uma planilha com uma aba por beneficiário e o **total de cada rubrica por competência** de todo o lote
+    - A tabela de situação mostra o tempo de cada arquivo e os erros de leitura
+    ---
+    """)
+
+    arquivos_lote = st.file_uploader(
+        "Selecione os PDFs ou ZIPs",
+        type=["pdf", "zip"],
+        accept_multiple_files=True,
+        key="uploader_lote"
+    )
+
+    if st.button("🚀 Processar Lote", use_container_width=True, key="exec_lote", disabled=not arquivos_lote):
+        arquivos = arquivos_do_lote([(arquivo.name, arquivo.getvalue()) for arquivo in arquivos_lote])
+        if not arquivos:
+            st.warning("⚠️ Nenhum PDF encontrado nos arquivos enviados.")
+        else:
+            progresso = st.progress(0.0, text=f"⏳ 0 de {len(arquivos)} arquivos")
+            concluidos = []
+
+            def atualizar_progresso(resultado):
+                concluidos.append(resultado)
+                progresso.progress(
+                    len(concluidos) / len(arquivos),
+                    text=f"⏳ {len(concluidos)} de {len(arquivos)} arquivos ({resultado['arquivo']})"
+                )
+
+            usar_cache = st.session_state.get("usar_cache_local", True)
+            inicio_lote = time.perf_counter()
+            resultados = processar_arquivos(
+                arquivos,
+                backend=st.session_state.get("backend_pdf", BACKEND_PADRAO),
+                ler_cache=ler_documento if usar_cache else None,
+                gravar_cache=gravar_documento if usar_cache else None,
+                ao_concluir=atualizar_progresso
+            )
+            progresso.empty()
+            st.session_state.resultado_lote = {
+                'situacao': tabela_situacao(resultados),
+                'totais': totais_por_competencia(registros_consolidados(resultados)),
+                'planilha': gerar_planilha(resultados),
+                'tempo': time.perf_counter() - inicio_lote
+            }
+
+    if st.session_state.get("resultado_lote"):
+        lote = st.session_state.resultado_lote
+        situacao = lote['situacao']
+        erros = situacao[situacao['Erro'] != ""]
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Arquivos", len(situacao))
+        with col2:
+            st.metric("Com erro", len(erros))
+        with col3:
+            st.metric("Tempo total", f"{lote['tempo']:.1f} s")
+
+        st.subheader("📄 Situação por arquivo")
+        st.dataframe(situacao, use_container_width=True, hide_index=True)
+        if not erros.empty:
+            st.warning(f"⚠️ {len(erros)} arquivo(s) não puderam ser lidos.")
+
+        st.subheader("📊 Totais por competência (todo o lote)")
+        st.dataframe(lote['totais'], use_container_width=True, hide_index=True)
+
+        st.download_button(
+            label="⬇️ Baixar Planilha Consolidada",
+            data=lote['planilha'],
+            file_name='hiscre_lote_consolidado.xlsx',
+            mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            key="download_lote"
+        )
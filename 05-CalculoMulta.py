@@ -1,14 +1,22 @@
 import streamlit as st
 from datetime import date, timedelta, datetime
-from collections import defaultdict
 import locale
 import pandas as pd
-import requests
-from fpdf import FPDF
-import tempfile
-from workalendar.america import Brazil
-import json
-import base64
+
+from calculo_multa import (
+    NOTA_CENTAVOS,
+    calcular_resultado,
+    contar_dias_faixa,
+    gerar_pdf_multa,
+    resumo_meses,
+    totalizar_faixas_incremental,
+)
+from calendario_forense import calcular_data_final, calcular_inicio_multa, resumo_calendario
+from indices_selic import atualizar_selic, conferir_cobertura, indices_correcao, interpretar_indices_colados, resumo_selic, serie_selic
+from logos_relatorio import LOGO_TJPE, logo_pdf
+from lote_multa import gerar_pdf_lote, gerar_planilha_lote, gerar_zip_pdfs, ler_casos, processar_casos, tabela_casos
+from sessao_multa import EXTENSAO_SESSAO, ler_sessao, serializar_sessao
+import time
 from unidecode import unidecode
 
 # ======= Funções utilitárias =======
@@ -29,141 +37,83 @@ def moeda_br(valor):
         return locale.currency(valor, grouping=True)
     return f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
 
-def calcular_data_final(data_inicio, num_dias, dias_uteis=False):
-    cal = Brazil() if dias_uteis else None
-    if dias_uteis:
-        data_final = data_inicio
-        dias_contados = 1
-        while dias_contados < num_dias:
-            data_final += timedelta(days=1)
-            if cal.is_working_day(data_final) and data_final.weekday() < 5:
-                dias_contados += 1
-    else:
-        data_final = data_inicio + timedelta(days=num_dias - 1)
-    return data_final
-
 def get_selic_rates():
-    url = "https://raw.githubusercontent.com/carlospatrickds/vscode_python/master/selic.csv"
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        meses_pt_eng = {
-            'jan': 'Jan', 'fev': 'Feb', 'mar': 'Mar', 'abr': 'Apr',
-            'mai': 'May', 'jun': 'Jun', 'jul': 'Jul', 'ago': 'Aug',
-            'set': 'Sep', 'out': 'Oct', 'nov': 'Nov', 'dez': 'Dec',
-            'mr': 'Mar', 'det': 'Dec'
-        }
-        dados = []
-        for linha in response.text.split('\n'):
-            linha = linha.strip()
-            if ';' in linha:
-                partes = linha.split(';')
-                if len(partes) >= 2:
-                    mes_ano = partes[0].strip().lower()
-                    taxa = partes[1].strip()
-                    mes = mes_ano[:3]
-                    ano = ''.join(c for c in mes_ano[3:] if c.isdigit())
-                    if len(ano) == 2:
-                        ano = '20' + ano
-                    elif len(ano) == 1:
-                        ano = '200' + ano
-                    taxa_limpa = ''.join(c for c in taxa.replace(',', '.') if c.isdigit() or c == '.')
-                    if mes in meses_pt_eng and ano and taxa_limpa:
-                        try:
-                            mes_eng = meses_pt_eng[mes]
-                            data = f"{mes_eng}/{ano}"
-                            taxa_float = float(taxa_limpa)
-                            dados.append({'Data': data, 'Taxa': taxa_float})
-                        except (ValueError, KeyError):
-                            continue
-        if not dados:
-            st.error("Nenhum dado válido encontrado no arquivo SELIC")
-            return None
-        df = pd.DataFrame(dados)
-        df['Data'] = pd.to_datetime(df['Data'], format='%b/%Y', errors='coerce')
-        df = df.dropna(subset=['Data', 'Taxa'])
-        df = df.sort_values('Data')
-        return df[['Data', 'Taxa']]
+        df = serie_selic()
     except Exception as e:
         st.error(f"Erro ao carregar dados SELIC: {str(e)}")
-        if 'response' in locals():
-            st.error(f"Conteúdo recebido (primeiros 200 caracteres): {response.text[:200]}")
         return None
+    return df
+
+def atualizar_indices_selic():
+    try:
+        novos = atualizar_selic()
+        st.success(f"SELIC atualizada: {novos} mês(es) novo(s).")
+    except Exception as e:
+        st.error(f"Erro ao atualizar dados SELIC: {str(e)}")
 
 def calcular_correcao_selic(totais_mensais, data_atualizacao):
-    selic_data = get_selic_rates()
-    if selic_data is None:
+    if get_selic_rates() is None:
         st.error("Dados SELIC não disponíveis para cálculo")
         return None
-    if isinstance(data_atualizacao, date):
-        data_atualizacao = datetime(data_atualizacao.year, data_atualizacao.month, data_atualizacao.day)
-    indices_selic = {}
-    meses_ordenados = sorted(totais_mensais.keys())
-    for mes_str in meses_ordenados:
-        ano, mes = map(int, mes_str.split('-'))
-        data_mes = datetime(ano, mes, 1)
-        fator_correcao = 1.0
-        data_correcao = data_mes
-        while data_correcao <= data_atualizacao:
-            mes_data = selic_data[
-                (selic_data['Data'].dt.year == data_correcao.year) & 
-                (selic_data['Data'].dt.month == data_correcao.month)
-            ]
-            if not mes_data.empty:
-                taxa_mes = mes_data.iloc[0]['Taxa']
-                fator_correcao *= (1 + taxa_mes)
-            if data_correcao.month == 12:
-                data_correcao = datetime(data_correcao.year + 1, 1, 1)
-            else:
-                data_correcao = datetime(data_correcao.year, data_correcao.month + 1, 1)
-        indice_percentual = (fator_correcao - 1) * 100
-        indices_selic[mes_str] = indice_percentual
-    return indices_selic
-
-def distribuir_valores_por_mes(inicio, fim, valor_diario, dias_uteis=False, dias_abatidos=0):
-    valores_mes = defaultdict(float)
-    cal = Brazil() if dias_uteis else None
-    dia = inicio
-    dias_totais = 0
-    while dia <= fim:
-        if not dias_uteis or (cal.is_working_day(dia) and dia.weekday() < 5):
-            chave = dia.strftime("%Y-%m")
-            valores_mes[chave] += valor_diario
-            dias_totais += 1
-        dia += timedelta(days=1)
-    dias_totais = max(0, dias_totais - dias_abatidos)
-    if dias_abatidos > 0:
-        fator = dias_totais / (dias_totais + dias_abatidos) if (dias_totais + dias_abatidos) > 0 else 0
-        for mes in valores_mes:
-            valores_mes[mes] *= fator
-    return valores_mes, dias_totais
+    try:
+        conferir_cobertura(data_atualizacao)
+    except ValueError as e:
+        st.error(str(e))
+        return None
+    return indices_correcao(totais_mensais.keys(), data_atualizacao)
 
 def remover_faixa(idx):
     if 0 <= idx < len(st.session_state.faixas):
         st.session_state.faixas.pop(idx)
 
+# ======= Tabela de índices =======
+def definir_indices_manuais(indices):
+    """Troca os índices (%) da tabela editável; a tabela é recriada com os novos valores"""
+    st.session_state.indices_manuais = dict(indices)
+    st.session_state.versao_tabela_indices = st.session_state.get("versao_tabela_indices", 0) + 1
+
+def tabela_indices(meses, indices_manuais, indices_selic):
+    """DataFrame da tabela editável: um mês por linha, com o índice digitado ou o da SELIC"""
+    return pd.DataFrame({
+        "Mês/Ano": [f"{mes[5:]}/{mes[:4]}" for mes in meses],
+        "Índice (%)": [indices_manuais.get(mes, indices_selic.get(mes, 0.0)) for mes in meses],
+    }, index=meses).astype({"Índice (%)": float})
+
+def fonte_tabela_indices(meses, indices_selic):
+    """DataFrame de origem da tabela editável, guardado na sessão e reaproveitado nos
+    reruns; só é recriado (com a tabela) quando os meses, a SELIC ou a versão mudam"""
+    meses = tuple(meses)
+    selic = tuple(indices_selic.get(mes) for mes in meses)
+    fonte = st.session_state.get("fonte_tabela_indices")
+    versao = st.session_state.get("versao_tabela_indices", 0)
+    if fonte is not None and fonte[0] == versao and fonte[1:3] != (meses, selic):
+        # Linhas diferentes: as edições guardadas pelo editor antigo não valem mais
+        st.session_state.versao_tabela_indices = versao = versao + 1
+    if fonte is None or fonte[:3] != (versao, meses, selic):
+        fonte = (versao, meses, selic, tabela_indices(meses, st.session_state.indices_manuais, indices_selic))
+        st.session_state.fonte_tabela_indices = fonte
+    return fonte[3]
+
+def indices_editados(coluna_indices, indices_selic):
+    """Só as células que diferem da SELIC; célula apagada vale 0%, como no cálculo
+    (None quebraria as sessões das outras calculadoras)"""
+    valores = coluna_indices.fillna(0.0).astype(float)
+    return {mes: valor for mes, valor in valores.items() if valor != indices_selic.get(mes, 0.0)}
+
 # ======= Funções de Salvar/Abrir Arquivo =======
 def salvar_dados():
-    """Salva todos os dados atuais em um arquivo JSON codificado"""
+    """Salva todos os dados atuais em um arquivo de sessão (JSON colunar em gzip)"""
     dados = {
-        "data_despacho": st.session_state.get("data_despacho", date.today()).isoformat(),
+        "data_despacho": st.session_state.get("data_despacho", date.today()),
         "prazo_cumprimento": st.session_state.get("prazo_cumprimento", 15),
         "tipo_prazo": st.session_state.get("tipo_prazo", "Dias úteis"),
-        "faixas": [
-            {
-                "inicio": faixa["inicio"].isoformat(),
-                "fim": faixa["fim"].isoformat(),
-                "valor": faixa["valor"],
-                "dias_uteis": faixa.get("dias_uteis", False),
-                "dias_abatidos": faixa.get("dias_abatidos", 0)
-            }
-            for faixa in st.session_state.get("faixas", [])
-        ],
-        "data_atualizacao": st.session_state.get("data_atualizacao", date.today()).isoformat(),
+        "faixas": st.session_state.get("faixas", []),
+        "data_atualizacao": st.session_state.get("data_atualizacao", date.today()),
         "indices_selic": st.session_state.get("indices_selic", {}),
         "indices_manuais": {
-            key: value for key, value in st.session_state.items() 
-            if key.startswith("indice_") and isinstance(value, (int, float))
+            f"indice_{mes}": valor for mes, valor in st.session_state.get("indices_manuais", {}).items()
+            if isinstance(valor, (int, float)) and pd.notna(valor)
         },
         # Dados do processo
         "numero_processo": st.session_state.get("proc_input", ""),
@@ -174,41 +124,30 @@ def salvar_dados():
         "tam_obs": st.session_state.get("tam_obs", 8)
     }
     
-    # Codifica os dados em base64 para evitar problemas de encoding
-    dados_json = json.dumps(dados, ensure_ascii=False, indent=2)
-    dados_codificados = base64.b64encode(dados_json.encode('utf-8')).decode('utf-8')
-    
-    return dados_codificados
+    return serializar_sessao(dados)
 
-def carregar_dados(dados_codificados):
-    """Carrega dados de um arquivo JSON codificado"""
+def carregar_dados(conteudo):
+    """Carrega dados de um arquivo de sessão (o atual ou o .txt em base64 antigo)"""
     try:
-        dados_json = base64.b64decode(dados_codificados.encode('utf-8')).decode('utf-8')
-        dados = json.loads(dados_json)
+        dados = ler_sessao(conteudo)
         
         # Restaura os dados principais
-        st.session_state.data_despacho = date.fromisoformat(dados["data_despacho"])
+        st.session_state.data_despacho = dados["data_despacho"]
         st.session_state.prazo_cumprimento = dados["prazo_cumprimento"]
         st.session_state.tipo_prazo = dados["tipo_prazo"]
-        st.session_state.data_atualizacao = date.fromisoformat(dados["data_atualizacao"])
+        st.session_state.data_atualizacao = dados["data_atualizacao"]
         
         # Restaura as faixas
-        st.session_state.faixas = []
-        for faixa in dados["faixas"]:
-            st.session_state.faixas.append({
-                "inicio": date.fromisoformat(faixa["inicio"]),
-                "fim": date.fromisoformat(faixa["fim"]),
-                "valor": faixa["valor"],
-                "dias_uteis": faixa.get("dias_uteis", False),
-                "dias_abatidos": faixa.get("dias_abatidos", 0)
-            })
+        st.session_state.faixas = dados["faixas"]
         
         # Restaura índices SELIC
         st.session_state.indices_selic = dados.get("indices_selic", {})
         
         # Restaura índices manuais
-        for key, value in dados.get("indices_manuais", {}).items():
-            st.session_state[key] = value
+        definir_indices_manuais({
+            chave.removeprefix("indice_"): valor for chave, valor in dados.get("indices_manuais", {}).items()
+            if isinstance(valor, (int, float))
+        })
             
         # Restaura dados do processo
         st.session_state.proc_input = dados.get("numero_processo", "")
@@ -241,186 +180,21 @@ def limpar_dados():
     st.session_state.tam_obs = 8
     
     # Limpa índices manuais
-    keys_to_remove = [key for key in st.session_state.keys() if key.startswith("indice_")]
-    for key in keys_to_remove:
-        del st.session_state[key]
+    definir_indices_manuais({})
     
     st.success("Dados limpos com sucesso!")
 #daqui
 def gerar_pdf(res, numero_processo, nome_autor, nome_reu, observacao=None, fonte_obs="Arial", tam_obs=8):
     try:
-        FONT_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
-        pdf = FPDF()
-        pdf.add_page()
-        
-        # Configurar margens menores
-        pdf.set_margins(left=10, top=10, right=10)
-        
-        # === ADICIONAR LOGO CENTRALIZADA ===
+        logo = None
         try:
-            # URL da sua imagem no GitHub (usando raw.githubusercontent.com)
-            logo_url = "https://raw.githubusercontent.com/carlospatrickds/NovoRepositorio/main/PODER_JUD_PE_2.png"
-            
-            # Baixar a imagem
-            response = requests.get(logo_url)
-            response.raise_for_status()
-            
-            # Salvar temporariamente
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as tmp_img:
-                tmp_img.write(response.content)
-                tmp_img_path = tmp_img.name
-            
-            # Adicionar logo centralizada no topo
-            # Calcular posição centralizada: (largura_página - largura_imagem) / 2
-            largura_pagina = 190  # 210mm - 10mm de margem esquerda - 10mm direita
-            largura_imagem = 80   # Ajuste conforme necessário
-            posicao_x = (largura_pagina - largura_imagem) / 2 + 10  # +10 para compensar margem
-            
-            pdf.image(tmp_img_path, x=posicao_x, y=8, w=largura_imagem)
-            pdf.ln(55)  # Espaço após a logo
-######
-
-#######            
-            # Limpar arquivo temporário
-            import os
-            os.unlink(tmp_img_path)
-            
+            logo = logo_pdf(LOGO_TJPE)
         except Exception as img_error:
             st.warning(f"Não foi possível carregar a logo: {img_error}")
-            # Cabeçalho alternativo sem logo
-            pdf.set_font("Arial", "B", 12)
-            pdf.cell(0, 8, "Relatório de Multa Diária Corrigida", ln=True, align="C")
-            pdf.ln(5)
-        
-        # Configurar a fonte (com fallback)
-        try:
-            pdf.add_font("DejaVu", "", FONT_PATH, uni=True)
-            pdf.set_font("DejaVu", size=10)
-        except:
-            pdf.set_font("Arial", size=10)
-            st.warning("Fonte DejaVu não encontrada, usando Arial como fallback.")
-        
-        # Dados do processo (AGORA ABAIXO DA LOGO)
-        pdf.set_font("Arial", "", 11)
-        pdf.cell(0, 6, f"Número do Processo: {numero_processo}", ln=True)
-        pdf.cell(0, 6, f"Autor: {nome_autor}", ln=True)
-        pdf.cell(0, 6, f"Réu: {nome_reu}", ln=True)
-        pdf.ln(10)
-
-        #######
-        pdf.set_font("Arial", "B", 12)
-        pdf.cell(0, 8, "Relatório de Multa Diária Corrigida", ln=True, align="C")
-        pdf.ln(5)
-        #########
-
-        # Cálculo do Início da Multa
-        pdf.set_font("Arial", "B", 10)
-        pdf.cell(0, 6, "Cálculo do Início da Multa:", ln=True)
-        pdf.set_font("Arial", "", 10)
-        pdf.cell(90, 6, "Data do despacho/intimação:", 0, 0)
-        pdf.cell(0, 6, res['data_despacho'].strftime('%d/%m/%Y'), ln=True)
-        pdf.cell(90, 6, "Prazo para cumprimento:", 0, 0)
-        pdf.cell(0, 6, f"{res['prazo_cumprimento']} {res['tipo_prazo'].lower()}", ln=True)
-        pdf.cell(90, 6, "Fim do prazo:", 0, 0)
-        pdf.cell(0, 6, res['data_fim_prazo'].strftime('%d/%m/%Y'), ln=True)
-        pdf.cell(90, 6, "Início da multa:", 0, 0)
-        pdf.cell(0, 6, res['data_inicio_multa'].strftime('%d/%m/%Y'), ln=True)
-        pdf.ln(5)
-
-        # Detalhamento das Faixas
-        pdf.set_font("Arial", "B", 10)
-        pdf.cell(0, 6, "Detalhamento das Faixas:", ln=True)
-        pdf.set_font("Arial", "", 10)
-
-        for i, faixa in enumerate(st.session_state.faixas):
-            # CALCULA DIAS CORRETAMENTE BASEADO NO TIPO SELECIONADO
-            if faixa.get("dias_uteis", False):
-                cal = Brazil()
-                dia = faixa["inicio"]
-                dias_contabilizados = 0
-                while dia <= faixa["fim"]:
-                    if cal.is_working_day(dia) and dia.weekday() < 5:  # Dias úteis
-                        dias_contabilizados += 1
-                    dia += timedelta(days=1)
-                dias_contabilizados = max(0, dias_contabilizados - faixa.get("dias_abatidos", 0))
-                tipo_dias = "dias úteis"
-            else:
-                dias_contabilizados = (faixa["fim"] - faixa["inicio"]).days + 1 - faixa.get("dias_abatidos", 0)
-                tipo_dias = "dias corridos"
-            
-            linha = (
-                f"Faixa {i+1}: {faixa['inicio'].strftime('%d/%m/%Y')} a {faixa['fim'].strftime('%d/%m/%Y')} | "
-                f"{dias_contabilizados} {tipo_dias} | "
-                f"Valor: {moeda_br(faixa['valor'])}/dia | "
-                f"Total: {moeda_br(dias_contabilizados * faixa['valor'])}"
-            )
-            pdf.multi_cell(0, 6, linha)  # REMOVIDO unidecode()
-            pdf.ln(2)
-
-        pdf.ln(5)
-
-        # Atualização da multa
-        pdf.set_font("Arial", "B", 10)
-        pdf.cell(0, 6, "Atualização da multa:", ln=True)
-        pdf.set_font("Arial", "", 10)
-        pdf.cell(90, 6, "Data de atualização:", 0, 0)
-        pdf.cell(0, 6, res['data_atualizacao'].strftime('%d/%m/%Y'), ln=True)
-        pdf.cell(90, 6, "Total de dias em atraso:", 0, 0)
-        pdf.cell(0, 6, f"{res['total_dias']}", ln=True)
-        pdf.cell(90, 6, "Multa sem correção:", 0, 0)
-        pdf.cell(0, 6, f"{moeda_br(res['total_sem_correcao'])}", ln=True)
-
-        # Detalhamento mensal
-        pdf.ln(5)
-        pdf.set_font("Arial", "B", 10)
-        pdf.cell(0, 6, "Correção mês a mês:", ln=True)
-        pdf.set_font("Arial", "", 10)
-
-        for mes in res["meses_ordenados"]:
-            bruto = res["totais_mensais"][mes]
-            indice = res["indices"].get(mes, 0.0)
-            corrigido = bruto * (1 + indice)
-            data_formatada = f"{mes[5:]}/{mes[:4]}"
-            linha = f"{data_formatada}: {moeda_br(bruto)} x {indice*100:.2f}% = {moeda_br(corrigido)}"
-            pdf.cell(0, 6, linha, ln=True)  # REMOVIDO unidecode()
-
-        # Multa corrigida final
-        pdf.ln(5)
-        pdf.set_font("Arial", "B", 10)
-        pdf.cell(90, 6, "Multa corrigida:", 0, 0)
-        pdf.cell(0, 6, f"{moeda_br(res['total_corrigido'])}", ln=True)
-
-        pdf.ln(8)
-
-        # Observação
-        if observacao and observacao.strip():
-            pdf.ln(3)
-            pdf.set_font(fonte_obs, "I", tam_obs)
-            pdf.multi_cell(0, 3, f"Observação: {observacao.strip()}")  # REMOVIDO unidecode()
-        
-        # Rodapé
-        pdf.ln(8)
-        pdf.set_font("Arial", "I", 8)
-        pdf.cell(
-            0, 6,
-            "Nota: A correção foi realizada com base na taxa SELIC acumulada, conforme fatores disponíveis no site do Banco Central do Brasil",
-            ln=True
+        return gerar_pdf_multa(
+            res, res['faixas'], numero_processo, nome_autor, nome_reu, observacao,
+            logo=logo, fonte_obs=fonte_obs, tam_obs=tam_obs
         )
-
-        pdf.ln(6)
-        pdf.set_font("Arial", size=10)
-        pdf.cell(
-            0, 6,
-            "Documento é assinado e datado eletronicamente.",
-            ln=True
-        )
-        
-        # Gerar PDF
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-            pdf.output(tmp_file.name)
-            tmp_file.seek(0)
-            return tmp_file.read()
-
     except Exception as e:
         st.error(f"Erro ao gerar PDF: {str(e)}")
         import traceback
@@ -429,7 +203,7 @@ def gerar_pdf(res, numero_processo, nome_autor, nome_reu, observacao=None, fonte
 
 # ========== INTERFACE ==========
 st.set_page_config(page_title="Multa Corrigida por Mês", layout="centered")
-abas = st.tabs(["📘 Aplicação", "📄 Tutorial da Multa"])
+abas = st.tabs(["📘 Aplicação", "📄 Tutorial da Multa", "📦 Cálculo em Lote"])
 with abas[1]:
     st.markdown("## 📄 Quando começa a multa por descumprimento da obrigação de fazer?")
     st.markdown("""
@@ -494,19 +268,6 @@ Adicione faixas de multa com valores diferentes. O total por mês será corrigid
             index=0,
             help="Se o prazo para cumprimento conta apenas dias úteis ou dias corridos"
         )
-    def calcular_inicio_multa(data_despacho, prazo_dias, dias_uteis=False):
-        cal = Brazil() if dias_uteis else None
-        if dias_uteis:
-            data_fim_prazo = data_despacho
-            dias_contados = 1
-            while dias_contados < prazo_dias:
-                data_fim_prazo += timedelta(days=1)
-                if cal.is_working_day(data_fim_prazo) and data_fim_prazo.weekday() < 5:
-                    dias_contados += 1
-        else:
-            data_fim_prazo = data_despacho + timedelta(days=prazo_cumprimento - 1)
-        data_inicio_multa = data_fim_prazo + timedelta(days=1)
-        return data_fim_prazo, data_inicio_multa
 
     data_fim_prazo, data_inicio_multa = calcular_inicio_multa(
         data_despacho, 
@@ -514,6 +275,14 @@ Adicione faixas de multa com valores diferentes. O total por mês será corrigid
         tipo_prazo == "Dias úteis"
     )
 
+    resumo_calendario_local = resumo_calendario()
+    if resumo_calendario_local['feriados'] or resumo_calendario_local['suspensoes']:
+        st.caption(
+            f"Calendário forense: {resumo_calendario_local['feriados']} feriado(s) local(is) e "
+            f"{resumo_calendario_local['suspensoes']} suspensão(ões) de prazo (recesso) considerados no prazo de cumprimento; "
+            "as faixas da multa em dias úteis descontam só os feriados nacionais."
+        )
+
     col_result1, col_result2 = st.columns(2)
     with col_result1:
         st.info(f"**Fim do prazo para cumprimento:** {data_fim_prazo.strftime('%d/%m/%Y')}")
@@ -526,6 +295,8 @@ Adicione faixas de multa com valores diferentes. O total por mês será corrigid
         st.session_state.modo_entrada = "Definir data final"
     if "indices_selic" not in st.session_state:
         st.session_state.indices_selic = {}
+    if "indices_manuais" not in st.session_state:
+        st.session_state.indices_manuais = {}
 
     # --- Bloco de campos dinâmicos fora do form ---
     if st.session_state.faixas:
@@ -636,17 +407,7 @@ Adicione faixas de multa com valores diferentes. O total por mês será corrigid
         for i, f in enumerate(st.session_state.faixas):
             col1, col2, col3 = st.columns([4, 3, 1])
             with col1:
-                if f.get("dias_uteis", False):
-                    cal = Brazil()
-                    dia = f["inicio"]
-                    dias_contabilizados = 0
-                    while dia <= f["fim"]:
-                        if cal.is_working_day(dia) and dia.weekday() < 5:
-                            dias_contabilizados += 1
-                        dia += timedelta(days=1)
-                    dias_contabilizados = max(0, dias_contabilizados - f.get("dias_abatidos", 0))
-                else:
-                    dias_contabilizados = (f["fim"] - f["inicio"]).days + 1 - f.get("dias_abatidos", 0)
+                dias_contabilizados = contar_dias_faixa(f)
                 st.markdown(
                     f"- Faixa {i+1}: {f['inicio'].strftime('%d/%m/%Y')} a {f['fim'].strftime('%d/%m/%Y')} – {moeda_br(f['valor'])}/dia"
                 )
@@ -681,95 +442,96 @@ Adicione faixas de multa com valores diferentes. O total por mês será corrigid
         js = "window.open('https://www.bcb.gov.br/estabilidadefinanceira/selicfatoresacumulados')"
         st.components.v1.html(f"<script>{js}</script>", height=0, width=0)
 
-    totais_mensais = defaultdict(float)
-    total_dias = 0
-    for faixa in st.session_state.faixas:
-        distribuido, dias_faixa = distribuir_valores_por_mes(
-            faixa["inicio"], 
-            faixa["fim"], 
-            faixa["valor"],
-            dias_uteis=faixa.get("dias_uteis", False),
-            dias_abatidos=faixa.get("dias_abatidos", 0)
-        )
-        for mes, valor in distribuido.items():
-            totais_mensais[mes] += valor
-        total_dias += dias_faixa
+    totais_mensais, total_dias = totalizar_faixas_incremental(st.session_state.faixas)
 
     st.subheader("📊 Índices por mês (%)")
+    resumo_taxas = resumo_selic()
+    col_selic, col_atualizar = st.columns([3, 1])
+    with col_selic:
+        if resumo_taxas['ultimo']:
+            st.caption(f"SELIC local: {resumo_taxas['meses']} meses, até {resumo_taxas['ultimo'][5:]}/{resumo_taxas['ultimo'][:4]} | "
+                       f"{resumo_taxas['fatores']} fatores acumulados publicados")
+        else:
+            st.caption("SELIC local ainda não carregada")
+    with col_atualizar:
+        if st.button("🔄 Atualizar SELIC"):
+            atualizar_indices_selic()
     if st.button("🔍 Carregar índices SELIC automaticamente"):
         with st.spinner("Calculando correção SELIC..."):
             indices_selic = calcular_correcao_selic(totais_mensais, data_atualizacao)
             if indices_selic:
                 st.session_state.indices_selic = indices_selic
-                for mes, valor in indices_selic.items():
-                    st.session_state[f"indice_{mes}"] = float(valor)
+                definir_indices_manuais({})
                 st.success("Índices SELIC calculados com sucesso!")
-                st.json({k: f"{v:.2f}%" for k, v in indices_selic.items()})
             else:
                 st.error("Não foi possível calcular os índices. Verifique os dados de entrada.")
 
     meses_ordenados = sorted(totais_mensais.keys())
-    indices = {}
-    indices_selic_carregados = st.session_state.get('indices_selic', {})
-
-    for mes in meses_ordenados:
-        valor_padrao = indices_selic_carregados.get(mes, 0.0)
-        key = f"indice_{mes}"
-        if key not in st.session_state:
-            st.session_state[key] = float(valor_padrao)
+    with st.expander("📋 Colar índices (site do BCB ou planilha)"):
+        texto_colado = st.text_area(
+            "Uma linha por mês: competência (01/2024, jan/2024 ou 2024-01) e índice (%)",
+            key="indices_colados",
+            height=150,
+        )
+        if st.button("Aplicar índices colados"):
+            colados = interpretar_indices_colados(texto_colado)
+            aplicados = {mes: valor for mes, valor in colados.items() if mes in totais_mensais}
+            definir_indices_manuais({**st.session_state.indices_manuais, **aplicados})
+            st.success(f"{len(aplicados)} de {len(colados)} mês(es) colado(s) aplicados à tabela.")
+
+    st.caption("Edite os índices na tabela; também é possível colar várias células de uma vez (Ctrl+V).")
+    indices_selic_tabela = st.session_state.get('indices_selic', {})
+    fonte_indices = fonte_tabela_indices(meses_ordenados, indices_selic_tabela)
+    editada = st.data_editor(
+        fonte_indices,
+        key=f"tabela_indices_{st.session_state.get('versao_tabela_indices', 0)}",
+        hide_index=True,
+        num_rows="fixed",
+        disabled=["Mês/Ano"],
+        column_config={"Índice (%)": st.column_config.NumberColumn(step=0.01, format="%.2f")},
+        use_container_width=True,
+    )
+    coluna_indices = editada["Índice (%)"]
+    st.session_state.indices_manuais = {
+        **{mes: valor for mes, valor in st.session_state.indices_manuais.items() if mes not in fonte_indices.index},
+        **indices_editados(coluna_indices, indices_selic_tabela),
+    }
+    indices = {mes: (0.0 if pd.isna(valor) else valor / 100) for mes, valor in coluna_indices.items()}
 
-    for mes in meses_ordenados:
-        col1, col2 = st.columns([1.2, 3])
-        with col1:
-            data_formatada = f"{mes[5:]}/{mes[:4]}"
-            st.markdown(f"**{data_formatada}**")
-        with col2:
-            key = f"indice_{mes}"
-            indice = st.number_input(
-                f"Índice (%) - {data_formatada}", 
-                key=key, 
-                value=st.session_state[key],
-                step=0.01, 
-                format="%.2f"
-            )
-            indices[mes] = indice / 100
+    col_preencher, col_selic_todos = st.columns(2)
+    with col_preencher:
+        if st.button("⬇️ Preencher vazios com o mês anterior", use_container_width=True):
+            definir_indices_manuais({**st.session_state.indices_manuais, **coluna_indices.ffill().dropna().to_dict()})
+            st.rerun()
+    with col_selic_todos:
+        if st.button("↩️ Aplicar SELIC a todos os meses", use_container_width=True,
+                     disabled=not st.session_state.get('indices_selic')):
+            definir_indices_manuais({})
+            st.rerun()
 
     if st.button("💰 Calcular Multa Corrigida"):
-        total_sem_correcao = sum(totais_mensais.values())
-        total_corrigido = 0.0
-        for mes in meses_ordenados:
-            bruto = totais_mensais[mes]
-            indice = indices.get(mes, 0.0)
-            fator = 1 + indice
-            corrigido = bruto * fator
-            total_corrigido += corrigido
-        st.session_state.resultado_multa = {
-            "total_dias": total_dias,
-            "total_sem_correcao": total_sem_correcao,
-            "total_corrigido": total_corrigido,
-            "data_atualizacao": data_atualizacao,
-            "meses_ordenados": meses_ordenados,
-            "totais_mensais": totais_mensais,
-            "indices": indices,
-            "data_despacho": data_despacho,
-            "prazo_cumprimento": prazo_cumprimento,
-            "tipo_prazo": tipo_prazo,
-            "data_fim_prazo": data_fim_prazo,
-            "data_inicio_multa": data_inicio_multa
-        }
+        st.session_state.resultado_multa = calcular_resultado(
+            st.session_state.faixas,
+            data_despacho,
+            prazo_cumprimento,
+            tipo_prazo,
+            data_atualizacao,
+            indices=indices
+        )
 
     if "resultado_multa" in st.session_state:
         res = st.session_state.resultado_multa
-        detalhamento = []
-        for mes in res["meses_ordenados"]:
-            bruto = res["totais_mensais"][mes]
-            indice = res["indices"].get(mes, 0.0)
-            corrigido = bruto * (1 + indice)
-            data_formatada = f"{mes[5:]}/{mes[:4]}"
-            detalhamento.append([data_formatada, moeda_br(bruto), f"{indice*100:.2f}%", moeda_br(corrigido)])
-        df_detalhamento = pd.DataFrame(detalhamento, columns=["Mês/Ano", "Base", "Índice", "Corrigido"])
+        resumo = resumo_meses(res["correcao"])
+        df_detalhamento = pd.DataFrame({
+            "Mês/Ano": [f"{mes[5:]}/{mes[:4]}" for mes in resumo["mes"]],
+            "Base": [moeda_br(centavos / 100) for centavos in resumo["base_centavos"]],
+            "Índice": [f"{indice*100:.2f}%" for indice in resumo["indice"]],
+            "Corrigido": [moeda_br(centavos / 100) for centavos in resumo["corrigido_centavos"]],
+            "Acumulado": [moeda_br(centavos / 100) for centavos in resumo["acumulado_centavos"]],
+        })
         st.markdown("### 🗒️ Detalhamento por mês:")
         st.table(df_detalhamento)
+        st.caption(NOTA_CENTAVOS)
 
         st.markdown("---")
         st.subheader("✅ Resultado Final")
@@ -799,21 +561,21 @@ Adicione faixas de multa com valores diferentes. O total por mês será corrigid
                     st.download_button(
                         label="💾 Salvar Arquivo",
                         data=dados_salvos,
-                        file_name=f"multa_calculada_{datetime.now().strftime('%Y%m%d_%H%M')}.txt",
-                        mime="text/plain",
+                        file_name=f"multa_calculada_{datetime.now().strftime('%Y%m%d_%H%M')}{EXTENSAO_SESSAO}",
+                        mime="application/gzip",
                         help="Salva todos os dados atuais incluindo dados do processo"
                     )
                 
                 with col_abrir:
                     st.markdown("**Abrir projeto salvo**")
                     arquivo_carregado = st.file_uploader(
-                        "Selecione o arquivo .txt",
-                        type=['txt'],
+                        "Selecione o arquivo salvo (.multa.gz ou .txt antigo)",
+                        type=['gz', 'txt'],
                         key="file_uploader",
                         label_visibility="collapsed"
                     )
                     if arquivo_carregado is not None:
-                        dados_carregados = arquivo_carregado.read().decode('utf-8')
+                        dados_carregados = arquivo_carregado.getvalue()
                         if st.button("📂 Carregar Dados", use_container_width=True):
                             carregar_dados(dados_carregados)
                             st.rerun()
@@ -849,3 +611,94 @@ Adicione faixas de multa com valores diferentes. O total por mês será corrigid
                                 )
                         except Exception as e:
                             st.error(f"Erro ao gerar PDF: {str(e)}")
+
+with abas[2]:
+    st.title("📦 Cálculo de Multas em Lote")
+
+    st.markdown("""
+    ---
+    ### ℹ️ **Como funciona:**
+    - Envie uma planilha (CSV ou XLSX) com **um caso por linha** e as colunas `processo`, `despacho`, `prazo`, `faixas` e `atualizacao`
+    - Colunas opcionais: `tipo_prazo` (úteis ou corridos), `autor`, `reu` e `observacao`
+    - Em `faixas`, separe as faixas por `|`, cada uma como `inicio-fim:valor[:uteis|corridos[:abatidos]]`, por exemplo `10/01/2024-31/03/2024:100,00:uteis:2 | -30/06/2024:150` (sem início, a faixa continua da anterior)
+    - Os fatores SELIC são calculados uma vez para todo o lote; o resultado é uma planilha consolidada e um ZIP com o PDF de cada caso
+    ---
+    """)
+
+    planilha_casos = st.file_uploader("Selecione a planilha de casos", type=["csv", "xlsx"], key="uploader_lote_multa")
+
+    if st.button("🚀 Calcular Lote", use_container_width=True, key="exec_lote_multa", disabled=planilha_casos is None):
+        try:
+            casos = ler_casos(planilha_casos.name, planilha_casos.getvalue())
+        except Exception as e:
+            st.error(f"Erro ao ler a planilha: {str(e)}")
+            casos = []
+        if casos and get_selic_rates() is not None:
+            progresso = st.progress(0.0, text=f"⏳ 0 de {len(casos)} casos")
+            concluidos = []
+
+            def atualizar_progresso(resultado):
+                concluidos.append(resultado)
+                progresso.progress(
+                    len(concluidos) / len(casos),
+                    text=f"⏳ {len(concluidos)} de {len(casos)} casos ({resultado['processo']})"
+                )
+
+            inicio_lote = time.perf_counter()
+            try:
+                resultados = processar_casos(casos, ao_concluir=atualizar_progresso)
+            except ValueError as e:
+                # série SELIC sem cobertura para o lote: nenhum caso sai sem correção
+                st.error(str(e))
+            else:
+                st.session_state.resultado_lote_multa = {
+                    'casos': tabela_casos(resultados),
+                    'planilha': gerar_planilha_lote(resultados),
+                    'pdfs': gerar_zip_pdfs(resultados),
+                    'pdf_unico': gerar_pdf_lote(resultados),
+                    'tempo': time.perf_counter() - inicio_lote
+                }
+            progresso.empty()
+
+    if st.session_state.get("resultado_lote_multa"):
+        lote = st.session_state.resultado_lote_multa
+        casos_lote = lote['casos']
+        erros = casos_lote[casos_lote['Erro'] != ""]
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Casos", len(casos_lote))
+        with col2:
+            st.metric("Com erro", len(erros))
+        with col3:
+            st.metric("Tempo total", f"{lote['tempo']:.1f} s")
+
+        st.dataframe(casos_lote, use_container_width=True, hide_index=True)
+        if not erros.empty:
+            st.warning(f"⚠️ {len(erros)} caso(s) não puderam ser calculados.")
+
+        col_planilha, col_pdfs, col_pdf_unico = st.columns(3)
+        with col_planilha:
+            st.download_button(
+                label="⬇️ Baixar Planilha Consolidada",
+                data=lote['planilha'],
+                file_name=f"multas_lote_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx",
+                mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+                key="download_lote_multa"
+            )
+        with col_pdfs:
+            st.download_button(
+                label="⬇️ Baixar PDFs (ZIP)",
+                data=lote['pdfs'],
+                file_name=f"relatorios_multa_{datetime.now().strftime('%Y%m%d_%H%M')}.zip",
+                mime='application/zip',
+                key="download_pdfs_lote_multa"
+            )
+        with col_pdf_unico:
+            st.download_button(
+                label="⬇️ Baixar PDF Único",
+                data=lote['pdf_unico'],
+                file_name=f"relatorios_multa_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf",
+                mime='application/pdf',
+                key="download_pdf_unico_lote_multa"
+            )
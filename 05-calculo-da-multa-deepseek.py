@@ -1,12 +1,18 @@
 import streamlit as st
 from datetime import date, timedelta, datetime
-from collections import defaultdict
 import locale
 import pandas as pd
-import requests
-from fpdf import FPDF
-import tempfile
-from workalendar.america import Brazil
+
+from calculo_multa import (
+    NOTA_CENTAVOS,
+    calcular_resultado,
+    contar_dias_faixa,
+    gerar_pdf_multa,
+    resumo_meses,
+    totalizar_faixas_incremental,
+)
+from calendario_forense import calcular_data_final, calcular_inicio_multa, resumo_calendario
+from indices_selic import atualizar_selic, conferir_cobertura, indices_correcao, resumo_selic, serie_selic
 
 # ======= Funções utilitárias =======
 def set_brazilian_locale():
@@ -26,114 +32,31 @@ def moeda_br(valor):
         return locale.currency(valor, grouping=True)
     return f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
 
-def calcular_data_final(data_inicio, num_dias, dias_uteis=False):
-    cal = Brazil() if dias_uteis else None
-    if dias_uteis:
-        data_final = data_inicio
-        dias_contados = 1
-        while dias_contados < num_dias:
-            data_final += timedelta(days=1)
-            if cal.is_working_day(data_final) and data_final.weekday() < 5:
-                dias_contados += 1
-    else:
-        data_final = data_inicio + timedelta(days=num_dias - 1)
-    return data_final
-
 def get_selic_rates():
-    url = "https://raw.githubusercontent.com/carlospatrickds/vscode_python/master/selic.csv"
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        meses_pt_eng = {
-            'jan': 'Jan', 'fev': 'Feb', 'mar': 'Mar', 'abr': 'Apr',
-            'mai': 'May', 'jun': 'Jun', 'jul': 'Jul', 'ago': 'Aug',
-            'set': 'Sep', 'out': 'Oct', 'nov': 'Nov', 'dez': 'Dec',
-            'mr': 'Mar', 'det': 'Dec'
-        }
-        dados = []
-        for linha in response.text.split('\n'):
-            linha = linha.strip()
-            if ';' in linha:
-                partes = linha.split(';')
-                if len(partes) >= 2:
-                    mes_ano = partes[0].strip().lower()
-                    taxa = partes[1].strip()
-                    mes = mes_ano[:3]
-                    ano = ''.join(c for c in mes_ano[3:] if c.isdigit())
-                    if len(ano) == 2:
-                        ano = '20' + ano
-                    elif len(ano) == 1:
-                        ano = '200' + ano
-                    taxa_limpa = ''.join(c for c in taxa.replace(',', '.') if c.isdigit() or c == '.')
-                    if mes in meses_pt_eng and ano and taxa_limpa:
-                        try:
-                            mes_eng = meses_pt_eng[mes]
-                            data = f"{mes_eng}/{ano}"
-                            taxa_float = float(taxa_limpa)
-                            dados.append({'Data': data, 'Taxa': taxa_float})
-                        except (ValueError, KeyError):
-                            continue
-        if not dados:
-            st.error("Nenhum dado válido encontrado no arquivo SELIC")
-            return None
-        df = pd.DataFrame(dados)
-        df['Data'] = pd.to_datetime(df['Data'], format='%b/%Y', errors='coerce')
-        df = df.dropna(subset=['Data', 'Taxa'])
-        df = df.sort_values('Data')
-        return df[['Data', 'Taxa']]
+        df = serie_selic()
     except Exception as e:
         st.error(f"Erro ao carregar dados SELIC: {str(e)}")
-        if 'response' in locals():
-            st.error(f"Conteúdo recebido (primeiros 200 caracteres): {response.text[:200]}")
         return None
+    return df
+
+def atualizar_indices_selic():
+    try:
+        novos = atualizar_selic()
+        st.success(f"SELIC atualizada: {novos} mês(es) novo(s).")
+    except Exception as e:
+        st.error(f"Erro ao atualizar dados SELIC: {str(e)}")
 
 def calcular_correcao_selic(totais_mensais, data_atualizacao):
-    selic_data = get_selic_rates()
-    if selic_data is None:
+    if get_selic_rates() is None:
         st.error("Dados SELIC não disponíveis para cálculo")
         return None
-    if isinstance(data_atualizacao, date):
-        data_atualizacao = datetime(data_atualizacao.year, data_atualizacao.month, data_atualizacao.day)
-    indices_selic = {}
-    meses_ordenados = sorted(totais_mensais.keys())
-    for mes_str in meses_ordenados:
-        ano, mes = map(int, mes_str.split('-'))
-        data_mes = datetime(ano, mes, 1)
-        fator_correcao = 1.0
-        data_correcao = data_mes
-        while data_correcao <= data_atualizacao:
-            mes_data = selic_data[
-                (selic_data['Data'].dt.year == data_correcao.year) & 
-                (selic_data['Data'].dt.month == data_correcao.month)
-            ]
-            if not mes_data.empty:
-                taxa_mes = mes_data.iloc[0]['Taxa']
-                fator_correcao *= (1 + taxa_mes)
-            if data_correcao.month == 12:
-                data_correcao = datetime(data_correcao.year + 1, 1, 1)
-            else:
-                data_correcao = datetime(data_correcao.year, data_correcao.month + 1, 1)
-        indice_percentual = (fator_correcao - 1) * 100
-        indices_selic[mes_str] = indice_percentual
-    return indices_selic
-
-def distribuir_valores_por_mes(inicio, fim, valor_diario, dias_uteis=False, dias_abatidos=0):
-    valores_mes = defaultdict(float)
-    cal = Brazil() if dias_uteis else None
-    dia = inicio
-    dias_totais = 0
-    while dia <= fim:
-        if not dias_uteis or (cal.is_working_day(dia) and dia.weekday() < 5):
-            chave = dia.strftime("%Y-%m")
-            valores_mes[chave] += valor_diario
-            dias_totais += 1
-        dia += timedelta(days=1)
-    dias_totais = max(0, dias_totais - dias_abatidos)
-    if dias_abatidos > 0:
-        fator = dias_totais / (dias_totais + dias_abatidos) if (dias_totais + dias_abatidos) > 0 else 0
-        for mes in valores_mes:
-            valores_mes[mes] *= fator
-    return valores_mes, dias_totais
+    try:
+        conferir_cobertura(data_atualizacao)
+    except ValueError as e:
+        st.error(str(e))
+        return None
+    return indices_correcao(totais_mensais.keys(), data_atualizacao)
 
 def remover_faixa(idx):
     if 0 <= idx < len(st.session_state.faixas):
@@ -141,109 +64,10 @@ def remover_faixa(idx):
 
 def gerar_pdf(res, numero_processo, nome_autor, nome_reu, observacao=None, fonte_obs="Arial", tam_obs=8):
     try:
-        FONT_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
-        pdf = FPDF()
-        pdf.add_page()
-        pdf.set_margins(left=10, top=10, right=10)
-        try:
-            if fonte_obs == "DejaVu":
-                pdf.add_font("DejaVu", "", FONT_PATH, uni=True)
-            pdf.set_font("DejaVu" if fonte_obs == "DejaVu" else "Arial", size=10)
-        except:
-            pdf.set_font("Arial", size=10)
-        pdf.set_font("Arial", "B", 12)
-        pdf.cell(0, 8, "Relatório de Multa Diária Corrigida", ln=True, align="C")
-        pdf.ln(5)
-        pdf.set_font("Arial", "", 10)
-        pdf.cell(0, 6, f"Número do Processo: {numero_processo}", ln=True)
-        pdf.cell(0, 6, f"Autor: {nome_autor}", ln=True)
-        pdf.cell(0, 6, f"Réu: {nome_reu}", ln=True)
-        pdf.ln(5)
-        pdf.set_font("Arial", "B", 10)
-        pdf.cell(0, 6, "Cálculo do Início da Multa:", ln=True)
-        pdf.set_font("Arial", "", 10)
-        pdf.cell(90, 6, "Data do despacho/intimação:", 0, 0)
-        pdf.cell(0, 6, res['data_despacho'].strftime('%d/%m/%Y'), ln=True)
-        pdf.cell(90, 6, "Prazo para cumprimento:", 0, 0)
-        pdf.cell(0, 6, f"{res['prazo_cumprimento']} {res['tipo_prazo'].lower()}", ln=True)
-        pdf.cell(90, 6, "Fim do prazo:", 0, 0)
-        pdf.cell(0, 6, res['data_fim_prazo'].strftime('%d/%m/%Y'), ln=True)
-        pdf.cell(90, 6, "Início da multa:", 0, 0)
-        pdf.cell(0, 6, res['data_inicio_multa'].strftime('%d/%m/%Y'), ln=True)
-        pdf.ln(5)
-        pdf.set_font("Arial", "B", 10)
-        pdf.cell(0, 6, "Detalhamento das Faixas:", ln=True)
-        pdf.set_font("Arial", "", 10)
-        for i, faixa in enumerate(st.session_state.faixas):
-            if faixa.get("dias_uteis", False):
-                cal = Brazil()
-                dia = faixa["inicio"]
-                dias_contabilizados = 0
-                while dia <= faixa["fim"]:
-                    if cal.is_working_day(dia) and dia.weekday() < 5:
-                        dias_contabilizados += 1
-                    dia += timedelta(days=1)
-                dias_contabilizados = max(0, dias_contabilizados - faixa.get("dias_abatidos", 0))
-                tipo_dias = "dias úteis"
-            else:
-                dias_contabilizados = (faixa["fim"] - faixa["inicio"]).days + 1 - faixa.get("dias_abatidos", 0)
-                tipo_dias = "dias corridos"
-            linha = (
-                f"Faixa {i+1}: {faixa['inicio'].strftime('%d/%m/%Y')} a {faixa['fim'].strftime('%d/%m/%Y')} | "
-                f"{dias_contabilizados} {tipo_dias} | "
-                f"Valor: {moeda_br(faixa['valor'])}/dia | "
-                f"Total: {moeda_br(dias_contabilizados * faixa['valor'])}"
-            )
-            pdf.multi_cell(0, 6, linha)
-            pdf.ln(2)
-        pdf.ln(5)
-        pdf.set_font("Arial", "B", 10)
-        pdf.cell(0, 6, "Atualização da multa:", ln=True)
-        pdf.set_font("Arial", "", 10)
-        pdf.cell(90, 6, "Data de atualização:", 0, 0)
-        pdf.cell(0, 6, res['data_atualizacao'].strftime('%d/%m/%Y'), ln=True)
-        pdf.cell(90, 6, "Total de dias em atraso:", 0, 0)
-        pdf.cell(0, 6, f"{res['total_dias']}", ln=True)
-        pdf.cell(90, 6, "Multa sem correção:", 0, 0)
-        pdf.cell(0, 6, moeda_br(res['total_sem_correcao']), ln=True)
-        pdf.ln(5)
-        pdf.set_font("Arial", "B", 10)
-        pdf.cell(0, 6, "Correção mês a mês:", ln=True)
-        pdf.set_font("Arial", "", 10)
-        for mes in res["meses_ordenados"]:
-            bruto = res["totais_mensais"][mes]
-            indice = res["indices"].get(mes, 0.0)
-            corrigido = bruto * (1 + indice)
-            data_formatada = f"{mes[5:]}/{mes[:4]}"
-            linha = f"{data_formatada}: {moeda_br(bruto)} x {indice*100:.2f}% = {moeda_br(corrigido)}"
-            pdf.cell(0, 6, linha, ln=True)
-        pdf.ln(5)
-        pdf.set_font("Arial", "B", 10)
-        pdf.cell(90, 6, "Multa corrigida:", 0, 0)
-        pdf.cell(0, 6, moeda_br(res['total_corrigido']), ln=True)
-        pdf.ln(8)
-        if observacao and observacao.strip():
-            pdf.ln(3)
-            pdf.set_font(fonte_obs, "I", tam_obs)
-            pdf.multi_cell(0, 3, f"Observação: {observacao.strip()}")  # ← Mudei de 6 para 3
-        pdf.ln(8)
-        pdf.set_font("Arial", "I", 8)
-        pdf.cell(
-            0, 6,
-            "Nota: A correção foi realizada com base na taxa SELIC acumulada, conforme fatores disponíveis no site do Banco Central do Brasil",
-            ln=True
-        )
-        pdf.ln(6)
-        pdf.set_font("Arial", size=10)
-        pdf.cell(
-            0, 6,
-            "Documento é assinado e datado eletronicamente.",
-            ln=True
+        return gerar_pdf_multa(
+            res, res['faixas'], numero_processo, nome_autor, nome_reu, observacao,
+            fonte_obs=fonte_obs, tam_obs=tam_obs
         )
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-            pdf.output(tmp_file.name)
-            tmp_file.seek(0)
-            return tmp_file.read()
     except Exception as e:
         st.error(f"Erro ao gerar PDF: {str(e)}")
         import traceback
@@ -319,19 +143,6 @@ Adicione faixas de multa com valores diferentes. O total por mês será corrigid
             index=0,
             help="Se o prazo para cumprimento conta apenas dias úteis ou dias corridos"
         )
-    def calcular_inicio_multa(data_despacho, prazo_dias, dias_uteis=False):
-        cal = Brazil() if dias_uteis else None
-        if dias_uteis:
-            data_fim_prazo = data_despacho
-            dias_contados = 1
-            while dias_contados < prazo_dias:
-                data_fim_prazo += timedelta(days=1)
-                if cal.is_working_day(data_fim_prazo) and data_fim_prazo.weekday() < 5:
-                    dias_contados += 1
-        else:
-            data_fim_prazo = data_despacho + timedelta(days=prazo_cumprimento - 1)
-        data_inicio_multa = data_fim_prazo + timedelta(days=1)
-        return data_fim_prazo, data_inicio_multa
 
     data_fim_prazo, data_inicio_multa = calcular_inicio_multa(
         data_despacho, 
@@ -339,6 +150,14 @@ Adicione faixas de multa com valores diferentes. O total por mês será corrigid
         tipo_prazo == "Dias úteis"
     )
 
+    resumo_calendario_local = resumo_calendario()
+    if resumo_calendario_local['feriados'] or resumo_calendario_local['suspensoes']:
+        st.caption(
+            f"Calendário forense: {resumo_calendario_local['feriados']} feriado(s) local(is) e "
+            f"{resumo_calendario_local['suspensoes']} suspensão(ões) de prazo (recesso) considerados no prazo de cumprimento; "
+            "as faixas da multa em dias úteis descontam só os feriados nacionais."
+        )
+
     col_result1, col_result2 = st.columns(2)
     with col_result1:
         st.info(f"**Fim do prazo para cumprimento:** {data_fim_prazo.strftime('%d/%m/%Y')}")
@@ -462,17 +281,7 @@ Adicione faixas de multa com valores diferentes. O total por mês será corrigid
         for i, f in enumerate(st.session_state.faixas):
             col1, col2, col3 = st.columns([4, 3, 1])
             with col1:
-                if f.get("dias_uteis", False):
-                    cal = Brazil()
-                    dia = f["inicio"]
-                    dias_contabilizados = 0
-                    while dia <= f["fim"]:
-                        if cal.is_working_day(dia) and dia.weekday() < 5:
-                            dias_contabilizados += 1
-                        dia += timedelta(days=1)
-                    dias_contabilizados = max(0, dias_contabilizados - f.get("dias_abatidos", 0))
-                else:
-                    dias_contabilizados = (f["fim"] - f["inicio"]).days + 1 - f.get("dias_abatidos", 0)
+                dias_contabilizados = contar_dias_faixa(f)
                 st.markdown(
                     f"- Faixa {i+1}: {f['inicio'].strftime('%d/%m/%Y')} a {f['fim'].strftime('%d/%m/%Y')} – {moeda_br(f['valor'])}/dia"
                 )
@@ -507,21 +316,20 @@ Adicione faixas de multa com valores diferentes. O total por mês será corrigid
         js = "window.open('https://www.bcb.gov.br/estabilidadefinanceira/selicfatoresacumulados')"
         st.components.v1.html(f"<script>{js}</script>", height=0, width=0)
 
-    totais_mensais = defaultdict(float)
-    total_dias = 0
-    for faixa in st.session_state.faixas:
-        distribuido, dias_faixa = distribuir_valores_por_mes(
-            faixa["inicio"], 
-            faixa["fim"], 
-            faixa["valor"],
-            dias_uteis=faixa.get("dias_uteis", False),
-            dias_abatidos=faixa.get("dias_abatidos", 0)
-        )
-        for mes, valor in distribuido.items():
-            totais_mensais[mes] += valor
-        total_dias += dias_faixa
+    totais_mensais, total_dias = totalizar_faixas_incremental(st.session_state.faixas)
 
     st.subheader("📊 Índices por mês (%)")
+    resumo_taxas = resumo_selic()
+    col_selic, col_atualizar = st.columns([3, 1])
+    with col_selic:
+        if resumo_taxas['ultimo']:
+            st.caption(f"SELIC local: {resumo_taxas['meses']} meses, até {resumo_taxas['ultimo'][5:]}/{resumo_taxas['ultimo'][:4]} | "
+                       f"{resumo_taxas['fatores']} fatores acumulados publicados")
+        else:
+            st.caption("SELIC local ainda não carregada")
+    with col_atualizar:
+        if st.button("🔄 Atualizar SELIC"):
+            atualizar_indices_selic()
     if st.button("🔍 Carregar índices SELIC automaticamente"):
         with st.spinner("Calculando correção SELIC..."):
             indices_selic = calcular_correcao_selic(totais_mensais, data_atualizacao)
@@ -561,41 +369,28 @@ Adicione faixas de multa com valores diferentes. O total por mês será corrigid
             indices[mes] = indice / 100
 
     if st.button("💰 Calcular Multa Corrigida"):
-        total_sem_correcao = sum(totais_mensais.values())
-        total_corrigido = 0.0
-        for mes in meses_ordenados:
-            bruto = totais_mensais[mes]
-            indice = indices.get(mes, 0.0)
-            fator = 1 + indice
-            corrigido = bruto * fator
-            total_corrigido += corrigido
-        st.session_state.resultado_multa = {
-            "total_dias": total_dias,
-            "total_sem_correcao": total_sem_correcao,
-            "total_corrigido": total_corrigido,
-            "data_atualizacao": data_atualizacao,
-            "meses_ordenados": meses_ordenados,
-            "totais_mensais": totais_mensais,
-            "indices": indices,
-            "data_despacho": data_despacho,
-            "prazo_cumprimento": prazo_cumprimento,
-            "tipo_prazo": tipo_prazo,
-            "data_fim_prazo": data_fim_prazo,
-            "data_inicio_multa": data_inicio_multa
-        }
+        st.session_state.resultado_multa = calcular_resultado(
+            st.session_state.faixas,
+            data_despacho,
+            prazo_cumprimento,
+            tipo_prazo,
+            data_atualizacao,
+            indices=indices
+        )
 
     if "resultado_multa" in st.session_state:
         res = st.session_state.resultado_multa
-        detalhamento = []
-        for mes in res["meses_ordenados"]:
-            bruto = res["totais_mensais"][mes]
-            indice = res["indices"].get(mes, 0.0)
-            corrigido = bruto * (1 + indice)
-            data_formatada = f"{mes[5:]}/{mes[:4]}"
-            detalhamento.append([data_formatada, moeda_br(bruto), f"{indice*100:.2f}%", moeda_br(corrigido)])
-        df_detalhamento = pd.DataFrame(detalhamento, columns=["Mês/Ano", "Base", "Índice", "Corrigido"])
+        resumo = resumo_meses(res["correcao"])
+        df_detalhamento = pd.DataFrame({
+            "Mês/Ano": [f"{mes[5:]}/{mes[:4]}" for mes in resumo["mes"]],
+            "Base": [moeda_br(centavos / 100) for centavos in resumo["base_centavos"]],
+            "Índice": [f"{indice*100:.2f}%" for indice in resumo["indice"]],
+            "Corrigido": [moeda_br(centavos / 100) for centavos in resumo["corrigido_centavos"]],
+            "Acumulado": [moeda_br(centavos / 100) for centavos in resumo["acumulado_centavos"]],
+        })
         st.markdown("### 🗒️ Detalhamento por mês:")
         st.table(df_detalhamento)
+        st.caption(NOTA_CENTAVOS)
 
         st.markdown("---")
         st.subheader("✅ Resultado Final")
@@ -1,15 +1,13 @@
 import streamlit as st
 from datetime import date, timedelta, datetime
-from collections import defaultdict
 import locale
 import pandas as pd
-import requests
 from dateutil.relativedelta import relativedelta
-from fpdf import FPDF
-import tempfile
 from io import StringIO
-from unidecode import unidecode
-from workalendar.america import Brazil
+
+from calculo_multa import NOTA_CENTAVOS, gerar_pdf_multa, resumo_meses, tabela_correcao, totalizar_faixas_incremental
+from indices_selic import atualizar_selic, conferir_cobertura, indices_correcao, resumo_selic, serie_selic
+from logos_relatorio import LOGO_JFPE, logo_pdf
 
 # Configuração inicial
 st.set_page_config(page_title=" Multa Corrigida por Mês", layout="centered",  page_icon="📅")
@@ -20,154 +18,17 @@ abas = st.tabs(["📘 Aplicação", "📄 Tutorial da Multa"])
 # === FUNÇÃO GERAR PDF - MOVIDA PARA O TOPO ===
 def gerar_pdf(res, numero_processo, nome_autor, nome_reu, observacao=None):
     try:
-        FONT_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
-        pdf = FPDF()
-        pdf.add_page()
-        
-        # Configurar margens menores
-        pdf.set_margins(left=10, top=10, right=10)
-        
-        # === ADICIONAR LOGO CENTRALIZADA ===
+        # Logo do repositório, preparada uma vez por processo (sem rede nem arquivo temporário)
         try:
-            # URL da sua imagem no GitHub (usando raw.githubusercontent.com)
-            logo_url = "https://raw.githubusercontent.com/carlospatrickds/NovoRepositorio/main/logjfpe.png"
-            
-            # Baixar a imagem
-            response = requests.get(logo_url)
-            response.raise_for_status()
-            
-            # Salvar temporariamente
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as tmp_img:
-                tmp_img.write(response.content)
-                tmp_img_path = tmp_img.name
-            
-            # Adicionar logo centralizada no topo
-            # Calcular posição centralizada: (largura_página - largura_imagem) / 2
-            largura_pagina = 190  # 210mm - 10mm de margem esquerda - 10mm direita
-            largura_imagem = 80   # Ajuste conforme necessário
-            posicao_x = (largura_pagina - largura_imagem) / 2 + 10  # +10 para compensar margem
-            
-            pdf.image(tmp_img_path, x=posicao_x, y=8, w=largura_imagem)
-            pdf.ln(40)  # Espaço após a logo
-            
-            # Limpar arquivo temporário
-            import os
-            os.unlink(tmp_img_path)
-            
+            logo = logo_pdf(LOGO_JFPE)
         except Exception as img_error:
             st.warning(f"Não foi possível carregar a logo: {img_error}")
-            # Cabeçalho alternativo sem logo
-            pdf.set_font("Arial", "B", 12)
-            pdf.cell(0, 8, unidecode("Relatório de Multa Diária Corrigida"), ln=True, align="C")
-            pdf.ln(5)
-        
-        # Configurar a fonte (com fallback)
-        try:
-            pdf.add_font("DejaVu", "", FONT_PATH, uni=True)
-            pdf.set_font("DejaVu", size=10)
-        except:
-            pdf.set_font("Arial", size=10)
-            st.warning("Fonte DejaVu não encontrada, usando Arial como fallback.")
-        
-        # Dados do processo (AGORA ABAIXO DA LOGO)
-        pdf.set_font("Arial", "", 11)
-        pdf.cell(0, 6, unidecode(f"Número do Processo: {numero_processo}"), ln=True)
-        pdf.cell(0, 6, unidecode(f"Autor: {nome_autor}"), ln=True)
-        pdf.cell(0, 6, unidecode(f"Réu: {nome_reu}"), ln=True)
-        pdf.ln(10)
-
-        # Detalhamento das Faixas
-        pdf.set_font("Arial", "B", 10)
-        pdf.cell(0, 6, unidecode("Detalhamento das Faixas:"), ln=True)
-        pdf.set_font("Arial", "", 10)
-
-        for i, faixa in enumerate(st.session_state.faixas):
-            # CALCULA DIAS CORRETAMENTE BASEADO NO TIPO SELECIONADO
-            if faixa.get("dias_uteis", False):
-                cal = Brazil()
-                dia = faixa["inicio"]
-                dias_contabilizados = 0
-                while dia <= faixa["fim"]:
-                    if cal.is_working_day(dia) and dia.weekday() < 5:  # Dias úteis
-                        dias_contabilizados += 1
-                    dia += timedelta(days=1)
-                dias_contabilizados = max(0, dias_contabilizados - faixa.get("dias_abatidos", 0))
-                tipo_dias = "dias úteis"
-            else:
-                dias_contabilizados = (faixa["fim"] - faixa["inicio"]).days + 1 - faixa.get("dias_abatidos", 0)
-                tipo_dias = "dias corridos"
-            
-            linha = (
-                f"Faixa {i+1}: {faixa['inicio'].strftime('%d/%m/%Y')} a {faixa['fim'].strftime('%d/%m/%Y')} | "
-                f"{dias_contabilizados} {tipo_dias} | "
-                f"Valor: {moeda_br(faixa['valor'])}/dia | "
-                f"Total: {moeda_br(dias_contabilizados * faixa['valor'])}"
-            )
-            pdf.multi_cell(0, 6, unidecode(linha))
-            pdf.ln(2)
-
-        pdf.ln(5)
-
-        # Atualização da multa
-        pdf.set_font("Arial", "B", 10)
-        pdf.cell(0, 6, unidecode("Atualização da multa:"), ln=True)
-        pdf.set_font("Arial", "", 10)
-        pdf.cell(90, 6, unidecode(f"Data de atualização:"), 0, 0)
-        pdf.cell(0, 6, unidecode(f"{res['data_atualizacao'].strftime('%d/%m/%Y')}"), ln=True)
-        pdf.cell(90, 6, unidecode(f"Total de dias em atraso:"), 0, 0)
-        pdf.cell(0, 6, unidecode(f"{res['total_dias']}"), ln=True)
-        pdf.cell(90, 6, unidecode(f"Multa sem correção:"), 0, 0)
-        pdf.cell(0, 6, unidecode(f"{moeda_br(res['total_sem_correcao'])}"), ln=True)
-
-        # Detalhamento mensal
-        pdf.ln(5)
-        pdf.set_font("Arial", "B", 10)
-        pdf.cell(0, 6, unidecode("Correção mês a mês:"), ln=True)
-        pdf.set_font("Arial", "", 10)
-
-        for mes in res["meses_ordenados"]:
-            bruto = res["totais_mensais"][mes]
-            indice = res["indices"].get(mes, 0.0)
-            corrigido = bruto * (1 + indice)
-            data_formatada = f"{mes[5:]}/{mes[:4]}"
-            linha = f"{data_formatada}: {moeda_br(bruto)} x {indice*100:.2f}% = {moeda_br(corrigido)}"
-            pdf.cell(0, 6, unidecode(linha), ln=True)
-
-        # Multa corrigida final
-        pdf.ln(5)
-        pdf.set_font("Arial", "B", 10)
-        pdf.cell(90, 6, unidecode(f"Multa corrigida:"), 0, 0)
-        pdf.cell(0, 6, unidecode(f"{moeda_br(res['total_corrigido'])}"), ln=True)
-
-        pdf.ln(8)
-
-        # Observação
-        if observacao and observacao.strip():
-            pdf.ln(3)
-            pdf.set_font("Arial", "I", 8)
-            pdf.multi_cell(0, 6, f"Observação: {unidecode(observacao.strip())}")
-        
-        # Rodapé
-        pdf.ln(8)
-        pdf.set_font("Arial", "I", 8)
-        pdf.cell(
-            0, 6,
-            "Nota: A correção foi realizada com base na taxa SELIC acumulada, conforme fatores disponíveis no site do Banco Central do Brasil",
-            ln=True
-        )
+            logo = None  # cabeçalho alternativo, só com o título
 
-        pdf.ln(6)
-        pdf.cell(
-            0, 6,
-            "Este documento é assinado e datado eletronicamente.",
-            ln=True
+        return gerar_pdf_multa(
+            res, res['faixas'], numero_processo, nome_autor, nome_reu, observacao,
+            logo=logo, fonte_obs="Arial",
         )
-        
-        # Gerar PDF
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-            pdf.output(tmp_file.name)
-            tmp_file.seek(0)
-            return tmp_file.read()
 
     except Exception as e:
         st.error(f"Erro ao gerar PDF: {str(e)}")
@@ -237,140 +98,35 @@ def moeda_br(valor):
         return locale.currency(valor, grouping=True)
     return f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
 
-# Função para obter taxas SELIC com tratamento robusto
+# Taxas SELIC do armazenamento local (indices_selic.py)
 def get_selic_rates():
-    """Obtém taxas SELIC do repositório GitHub com tratamento robusto"""
-    url = "https://raw.githubusercontent.com/carlospatrickds/vscode_python/master/selic.csv"
+    """Obtém as taxas SELIC do armazenamento local, sem acessar a rede"""
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        
-        meses_pt_eng = {
-            'jan': 'Jan', 'fev': 'Feb', 'mar': 'Mar', 'abr': 'Apr',
-            'mai': 'May', 'jun': 'Jun', 'jul': 'Jul', 'ago': 'Aug',
-            'set': 'Sep', 'out': 'Oct', 'nov': 'Nov', 'dez': 'Dec',
-            'mr': 'Mar', 'det': 'Dec'  # Tratamento para erros comuns
-        }
-        
-        dados = []
-        for linha in response.text.split('\n'):
-            linha = linha.strip()
-            if ';' in linha:
-                partes = linha.split(';')
-                if len(partes) >= 2:
-                    mes_ano = partes[0].strip().lower()
-                    taxa = partes[1].strip()
-                    
-                    # Extrai mês (3 primeiras letras)
-                    mes = mes_ano[:3]
-                    
-                    # Remove caracteres especiais do ano
-                    ano = ''.join(c for c in mes_ano[3:] if c.isdigit())
-                    
-                    # Corrige anos com 2 dígitos (assume 2000+)
-                    if len(ano) == 2:
-                        ano = '20' + ano
-                    elif len(ano) == 1:
-                        ano = '200' + ano
-                    
-                    # Limpa a taxa (remove caracteres não numéricos)
-                    taxa_limpa = ''.join(c for c in taxa.replace(',', '.') if c.isdigit() or c == '.')
-                    
-                    if mes in meses_pt_eng and ano and taxa_limpa:
-                        try:
-                            mes_eng = meses_pt_eng[mes]
-                            data = f"{mes_eng}/{ano}"
-                            taxa_float = float(taxa_limpa)
-                            dados.append({'Data': data, 'Taxa': taxa_float})
-                        except (ValueError, KeyError):
-                            continue
-        
-        if not dados:
-            st.error("Nenhum dado válido encontrado no arquivo SELIC")
-            return None
-            
-        # Cria DataFrame e converte datas
-        df = pd.DataFrame(dados)
-        df['Data'] = pd.to_datetime(df['Data'], format='%b/%Y', errors='coerce')
-        df = df.dropna(subset=['Data', 'Taxa'])
-        df = df.sort_values('Data')
-        
-        return df[['Data', 'Taxa']]
-
+        df = serie_selic()
     except Exception as e:
         st.error(f"Erro ao carregar dados SELIC: {str(e)}")
-        if 'response' in locals():
-            st.error(f"Conteúdo recebido (primeiros 200 caracteres): {response.text[:200]}")
         return None
+    return df
+
+def atualizar_indices_selic():
+    """Acrescenta ao armazenamento local só os meses novos da SELIC"""
+    try:
+        novos = atualizar_selic()
+        st.success(f"SELIC atualizada: {novos} mês(es) novo(s).")
+    except Exception as e:
+        st.error(f"Erro ao atualizar dados SELIC: {str(e)}")
 
 def calcular_correcao_selic(totais_mensais, data_atualizacao):
-    """Calcula correção pela SELIC"""
-    selic_data = get_selic_rates()
-    if selic_data is None:
+    """Calcula correção pela SELIC com os fatores acumulados (um prefixo por mês)"""
+    if get_selic_rates() is None:
         st.error("Dados SELIC não disponíveis para cálculo")
         return None
-
-    # Garante que data_atualizacao seja datetime
-    if isinstance(data_atualizacao, date):
-        data_atualizacao = datetime(data_atualizacao.year, data_atualizacao.month, data_atualizacao.day)
-
-    indices_selic = {}
-    meses_ordenados = sorted(totais_mensais.keys())
-
-    for mes_str in meses_ordenados:
-        ano, mes = map(int, mes_str.split('-'))
-        data_mes = datetime(ano, mes, 1)
-
-        fator_correcao = 1.0
-        data_correcao = data_mes
-
-        while data_correcao <= data_atualizacao:
-            # Filtra usando ano e mês diretamente
-            mes_data = selic_data[
-                (selic_data['Data'].dt.year == data_correcao.year) & 
-                (selic_data['Data'].dt.month == data_correcao.month)
-            ]
-            
-            if not mes_data.empty:
-                taxa_mes = mes_data.iloc[0]['Taxa']
-                fator_correcao *= (1 + taxa_mes)
-            
-            # Avança para o próximo mês
-            if data_correcao.month == 12:
-                data_correcao = datetime(data_correcao.year + 1, 1, 1)
-            else:
-                data_correcao = datetime(data_correcao.year, data_correcao.month + 1, 1)
-
-        indice_percentual = (fator_correcao - 1) * 100
-        indices_selic[mes_str] = indice_percentual
-
-    return indices_selic
-
-def distribuir_valores_por_mes(inicio, fim, valor_diario, dias_uteis=False, dias_abatidos=0):
-    """Distribui valores por mês considerando dias úteis e abatidos"""
-    valores_mes = defaultdict(float)
-    cal = Brazil() if dias_uteis else None
-    
-    dia = inicio
-    dias_totais = 0
-    
-    while dia <= fim:
-        if not dias_uteis or (cal.is_working_day(dia) and dia.weekday() < 5):
-            chave = dia.strftime("%Y-%m")
-            valores_mes[chave] += valor_diario
-            dias_totais += 1
-        dia += timedelta(days=1)
-    
-    # Aplica abatimento de dias (prazo suspenso)
-    dias_totais = max(0, dias_totais - dias_abatidos)
-    
-    # Redistribui o valor considerando os dias abatidos
-    if dias_abatidos > 0:
-        fator = dias_totais / (dias_totais + dias_abatidos) if (dias_totais + dias_abatidos) > 0 else 0
-        for mes in valores_mes:
-            valores_mes[mes] *= fator
-    
-    return valores_mes, dias_totais
+    try:
+        conferir_cobertura(data_atualizacao)
+    except ValueError as e:
+        st.error(str(e))
+        return None
+    return indices_correcao(totais_mensais.keys(), data_atualizacao)
 
 # Funções de manipulação de faixas
 def remover_faixa(idx):
@@ -498,22 +254,21 @@ if st.button("Abrir site do BC"):
     st.components.v1.html(f"<script>{js}</script>", height=0, width=0)
 
 # Cálculo dos totais mensais
-totais_mensais = defaultdict(float)
-total_dias = 0
-for faixa in st.session_state.faixas:
-    distribuido, dias_faixa = distribuir_valores_por_mes(
-        faixa["inicio"], 
-        faixa["fim"], 
-        faixa["valor"],
-        dias_uteis=faixa.get("dias_uteis", False),
-        dias_abatidos=faixa.get("dias_abatidos", 0)
-    )
-    for mes, valor in distribuido.items():
-        totais_mensais[mes] += valor
-    total_dias += dias_faixa
+totais_mensais, total_dias = totalizar_faixas_incremental(st.session_state.faixas)
 
 # Seção de índices
 st.subheader("📊 Índices por mês (%)")
+resumo_taxas = resumo_selic()
+col_selic, col_atualizar = st.columns([3, 1])
+with col_selic:
+    if resumo_taxas['ultimo']:
+        st.caption(f"SELIC local: {resumo_taxas['meses']} meses, até {resumo_taxas['ultimo'][5:]}/{resumo_taxas['ultimo'][:4]} | "
+                   f"{resumo_taxas['fatores']} fatores acumulados publicados")
+    else:
+        st.caption("SELIC local ainda não carregada")
+with col_atualizar:
+    if st.button("🔄 Atualizar SELIC"):
+        atualizar_indices_selic()
 if st.button("🔍 Carregar índices SELIC automaticamente"):
     with st.spinner("Calculando correção SELIC..."):
         indices_selic = calcular_correcao_selic(totais_mensais, data_atualizacao)
@@ -556,24 +311,19 @@ if st.button("💰 Calcular Multa Corrigida"):
             st.error("Nenhum mês encontrado para cálculo.")
             st.stop()
             
-        total_sem_correcao = sum(totais_mensais.values())
-        total_corrigido = 0.0
-
-        for mes in meses_ordenados:
-            bruto = totais_mensais[mes]
-            indice = indices.get(mes, 0.0)
-            fator = 1 + indice
-            corrigido = bruto * fator
-            total_corrigido += corrigido
+        correcao = tabela_correcao(st.session_state.faixas, indices)
 
         st.session_state.resultado_multa = {
             "total_dias": total_dias,
-            "total_sem_correcao": total_sem_correcao,
-            "total_corrigido": total_corrigido,
+            "total_sem_correcao": int(correcao["base_centavos"].sum()) / 100,
+            "total_corrigido": int(correcao["corrigido_centavos"].sum()) / 100,
             "data_atualizacao": data_atualizacao,
             "meses_ordenados": meses_ordenados,
             "totais_mensais": totais_mensais,
             "indices": indices,
+            "correcao": correcao,
+            # Cópia: o PDF sai das faixas deste cálculo, mesmo que a lista seja editada depois
+            "faixas": [dict(faixa) for faixa in st.session_state.faixas],
         }
         
         st.success("Cálculo concluído com sucesso!")
@@ -589,19 +339,19 @@ if "resultado_multa" in st.session_state:
         res = st.session_state.resultado_multa
         
         # Verifica se os dados necessários existem
-        if not res or "meses_ordenados" not in res:
+        if not res or "correcao" not in res:
             st.error("Erro nos dados calculados. Tente novamente.")
         else:
             st.subheader("📋 Detalhamento por mês:")
-            for mes in res["meses_ordenados"]:
-                bruto = res["totais_mensais"][mes]
-                indice = res["indices"].get(mes, 0.0)
-                corrigido = bruto * (1 + indice)
-                data_formatada = f"{mes[5:]}/{mes[:4]}"
-                if indice == 0.0:
+            for linha_mes in resumo_meses(res["correcao"]).itertuples(index=False):
+                bruto = linha_mes.base_centavos / 100
+                data_formatada = f"{linha_mes.mes[5:]}/{linha_mes.mes[:4]}"
+                if linha_mes.indice == 0.0:
                     st.markdown(f"- **{data_formatada}**: {moeda_br(bruto)}")
                 else:
-                    st.markdown(f"- **{data_formatada}**: base {moeda_br(bruto)} + índice {indice*100:.2f}% → corrigido: {moeda_br(corrigido)}")
+                    st.markdown(f"- **{data_formatada}**: base {moeda_br(bruto)} + índice {linha_mes.indice*100:.2f}% → "
+                                f"corrigido: {moeda_br(linha_mes.corrigido_centavos / 100)}")
+            st.caption(NOTA_CENTAVOS)
 
             st.markdown("---")
             st.subheader("✅ Resultado Final")
@@ -0,0 +1,7 @@
+"""Benchmarks dos módulos de HISCRE e de multa, com as implementações antigas
+mantidas só como referência de tempo e de resultado.
+
+Cada módulo roda da raiz do repositório, por exemplo:
+
+    python -m benchmarks.relatorios --quantidade 500
+"""
@@ -0,0 +1,69 @@
+"""Prazos em dias úteis somados dia a dia, como nas calculadoras antigas, x busca binária no calendário em cache.
+
+    python -m benchmarks.calendario --consultas 2000
+"""
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from calendario_forense import (
+    DIAS_UTEIS_POR_ANO_MIN,
+    _dias_periodos,
+    contar_dias_uteis,
+    feriados_periodo,
+    periodos_locais,
+    somar_dias_uteis,
+)
+
+
+def _somar_referencia(inicio, num_dias, suspensoes=False):
+    """Soma dia a dia, como nas calculadoras antigas, para conferência"""
+    feriados = set(feriados_periodo(inicio.year, inicio.year + num_dias // DIAS_UTEIS_POR_ANO_MIN + 1).astype(date))
+    suspensos = set()
+    if suspensoes:
+        suspensos = set(_dias_periodos(periodos_locais(inicio.year, inicio.year + num_dias // DIAS_UTEIS_POR_ANO_MIN + 1, "suspensao")).astype(date))
+    data_final = inicio
+    dias_contados = 1
+    while dias_contados < num_dias:
+        data_final += timedelta(days=1)
+        if data_final.weekday() < 5 and data_final not in feriados and data_final not in suspensos:
+            dias_contados += 1
+    return data_final
+
+
+def benchmark_calendario(consultas=2000, prazo_max=120):
+    """Prazos em dias úteis somados dia a dia x busca binária nos dias úteis em cache"""
+    rng = np.random.default_rng(0)
+    inicios = [date(2015, 1, 1) + timedelta(days=int(d)) for d in rng.integers(0, 3650, consultas)]
+    prazos = [int(p) for p in rng.integers(1, prazo_max, consultas)]
+
+    inicio_medicao = time.perf_counter()
+    referencia = [_somar_referencia(inicio, prazo, True) for inicio, prazo in zip(inicios, prazos)]
+    tempo_referencia = time.perf_counter() - inicio_medicao
+
+    inicio_medicao = time.perf_counter()
+    resultado = [somar_dias_uteis(inicio, prazo, True) for inicio, prazo in zip(inicios, prazos)]
+    tempo_busca = time.perf_counter() - inicio_medicao
+
+    contagens = all(
+        contar_dias_uteis(inicio + timedelta(days=1), fim, True) == max(0, prazo - 1)
+        for inicio, prazo, fim in zip(inicios, prazos, resultado)
+        if prazo > 1
+    )
+    identico = resultado == referencia and contagens
+    print(f"Consultas: {consultas} (prazos de até {prazo_max} dias úteis, com suspensões)")
+    print(f"Dia a dia:     {tempo_referencia * 1000:.1f} ms")
+    print(f"Busca binária: {tempo_busca * 1000:.1f} ms ({tempo_referencia / tempo_busca:.0f}x)")
+    print(f"Resultado idêntico: {'sim' if identico else 'NÃO'}")
+    return identico
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--consultas", type=int, default=2000)
+    parser.add_argument("--prazo-max", type=int, default=120)
+    args = parser.parse_args()
+    raise SystemExit(0 if benchmark_calendario(args.consultas, args.prazo_max) else 1)
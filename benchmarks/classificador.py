@@ -0,0 +1,91 @@
+"""Classificador de linhas do HISCRE x uma chamada de regex por padrão, como era antes.
+
+    python -m benchmarks.classificador --repeticoes 20000
+"""
+import re
+import time
+from collections import Counter
+
+from extrator_hiscre import TIPOS_LINHA, classificar_linha
+
+# Linhas no formato em que o pdfplumber entrega o HISCRE
+CORPUS_LINHAS = [
+    "Nome: MARIA DAS GRAÇAS DA SILVA",
+    "NB: 123.456.789-0 Espécie: 41 APOSENTADORIA POR IDADE",
+    "Data de Nascimento: 01/01/1950 NB: 987.654.321-0",
+    "Compet. Inicial: 01/2005 Compet. Final: 12/2024",
+    "01/2020 01/01/2020 31/01/2020 Pago",
+    "02/2020 01/02/2020 29/02/2020 Não Pago",
+    "101 VALOR TOTAL DE MR DO PERÍODO R$ 1.412,00",
+    "201 IMPOSTO DE RENDA RETIDO NA FONTE R$ 35,10",
+    "216 CONSIGNAÇÃO EMPRÉSTIMO BANCÁRIO R$ 250,33",
+    "104 VALOR DO DÉCIMO-TERCEIRO SALÁRIO R$1.412,00",
+    "Banco: 001 Agência: 1234 OP: 1 Conta: 12345-6",
+    "15/Jan/2025 10:32:11 Página 3 de 300",
+    "Líquido: R$ 1.126,57",
+]
+
+
+def _classificar_linha_referencia(linha):
+    """Lógica anterior ao classificador (uma chamada de regex por padrão), só para comparação"""
+    info = {}
+    nome_match = re.search(r'Nome:\s*([A-Z\s\.\-ÇÃÁÉÍÓÚÂÊÔ]+)', linha)
+    if nome_match:
+        info['nome'] = nome_match.group(1).strip()
+    nb_match = re.findall(r'NB:\s*([\d\.\-]+)', linha)
+    if nb_match:
+        info['nbs'] = nb_match
+    if (
+        re.search(r'Compet\.\s*Inicial', linha, re.IGNORECASE)
+        or re.search(r'Compet\.\s*Final', linha, re.IGNORECASE)
+        or re.search(r'Nasc', linha, re.IGNORECASE)
+        or re.search(r'Data de Nascimento', linha, re.IGNORECASE)
+        or re.search(r'\d{2}/[A-Za-z]{3}/\d{4}\s+\d{2}:\d{2}:\d{2}', linha)
+    ):
+        info['ignorada'] = True
+        return info
+    comp_match = re.match(r'^(\d{2}/\d{4})', linha.strip())
+    if comp_match and not re.match(r'^\d{3}\s', linha.strip()):
+        info['competencia'] = comp_match.group(1)
+    if "Não Pago" in linha:
+        info['status'] = "Não Pago"
+    elif "Pago" in linha:
+        info['status'] = "Pago"
+    rubrica_match = re.match(r'^(\d{3})\s+([A-Z0-9\s\.\-ÇÃÁÉÍÓÚÂÊÔ\/]+)\s+R\$[\s]*([\d\.,]+)', linha)
+    if rubrica_match:
+        info['rubrica'] = rubrica_match.groups()
+    return info
+
+
+def benchmark_classificador(repeticoes=20000):
+    """Microbenchmark do classificador sobre o corpus de linhas"""
+    linhas = CORPUS_LINHAS * repeticoes
+    identico = all(classificar_linha(linha) == _classificar_linha_referencia(linha) for linha in CORPUS_LINHAS)
+
+    inicio = time.perf_counter()
+    for linha in linhas:
+        _classificar_linha_referencia(linha)
+    tempo_referencia = time.perf_counter() - inicio
+
+    contagem = Counter()
+    inicio = time.perf_counter()
+    for linha in linhas:
+        classificar_linha(linha, contagem)
+    tempo_classificador = time.perf_counter() - inicio
+
+    por_linha = 1e6 / len(linhas)
+    print(f"Linhas: {len(linhas)}")
+    print(f"Regex por padrão: {tempo_referencia * por_linha:.2f} µs/linha")
+    print(f"Classificador:    {tempo_classificador * por_linha:.2f} µs/linha ({tempo_referencia / tempo_classificador:.1f}x)")
+    print("Contagem por tipo: " + ", ".join(f"{tipo}={contagem[tipo]}" for tipo in TIPOS_LINHA))
+    print(f"Classificação idêntica: {'sim' if identico else 'NÃO'}")
+    return identico
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticoes", type=int, default=20000)
+    args = parser.parse_args()
+    raise SystemExit(0 if benchmark_classificador(args.repeticoes) else 1)
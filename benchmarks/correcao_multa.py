@@ -0,0 +1,100 @@
+"""Correção monetária da multa: meses arredondados um a um x tabela_correcao() com rateio dos centavos.
+
+    python -m benchmarks.correcao_multa --faixas 12 120 1200 --repeticoes 20
+
+A tabela não é mais rápida que o laço antigo (ela também distribui cada faixa
+por mês para a tabela por faixa); o que ela compra são centavos que fecham:
+a soma dos meses e a das faixas batem com o total arredondado.
+"""
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from calculo_multa import (
+    _centavos, corrigir_totais, linhas_meses, moeda_br, resumo_meses, tabela_correcao, totalizar_faixas,
+)
+
+
+def _faixas_exemplo(quantidade_faixas, rng):
+    faixas = []
+    inicio = date(2015, 1, 1)
+    for i in range(quantidade_faixas):
+        fim = inicio + timedelta(days=int(rng.integers(20, 60)))
+        faixas.append({
+            'inicio': inicio, 'fim': fim, 'valor': float(rng.integers(5000, 100000)) / 100,
+            'dias_uteis': bool(i % 2), 'dias_abatidos': int(rng.integers(0, 3)),
+        })
+        inicio = fim + timedelta(days=1)
+    return faixas
+
+
+def _linhas_laco(totais_mensais, indices):
+    """Como a tela, o PDF e a planilha faziam: cada mês arredondado sozinho"""
+    return [
+        (f"{mes[5:]}/{mes[:4]}", moeda_br(bruto), f"{indices.get(mes, 0.0) * 100:.2f}%",
+         moeda_br(bruto * (1 + indices.get(mes, 0.0))))
+        for mes, bruto in sorted(totais_mensais.items())
+    ]
+
+
+def _medir(funcao, repeticoes):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return (time.perf_counter() - inicio) / repeticoes
+
+
+def benchmark_correcao(tamanhos=(12, 120, 1200), repeticoes=20):
+    """Fluxo antigo (totais + 3 renderizações em laço) x fluxo novo (tabela uma
+    vez + 3 linhas_meses), o custo só da tabela e os meses que mudam de centavo"""
+    rng = np.random.default_rng(0)
+    fecha = True
+    print(f"{'faixas':>6} {'meses':>5} {'laço':>9} {'tabela+3x':>10} {'só tabela':>10}  ajustados  soma laço x total")
+    for quantidade_faixas in tamanhos:
+        faixas = _faixas_exemplo(quantidade_faixas, rng)
+        totais_mensais, _ = totalizar_faixas(faixas)
+        indices = {mes: float(rng.random()) * 0.6 for mes in totais_mensais}
+        linhas_meses(tabela_correcao(faixas, indices))  # importa o pandas fora da medição
+
+        def fluxo_laco():
+            totais, _ = totalizar_faixas(faixas)
+            for _destino in ("tela", "pdf", "planilha"):
+                _linhas_laco(totais, indices)
+            corrigir_totais(totais, indices)
+
+        def fluxo_tabela():
+            correcao = tabela_correcao(faixas, indices)
+            for _destino in ("tela", "pdf", "planilha"):
+                linhas_meses(correcao)
+
+        tempo_laco = _medir(fluxo_laco, repeticoes)
+        tempo_tabela = _medir(fluxo_tabela, repeticoes)
+        tempo_so_tabela = _medir(lambda: tabela_correcao(faixas, indices), repeticoes)
+
+        correcao = tabela_correcao(faixas, indices)
+        resumo = resumo_meses(correcao)
+        total_sem, total_corrigido = corrigir_totais(totais_mensais, indices)
+        linhas, antigas = linhas_meses(correcao), _linhas_laco(totais_mensais, indices)
+        fecha &= (
+            int(resumo['corrigido_centavos'].sum()) == _centavos(total_corrigido)
+            and int(correcao['corrigido_centavos'].sum()) == _centavos(total_corrigido)
+            and int(correcao['base_centavos'].sum()) == _centavos(total_sem)
+            and [linha[0] for linha in linhas] == [linha[0] for linha in antigas]
+        )
+        ajustados = sum(linha[3] != antiga[3] for linha, antiga in zip(linhas, antigas))
+        soma_laco = sum(_centavos(bruto * (1 + indices[mes])) for mes, bruto in totais_mensais.items())
+        print(f"{quantidade_faixas:>6} {len(totais_mensais):>5} {tempo_laco * 1000:>7.2f}ms {tempo_tabela * 1000:>8.2f}ms "
+              f"{tempo_so_tabela * 1000:>8.2f}ms  {ajustados:>9}  {soma_laco - _centavos(total_corrigido):+d} centavos")
+    print(f"Centavos fecham com o total: {'sim' if fecha else 'NÃO'}")
+    return fecha
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--faixas", type=int, nargs="+", default=[12, 120, 1200])
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+    raise SystemExit(0 if benchmark_correcao(args.faixas, args.repeticoes) else 1)
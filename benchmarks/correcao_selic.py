@@ -0,0 +1,73 @@
+"""Correção SELIC mês a mês, como nas calculadoras antigas, x divisão de produtos acumulados.
+
+    python -m benchmarks.correcao_selic --anos 20
+"""
+import time
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+from indices_selic import _fatores_prefixo, _numero_competencia, _numero_mes, tabela_fatores
+
+
+def _correcao_referencia(selic_data, meses, data_atualizacao):
+    """Cálculo mês a mês das calculadoras antigas, mantido para conferência"""
+    data_atualizacao = datetime(data_atualizacao.year, data_atualizacao.month, data_atualizacao.day)
+    indices_selic = {}
+    for mes_str in sorted(meses):
+        ano, mes = map(int, mes_str.split('-'))
+        fator_correcao = 1.0
+        data_correcao = datetime(ano, mes, 1)
+        while data_correcao <= data_atualizacao:
+            mes_data = selic_data[
+                (selic_data['Data'].dt.year == data_correcao.year) &
+                (selic_data['Data'].dt.month == data_correcao.month)
+            ]
+            if not mes_data.empty:
+                fator_correcao *= (1 + mes_data.iloc[0]['Taxa'])
+            if data_correcao.month == 12:
+                data_correcao = datetime(data_correcao.year + 1, 1, 1)
+            else:
+                data_correcao = datetime(data_correcao.year, data_correcao.month + 1, 1)
+        indices_selic[mes_str] = (fator_correcao - 1) * 100
+    return indices_selic
+
+
+def benchmark_correcao(anos=20, repeticoes=50):
+    """Correção de uma multa de 'anos' anos: cálculo mês a mês x prefixos"""
+    rng = np.random.default_rng(0)
+    serie = pd.DataFrame({
+        'Data': pd.date_range('1995-01-01', '2025-12-01', freq='MS'),
+    })
+    serie['Taxa'] = rng.uniform(0.002, 0.015, len(serie))
+    data_atualizacao = date(2025, 12, 15)
+    meses = [f"{ano}-{mes:02d}" for ano in range(2025 - anos + 1, 2026) for mes in range(1, 13)]
+
+    inicio = time.perf_counter()
+    referencia = _correcao_referencia(serie, meses, data_atualizacao)
+    tempo_referencia = time.perf_counter() - inicio
+
+    numeros = [_numero_competencia(mes) for mes in meses]
+    fim = _numero_mes(data_atualizacao.year, data_atualizacao.month)
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        indices = dict(zip(meses, ((_fatores_prefixo(tabela_fatores(serie), numeros, fim) - 1) * 100).tolist()))
+    tempo_prefixos = (time.perf_counter() - inicio) / repeticoes
+
+    diferenca = max(abs(indices[mes] - referencia[mes]) / max(1.0, abs(referencia[mes])) for mes in meses)
+    print(f"Competências: {len(meses)} ({anos} anos) | meses na série: {len(serie)}")
+    print(f"Mês a mês: {tempo_referencia * 1000:.1f} ms")
+    print(f"Prefixos:  {tempo_prefixos * 1000:.2f} ms ({tempo_referencia / tempo_prefixos:.0f}x)")
+    print(f"Maior diferença relativa: {diferenca:.2e}")
+    return diferenca < 1e-9
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--anos", type=int, default=20)
+    parser.add_argument("--repeticoes", type=int, default=50)
+    args = parser.parse_args()
+    raise SystemExit(0 if benchmark_correcao(args.anos, args.repeticoes) else 1)
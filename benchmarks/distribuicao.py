@@ -0,0 +1,88 @@
+"""Distribuição da multa dia a dia, como nas calculadoras antigas, x a distribuição vetorizada.
+
+    python -m benchmarks.distribuicao --anos 5 --faixas-por-ano 4
+"""
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+import numpy as np
+from workalendar.america import Brazil
+
+from calculo_multa import totalizar_faixas
+
+
+def _distribuir_referencia(inicio, fim, valor_diario, dias_uteis=False, dias_abatidos=0):
+    """Distribuição dia a dia das calculadoras antigas (feriados nacionais do workalendar)"""
+    valores_mes = defaultdict(float)
+    cal = Brazil() if dias_uteis else None
+    dia = inicio
+    dias_totais = 0
+    while dia <= fim:
+        if not dias_uteis or (cal.is_working_day(dia) and dia.weekday() < 5):
+            valores_mes[dia.strftime("%Y-%m")] += valor_diario
+            dias_totais += 1
+        dia += timedelta(days=1)
+    dias_totais = max(0, dias_totais - dias_abatidos)
+    if dias_abatidos > 0:
+        fator = dias_totais / (dias_totais + dias_abatidos) if (dias_totais + dias_abatidos) > 0 else 0
+        for mes in valores_mes:
+            valores_mes[mes] *= fator
+    return valores_mes, dias_totais
+
+
+def benchmark_distribuicao(anos=5, faixas_por_ano=4, repeticoes=20):
+    """Distribuição dia a dia x vetorizada para uma multa de vários anos e faixas"""
+    rng = np.random.default_rng(0)
+    faixas = []
+    inicio = date(2025 - anos, 1, 1)
+    dias_por_faixa = 365 // faixas_por_ano
+    for i in range(anos * faixas_por_ano):
+        fim = inicio + timedelta(days=dias_por_faixa - 1)
+        faixas.append({
+            'inicio': inicio,
+            'fim': fim,
+            'valor': float(rng.integers(50, 1000)),
+            'dias_uteis': bool(i % 2),
+            'dias_abatidos': int(rng.integers(0, 5)),
+        })
+        inicio = fim + timedelta(days=1)
+
+    inicio_medicao = time.perf_counter()
+    referencia = defaultdict(float)
+    dias_referencia = 0
+    for faixa in faixas:
+        valores, dias = _distribuir_referencia(
+            faixa['inicio'], faixa['fim'], faixa['valor'], faixa['dias_uteis'], faixa['dias_abatidos']
+        )
+        for mes, valor in valores.items():
+            referencia[mes] += valor
+        dias_referencia += dias
+    tempo_referencia = time.perf_counter() - inicio_medicao
+
+    inicio_medicao = time.perf_counter()
+    for _ in range(repeticoes):
+        totais, dias_totais = totalizar_faixas(faixas)
+    tempo_vetorizado = (time.perf_counter() - inicio_medicao) / repeticoes
+
+    identico = (
+        dias_totais == dias_referencia
+        and sorted(totais) == sorted(referencia)
+        and all(abs(totais[mes] - referencia[mes]) < 1e-6 for mes in referencia)
+    )
+    print(f"Faixas: {len(faixas)} ({anos} anos) | meses: {len(totais)} | dias: {dias_totais}")
+    print(f"Dia a dia:   {tempo_referencia * 1000:.1f} ms")
+    print(f"Vetorizado:  {tempo_vetorizado * 1000:.2f} ms ({tempo_referencia / tempo_vetorizado:.0f}x)")
+    print(f"Resultado idêntico: {'sim' if identico else 'NÃO'}")
+    return identico
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--anos", type=int, default=5)
+    parser.add_argument("--faixas-por-ano", type=int, default=4)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+    raise SystemExit(0 if benchmark_distribuicao(args.anos, args.faixas_por_ano, args.repeticoes) else 1)
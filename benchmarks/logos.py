@@ -0,0 +1,54 @@
+"""Logo PNG original gravada em arquivo temporário a cada PDF x logo preparada uma vez em memória.
+
+    python -m benchmarks.logos [--logo PODER_JUD_PE_2.png]
+"""
+import io
+import os
+import tempfile
+import time
+
+from fpdf import FPDF
+from PIL import Image
+
+from logos_relatorio import LARGURA_LOGO_MM, LOGO_TJPE, _ler_logo, logo_pdf, preparar_logo
+
+
+def _pdf_com_logo(logo):
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.image(logo, x=(190 - LARGURA_LOGO_MM) / 2 + 10, y=8, w=LARGURA_LOGO_MM)
+    return bytes(pdf.output())
+
+
+def benchmark_logos(nome=LOGO_TJPE, repeticoes=50):
+    """PNG original em arquivo temporário a cada PDF x logo preparada em memória"""
+    original = _ler_logo(nome)
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as tmp_img:
+            tmp_img.write(original)
+        tamanho_original = len(_pdf_com_logo(tmp_img.name))
+        os.unlink(tmp_img.name)
+    tempo_original = (time.perf_counter() - inicio) / repeticoes
+
+    preparar_logo.cache_clear()
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        tamanho_preparado = len(_pdf_com_logo(logo_pdf(nome)))
+    tempo_preparado = (time.perf_counter() - inicio) / repeticoes
+
+    print(f"Logo: {nome} ({len(original) / 1024:.0f} KB, {Image.open(io.BytesIO(original)).size[0]} px)")
+    print(f"Original + arquivo temporário: {tempo_original * 1000:.1f} ms/PDF, PDF de {tamanho_original / 1024:.0f} KB")
+    print(f"Preparada em memória:          {tempo_preparado * 1000:.1f} ms/PDF, PDF de {tamanho_preparado / 1024:.0f} KB "
+          f"({tempo_original / tempo_preparado:.1f}x)")
+    return True
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logo", default=LOGO_TJPE)
+    parser.add_argument("--repeticoes", type=int, default=50)
+    args = parser.parse_args()
+    raise SystemExit(0 if benchmark_logos(args.logo, args.repeticoes) else 1)
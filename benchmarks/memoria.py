@@ -0,0 +1,73 @@
+"""Pico de memória da extração normal x modo de baixa memória em um HISCRE sintético.
+
+    python -m benchmarks.memoria --paginas 1000 [--janela 50] [--backend pymupdf]
+"""
+import time
+
+from fpdf import FPDF
+
+from extrator_hiscre import (
+    BACKENDS,
+    PAGINAS_JANELA,
+    medir_memoria,
+    processar_baixa_memoria,
+    processar_paginas,
+    textos_paginas,
+)
+
+
+def gerar_hiscre_sintetico(paginas=500, competencias_por_pagina=4):
+    """Gera um PDF no formato do HISCRE para medições (não usa dados reais)"""
+    rubricas = [
+        ("101", "VALOR TOTAL DE MR DO PERIODO", "1.412,00"),
+        ("201", "IMPOSTO DE RENDA RETIDO NA FONTE", "35,10"),
+        ("216", "CONSIGNACAO EMPRESTIMO BANCARIO", "250,33"),
+    ]
+    pdf = FPDF()
+    pdf.set_font("Helvetica", size=9)
+    mes, ano = 1, 1990
+    for num_pagina in range(paginas):
+        pdf.add_page()
+        if num_pagina == 0:
+            pdf.cell(0, 5, "Nome: BENEFICIARIO DE TESTE", new_x="LMARGIN", new_y="NEXT")
+            pdf.cell(0, 5, "NB: 123.456.789-0   Data de Nascimento: 01/01/1940", new_x="LMARGIN", new_y="NEXT")
+            pdf.cell(0, 5, "Compet. Inicial: 01/1990 Compet. Final: 12/2030", new_x="LMARGIN", new_y="NEXT")
+        for _ in range(competencias_por_pagina):
+            pdf.cell(0, 5, f"{mes:02d}/{ano} 01/{mes:02d}/{ano} 31/{mes:02d}/{ano} Pago", new_x="LMARGIN", new_y="NEXT")
+            for rubrica, descricao, valor in rubricas:
+                pdf.cell(0, 5, f"{rubrica} {descricao} R$ {valor}", new_x="LMARGIN", new_y="NEXT")
+            mes += 1
+            if mes > 12:
+                mes, ano = 1, ano + 1
+        pdf.cell(0, 5, "01/Jan/2025 10:00:00 HISCRE emitido", new_x="LMARGIN", new_y="NEXT")
+    return bytes(pdf.output())
+
+
+def benchmark_memoria(paginas=1000, paginas_janela=None, backend=None):
+    """Pico de memória do processamento serial normal x modo de baixa memória"""
+    conteudo = gerar_hiscre_sintetico(paginas)
+    resultados = {}
+    for modo, funcao, args in (
+        ("Baixa memória", processar_baixa_memoria, (conteudo, backend, paginas_janela)),
+        ("Normal", lambda: processar_paginas(textos_paginas(conteudo, backend)), ()),
+    ):
+        inicio = time.perf_counter()
+        resultados[modo], memoria = medir_memoria(funcao, *args)
+        print(f"{modo}: {time.perf_counter() - inicio:.2f}s | pico Python {memoria['pico_python_mb']:.1f} MB")
+
+    normal, baixa = resultados["Normal"], resultados["Baixa memória"]
+    identico = normal[:2] == baixa[:2] and normal[2].equals(baixa[2]) and normal[3] == baixa[3]
+    print(f"Páginas: {paginas} | registros: {len(normal[2])} | janela: {paginas_janela or PAGINAS_JANELA} páginas")
+    print(f"Resultado idêntico: {'sim' if identico else 'NÃO'}")
+    return identico
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paginas", type=int, default=1000)
+    parser.add_argument("--janela", type=int, default=None, help="páginas abertas de cada vez")
+    parser.add_argument("--backend", choices=list(BACKENDS), default=None)
+    args = parser.parse_args()
+    raise SystemExit(0 if benchmark_memoria(args.paginas, args.janela, args.backend) else 1)
@@ -0,0 +1,50 @@
+"""Confere se PyMuPDF e pdfplumber produzem as mesmas linhas de rubrica em HISCREs reais.
+
+    python -m benchmarks.paridade [arquivo.pdf ...]
+
+Sem arquivos, usa as amostras de tests/dados e um HISCRE sintético.
+"""
+import glob
+import os
+import time
+
+from benchmarks.memoria import gerar_hiscre_sintetico
+from extrator_hiscre import BACKENDS, ler_conteudo, processar_paginas, pymupdf, textos_paginas
+
+AMOSTRAS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "dados", "hiscre_*.pdf")
+
+
+def verificar_paridade(conteudo, descricao="documento"):
+    """Confere se PyMuPDF e pdfplumber produzem as mesmas linhas de rubrica"""
+    resultados = {}
+    for backend in BACKENDS:
+        inicio = time.perf_counter()
+        resultados[backend] = processar_paginas(textos_paginas(conteudo, backend))
+        print(f"{descricao}: {BACKENDS[backend]} {time.perf_counter() - inicio:.2f}s")
+
+    (nome_a, nbs_a, df_a, _), (nome_b, nbs_b, df_b, _) = resultados.values()
+    identico = nome_a == nome_b and nbs_a == nbs_b and df_a.equals(df_b)
+    if not identico:
+        diferencas = df_a.merge(df_b, how='outer', indicator=True)
+        diferencas = diferencas[diferencas['_merge'] != 'both']
+        print(diferencas.replace({'_merge': {'left_only': 'pymupdf', 'right_only': 'pdfplumber'}}).to_string())
+    print(f"{descricao}: {'linhas idênticas' if identico else 'DIVERGÊNCIAS'} ({len(df_a)} x {len(df_b)} registros)")
+    return identico
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("arquivos", nargs="*", help="PDFs de HISCRE")
+    args = parser.parse_args()
+
+    if pymupdf is None:
+        raise SystemExit("PyMuPDF não está instalado")
+    if args.arquivos:
+        documentos = [(caminho, ler_conteudo(caminho)) for caminho in args.arquivos]
+    else:
+        documentos = [(os.path.basename(caminho), ler_conteudo(caminho)) for caminho in sorted(glob.glob(AMOSTRAS))]
+        documentos.append(("sintético", gerar_hiscre_sintetico(50)))
+    ok = [verificar_paridade(conteudo, descricao) for descricao, conteudo in documentos]
+    raise SystemExit(0 if all(ok) else 1)
@@ -0,0 +1,208 @@
+"""Relatórios da multa gerados como antes x motor de relatorio_multa, com e sem a API de tabelas do FPDF2.
+
+    python -m benchmarks.relatorios --quantidade 500 [--logo]
+"""
+import io
+import os
+import time
+from unittest import mock
+
+from fpdf import FPDF
+
+import relatorio_multa
+from calculo_multa import (
+    FONTE_DEJAVU,
+    NOTA_SELIC,
+    Faixa,
+    ResultadoMulta,
+    _distribuir,
+    linhas_meses,
+    moeda_br,
+    resumo_faixas,
+    tabela_correcao,
+)
+from relatorio_multa import _ler_logo, gerar_relatorios, gerar_zip_relatorios
+
+
+def _relatorio_referencia(res, faixas, numero_processo, nome_autor="", nome_reu="", observacao=None,
+                          logo=None, fonte_obs="DejaVu", tam_obs=8):
+    """Relatório como era gerado antes (uma célula por linha, Arial e a DejaVu
+    registrada a cada documento), mantido para o benchmark"""
+    if isinstance(res, ResultadoMulta):
+        res = res.como_dict()
+    faixas = [faixa.como_dict() if isinstance(faixa, Faixa) else faixa for faixa in faixas]
+    correcao = res.get('correcao')
+    if correcao is None:
+        correcao = tabela_correcao(faixas, res['indices'])
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_margins(left=10, top=10, right=10)
+
+    if logo:
+        largura_imagem = 80
+        pdf.image(logo, x=(190 - largura_imagem) / 2 + 10, y=8, w=largura_imagem)
+        pdf.ln(55)
+    else:
+        pdf.set_font("Arial", "B", 12)
+        pdf.cell(0, 8, "Relatório de Multa Diária Corrigida", ln=True, align="C")
+        pdf.ln(5)
+
+    pdf.set_font("Arial", "", 11)
+    pdf.cell(0, 6, f"Número do Processo: {numero_processo}", ln=True)
+    pdf.cell(0, 6, f"Autor: {nome_autor}", ln=True)
+    pdf.cell(0, 6, f"Réu: {nome_reu}", ln=True)
+    pdf.ln(10)
+    if logo:
+        pdf.set_font("Arial", "B", 12)
+        pdf.cell(0, 8, "Relatório de Multa Diária Corrigida", ln=True, align="C")
+        pdf.ln(5)
+
+    pdf.set_font("Arial", "B", 10)
+    pdf.cell(0, 6, "Cálculo do Início da Multa:", ln=True)
+    pdf.set_font("Arial", "", 10)
+    for rotulo, valor in (
+        ("Data do despacho/intimação:", res['data_despacho'].strftime('%d/%m/%Y')),
+        ("Prazo para cumprimento:", f"{res['prazo_cumprimento']} {res['tipo_prazo'].lower()}"),
+        ("Fim do prazo:", res['data_fim_prazo'].strftime('%d/%m/%Y')),
+        ("Início da multa:", res['data_inicio_multa'].strftime('%d/%m/%Y')),
+    ):
+        pdf.cell(90, 6, rotulo, 0, 0)
+        pdf.cell(0, 6, valor, ln=True)
+    pdf.ln(5)
+
+    pdf.set_font("Arial", "B", 10)
+    pdf.cell(0, 6, "Detalhamento das Faixas:", ln=True)
+    pdf.set_font("Arial", "", 10)
+    contribuicoes = resumo_faixas(correcao, len(faixas))['base_centavos'].tolist()
+    for i, (faixa, dias_contabilizados, centavos) in enumerate(zip(faixas, _distribuir(faixas)[4].tolist(), contribuicoes)):
+        tipo_dias = "dias úteis" if faixa.get("dias_uteis", False) else "dias corridos"
+        pdf.multi_cell(0, 6, (
+            f"Faixa {i+1}: {faixa['inicio'].strftime('%d/%m/%Y')} a {faixa['fim'].strftime('%d/%m/%Y')} | "
+            f"{dias_contabilizados} {tipo_dias} | "
+            f"Valor: {moeda_br(faixa['valor'])}/dia | "
+            f"Total: {moeda_br(centavos / 100)}"
+        ))
+        pdf.ln(2)
+    pdf.ln(5)
+
+    pdf.set_font("Arial", "B", 10)
+    pdf.cell(0, 6, "Atualização da multa:", ln=True)
+    pdf.set_font("Arial", "", 10)
+    for rotulo, valor in (
+        ("Data de atualização:", res['data_atualizacao'].strftime('%d/%m/%Y')),
+        ("Total de dias em atraso:", f"{res['total_dias']}"),
+        ("Multa sem correção:", moeda_br(correcao['base_centavos'].sum() / 100)),
+    ):
+        pdf.cell(90, 6, rotulo, 0, 0)
+        pdf.cell(0, 6, valor, ln=True)
+
+    pdf.ln(5)
+    pdf.set_font("Arial", "B", 10)
+    pdf.cell(0, 6, "Correção mês a mês:", ln=True)
+    pdf.set_font("Arial", "", 10)
+    for mes_ano, base, indice, corrigido, _ in linhas_meses(correcao):
+        pdf.cell(0, 6, f"{mes_ano}: {base} x {indice} = {corrigido}", ln=True)
+
+    pdf.ln(5)
+    pdf.set_font("Arial", "B", 10)
+    pdf.cell(90, 6, "Multa corrigida:", 0, 0)
+    pdf.cell(0, 6, moeda_br(correcao['corrigido_centavos'].sum() / 100), ln=True)
+    pdf.ln(8)
+
+    if observacao and observacao.strip():
+        pdf.ln(3)
+        if fonte_obs == "DejaVu" and os.path.exists(FONTE_DEJAVU):
+            pdf.add_font("DejaVu", "", FONTE_DEJAVU)
+            pdf.set_font("DejaVu", "", tam_obs)
+        else:
+            pdf.set_font("Arial", "I", tam_obs)
+        pdf.multi_cell(0, 3, f"Observação: {observacao.strip()}")
+
+    pdf.ln(8)
+    pdf.set_font("Arial", "I", 8)
+    pdf.cell(0, 6, NOTA_SELIC, ln=True)
+    pdf.ln(6)
+    pdf.set_font("Arial", size=10)
+    pdf.cell(0, 6, "Documento é assinado e datado eletronicamente.", ln=True)
+    return bytes(pdf.output())
+
+
+def _relatorios_exemplo(quantidade):
+    """Casos sintéticos de 2 a 6 faixas e 6 a 36 meses, com índices fixos (sem a série SELIC)"""
+    from datetime import date, timedelta
+
+    import numpy as np
+
+    from calculo_multa import CasoMulta, calcular_multa, totalizar_faixas
+
+    rng = np.random.default_rng(0)
+    relatorios = []
+    for i in range(quantidade):
+        inicio = date(2018, 1, 1) + timedelta(days=int(rng.integers(0, 1500)))
+        faixas = []
+        for j in range(int(rng.integers(2, 7))):
+            fim = inicio + timedelta(days=int(rng.integers(30, 180)))
+            faixas.append({'inicio': inicio, 'fim': fim, 'valor': float(rng.integers(5000, 50000)) / 100,
+                           'dias_uteis': bool(j % 2), 'dias_abatidos': 0})
+            inicio = fim + timedelta(days=1)
+        indices = {mes: float(rng.uniform(0.0, 0.6)) for mes in totalizar_faixas(faixas)[0]}
+        caso = CasoMulta(faixas, faixas[0]['inicio'] - timedelta(days=30), 15, date(2025, 1, 1), "Dias corridos", indices)
+        relatorios.append({
+            'res': calcular_multa(caso).como_dict(),
+            'faixas': faixas,
+            'numero_processo': f"08{i:05d}-00.2020.4.05.8300",
+            'nome_autor': f"Autor {i}",
+            'nome_reu': "INSS",
+            'observacao': "Cálculo conforme decisão — índices informados pela parte" if i % 3 == 0 else "",
+        })
+    return relatorios
+
+
+def benchmark_relatorios(quantidade=500, logo=None):
+    """Relatórios gerados como antes x motor de relatórios, um PDF por caso e
+    todos em um PDF só, e o PDF único com todas as tabelas pela API de tabelas
+    do FPDF2 (o caminho de quando algum texto não cabe na coluna)"""
+    import warnings
+
+    relatorios = _relatorios_exemplo(quantidade)
+    logo = _ler_logo(logo)
+
+    def medir(funcao):
+        inicio = time.perf_counter()
+        tamanho = funcao()
+        return time.perf_counter() - inicio, tamanho
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)  # Arial e ln=True do relatório antigo
+        tempos = {
+            "Antes (um por caso)": medir(lambda: sum(len(_relatorio_referencia(
+                r['res'], r['faixas'], r['numero_processo'], r['nome_autor'], r['nome_reu'], r['observacao'],
+                io.BytesIO(logo) if logo else None,
+            )) for r in relatorios)),
+            "Motor (ZIP)": medir(lambda: len(gerar_zip_relatorios(relatorios, logo))),
+            "Motor (PDF único)": medir(lambda: len(gerar_relatorios(relatorios, logo))),
+        }
+        with mock.patch.object(relatorio_multa, "_cabe", lambda *args: False):
+            tempos["pdf.table() (PDF único)"] = medir(lambda: len(gerar_relatorios(relatorios, logo)))
+    referencia = tempos["Antes (um por caso)"][0]
+    print(f"Relatórios: {quantidade} (um terço com observação em DejaVu)")
+    for nome, (tempo, tamanho) in tempos.items():
+        print(f"{nome:24} {tempo:6.2f} s | {quantidade / tempo:6.1f} relatórios/s | "
+              f"{tamanho / 1024:8.0f} KB ({referencia / tempo:.1f}x)")
+    return True
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quantidade", type=int, default=500)
+    parser.add_argument("--logo", action="store_true", help="inclui a logo do TJPE")
+    args = parser.parse_args()
+
+    logo = None
+    if args.logo:
+        from logos_relatorio import LOGO_TJPE, logo_pdf
+
+        logo = logo_pdf(LOGO_TJPE)
+    raise SystemExit(0 if benchmark_relatorios(args.quantidade, logo) else 1)
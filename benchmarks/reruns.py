@@ -0,0 +1,62 @@
+"""Reruns da interface da multa: distribuição incremental x distribuição completa a cada rerun.
+
+    python -m benchmarks.reruns --faixas 60 --reruns 200
+"""
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from calculo_multa import limpar_cache_faixas, totalizar_faixas, totalizar_faixas_incremental
+
+
+def benchmark_reruns(quantidade_faixas=60, reruns=200):
+    """Reruns da interface: só um índice editado e uma faixa editada por rerun,
+    com a distribuição incremental x a distribuição completa a cada rerun"""
+    rng = np.random.default_rng(0)
+    faixas = []
+    inicio = date(2018, 1, 1)
+    for i in range(quantidade_faixas):
+        fim = inicio + timedelta(days=int(rng.integers(20, 60)))
+        faixas.append({
+            'inicio': inicio, 'fim': fim, 'valor': float(rng.integers(50, 1000)),
+            'dias_uteis': bool(i % 2), 'dias_abatidos': int(rng.integers(0, 3)),
+        })
+        inicio = fim + timedelta(days=1)
+
+    limpar_cache_faixas()
+    tempos = {}
+    identico = True
+    for cenario in ("índice editado", "faixa editada"):
+        tempo_completo = tempo_incremental = 0.0
+        for rerun in range(reruns):
+            if cenario == "faixa editada":
+                faixas[rerun % quantidade_faixas]['valor'] += 1.0
+            inicio_medicao = time.perf_counter()
+            completo, dias_completo = totalizar_faixas(faixas)
+            tempo_completo += time.perf_counter() - inicio_medicao
+            inicio_medicao = time.perf_counter()
+            incremental, dias_incremental = totalizar_faixas_incremental(faixas)
+            tempo_incremental += time.perf_counter() - inicio_medicao
+            identico &= (
+                dias_completo == dias_incremental and list(completo) == list(incremental)
+                and all(abs(completo[mes] - incremental[mes]) < 1e-6 for mes in completo)
+            )
+        tempos[cenario] = (tempo_completo / reruns, tempo_incremental / reruns)
+
+    print(f"Faixas: {quantidade_faixas} | reruns por cenário: {reruns}")
+    for cenario, (completo, incremental) in tempos.items():
+        print(f"{cenario:15} completo: {completo * 1000:.3f} ms | incremental: {incremental * 1000:.3f} ms "
+              f"({completo / incremental:.1f}x)")
+    print(f"Resultado idêntico: {'sim' if identico else 'NÃO'}")
+    return identico
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--faixas", type=int, default=60)
+    parser.add_argument("--reruns", type=int, default=200)
+    args = parser.parse_args()
+    raise SystemExit(0 if benchmark_reruns(args.faixas, args.reruns) else 1)
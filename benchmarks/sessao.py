@@ -0,0 +1,85 @@
+"""Arquivo de sessão no formato antigo (JSON indentado em base64) x atual (colunar em gzip).
+
+    python -m benchmarks.sessao --faixas 500
+"""
+import base64
+import json
+import time
+from datetime import date
+
+import numpy as np
+
+from sessao_multa import CAMPOS_DATA, ler_sessao, serializar_sessao
+
+
+def _serializar_versao_1(dados):
+    """Formato antigo das calculadoras (JSON indentado em base64), para o benchmark"""
+    conteudo = dict(dados)
+    for campo in CAMPOS_DATA:
+        conteudo[campo] = dados[campo].isoformat()
+    conteudo["faixas"] = [
+        {**faixa, "inicio": faixa["inicio"].isoformat(), "fim": faixa["fim"].isoformat()} for faixa in dados["faixas"]
+    ]
+    texto = json.dumps(conteudo, ensure_ascii=False, indent=2)
+    return base64.b64encode(texto.encode("utf-8"))
+
+
+def _sessao_exemplo(quantidade_faixas):
+    """Sessão sintética com faixas mensais consecutivas e um índice por mês"""
+    rng = np.random.default_rng(0)
+    inicio = np.datetime64("2010-01-01", "D")
+    meses = np.arange(np.datetime64("2010-01", "M"), np.datetime64("2010-01", "M") + quantidade_faixas)
+    faixas = []
+    for i, mes in enumerate(meses):
+        fim = (mes + 1).astype("datetime64[D]") - 1
+        faixas.append({
+            "inicio": inicio.astype(date), "fim": fim.astype(date), "valor": float(rng.integers(5000, 100000)) / 100,
+            "dias_uteis": bool(i % 2), "dias_abatidos": int(rng.integers(0, 3)),
+        })
+        inicio = fim + 1
+    rotulos = np.datetime_as_string(meses, unit="M").tolist()
+    return {
+        "data_despacho": date(2009, 12, 1),
+        "prazo_cumprimento": 15,
+        "tipo_prazo": "Dias úteis",
+        "faixas": faixas,
+        "data_atualizacao": date(2025, 1, 1),
+        "indices_selic": {mes: round(float(v), 4) for mes, v in zip(rotulos, rng.random(len(rotulos)) * 150)},
+        "indices_manuais": {f"indice_{mes}": round(float(v), 4) for mes, v in zip(rotulos, rng.random(len(rotulos)) * 150)},
+        "numero_processo": "0800000-00.2020.4.05.8300",
+        "nome_autor": "Autor de Teste",
+        "nome_reu": "Réu de Teste",
+        "observacao": "",
+    }
+
+
+def benchmark_sessao(quantidade_faixas=500, repeticoes=20):
+    """Formato antigo (JSON em base64) x atual (colunar em gzip): tamanho e tempos"""
+    dados = _sessao_exemplo(quantidade_faixas)
+    resultados = {}
+    for nome, salvar in (("base64 (antigo)", _serializar_versao_1), ("gzip colunar", serializar_sessao)):
+        inicio = time.perf_counter()
+        for _ in range(repeticoes):
+            arquivo = salvar(dados)
+        tempo_salvar = (time.perf_counter() - inicio) / repeticoes
+        inicio = time.perf_counter()
+        for _ in range(repeticoes):
+            lido = ler_sessao(arquivo)
+        tempo_ler = (time.perf_counter() - inicio) / repeticoes
+        resultados[nome] = (len(arquivo), tempo_salvar, tempo_ler, lido == dados)
+
+    print(f"Faixas: {quantidade_faixas} | meses com índice: {len(dados['indices_selic'])}")
+    for nome, (tamanho, tempo_salvar, tempo_ler, identico) in resultados.items():
+        print(f"{nome:16} {tamanho / 1024:7.1f} KB | salvar {tempo_salvar * 1000:6.2f} ms | "
+              f"abrir {tempo_ler * 1000:6.2f} ms | idêntico: {'sim' if identico else 'NÃO'}")
+    return all(identico for *_, identico in resultados.values())
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--faixas", type=int, default=500)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+    raise SystemExit(0 if benchmark_sessao(args.faixas, args.repeticoes) else 1)
@@ -0,0 +1,177 @@
+"""Cache local (SQLite) dos HISCRE já processados, indexado pelo SHA-256 do PDF e
+pelo leitor de PDF: o mesmo arquivo lido pelos dois leitores ocupa duas entradas."""
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+import pandas as pd
+
+from extrator_hiscre import COLUNAS_REGISTROS, VERSAO_EXTRATOR
+
+# Versão do layout das tabelas; ao mudar, o banco antigo é recriado
+VERSAO_ESQUEMA = 3
+
+DIRETORIO_PADRAO = os.path.join(os.path.expanduser("~"), ".cache", "hiscre")
+LIMITE_PADRAO_MB = 256
+
+
+def diretorio_cache():
+    """Diretório do cache (variável de ambiente HISCRE_CACHE_DIR)"""
+    return os.environ.get("HISCRE_CACHE_DIR", DIRETORIO_PADRAO)
+
+
+def limite_cache_bytes():
+    """Tamanho máximo do cache (variável de ambiente HISCRE_CACHE_MB)"""
+    return int(float(os.environ.get("HISCRE_CACHE_MB", LIMITE_PADRAO_MB)) * 1024 * 1024)
+
+
+def _conectar(diretorio=None):
+    diretorio = diretorio or diretorio_cache()
+    os.makedirs(diretorio, exist_ok=True)
+    conn = sqlite3.connect(os.path.join(diretorio, "hiscre.sqlite3"), timeout=30)
+    versao = conn.execute("PRAGMA user_version").fetchone()[0]
+    if versao != VERSAO_ESQUEMA:
+        conn.executescript("""
+            DROP TABLE IF EXISTS registros;
+            DROP TABLE IF EXISTS documentos;
+        """)
+    conn.executescript(f"""
+        CREATE TABLE IF NOT EXISTS documentos (
+            hash TEXT NOT NULL,
+            versao_extrator INTEGER NOT NULL,
+            backend TEXT NOT NULL,
+            nome TEXT,
+            nbs TEXT,
+            contagem TEXT,
+            tamanho INTEGER NOT NULL,
+            acessado_em REAL NOT NULL,
+            PRIMARY KEY (hash, backend)
+        );
+        CREATE TABLE IF NOT EXISTS registros (
+            hash TEXT NOT NULL,
+            backend TEXT NOT NULL,
+            ordem INTEGER NOT NULL,
+            pagina INTEGER,
+            competencia TEXT,
+            rubrica TEXT,
+            descricao TEXT,
+            valor REAL,
+            status TEXT,
+            nb TEXT,
+            nome TEXT,
+            PRIMARY KEY (hash, backend, ordem),
+            FOREIGN KEY (hash, backend) REFERENCES documentos(hash, backend) ON DELETE CASCADE
+        );
+        PRAGMA user_version = {VERSAO_ESQUEMA};
+        PRAGMA foreign_keys = ON;
+    """)
+    return conn
+
+
+def ler_documento(hash_arquivo, backend=None, diretorio=None):
+    """Retorna o documento em cache ou None (ausente, de outra versão do extrator
+    ou ainda não extraído por este leitor de PDF); sem backend, o usado por último"""
+    with closing(_conectar(diretorio)) as conn, conn:
+        linha = conn.execute(
+            "SELECT versao_extrator, backend, nome, nbs, contagem FROM documentos "
+            "WHERE hash = ? AND backend = COALESCE(?, backend) ORDER BY acessado_em DESC LIMIT 1",
+            (hash_arquivo, backend),
+        ).fetchone()
+        if linha is None:
+            return None
+        versao, backend_cache, nome, nbs, contagem = linha
+        if versao != VERSAO_EXTRATOR:
+            conn.execute("DELETE FROM documentos WHERE hash = ? AND backend = ?", (hash_arquivo, backend_cache))
+            return None
+
+        registros = pd.read_sql_query(
+            f"SELECT {', '.join(COLUNAS_REGISTROS)} FROM registros WHERE hash = ? AND backend = ? ORDER BY ordem",
+            conn,
+            params=(hash_arquivo, backend_cache),
+        )
+        conn.execute(
+            "UPDATE documentos SET acessado_em = ? WHERE hash = ? AND backend = ?",
+            (time.time(), hash_arquivo, backend_cache),
+        )
+
+    registros = registros.astype({'pagina': 'int32', 'valor': 'float64'})
+    return {
+        'hash': hash_arquivo,
+        'backend': backend_cache,
+        'nome': nome,
+        'nbs': json.loads(nbs),
+        'registros': registros,
+        'contagem': json.loads(contagem),
+    }
+
+
+def _tamanho_gravado(linhas):
+    """Bytes dos valores como o SQLite os grava: texto em UTF-8 e 8 bytes por número"""
+    return sum(
+        len(valor.encode('utf-8')) if isinstance(valor, str) else 8
+        for linha in linhas for valor in linha if valor is not None
+    )
+
+
+def gravar_documento(documento, diretorio=None, limite_bytes=None):
+    """Grava o documento processado e descarta os menos usados acima do limite"""
+    registros = documento['registros']
+    chave = (documento['hash'], documento['backend'])
+    linhas = [
+        (*chave, ordem, int(pagina), *valores)
+        for ordem, (pagina, *valores) in enumerate(registros[COLUNAS_REGISTROS].itertuples(index=False, name=None))
+    ]
+    linha_documento = (
+        documento['hash'],
+        VERSAO_EXTRATOR,
+        documento['backend'],
+        documento['nome'],
+        json.dumps(documento['nbs']),
+        json.dumps(documento.get('contagem', {})),
+    )
+    tamanho = _tamanho_gravado(linhas) + _tamanho_gravado([linha_documento])
+    with closing(_conectar(diretorio)) as conn, conn:
+        conn.execute("DELETE FROM documentos WHERE hash = ? AND backend = ?", chave)
+        conn.execute(
+            "INSERT INTO documentos (hash, versao_extrator, backend, nome, nbs, contagem, tamanho, acessado_em) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (*linha_documento, tamanho, time.time()),
+        )
+        conn.executemany(
+            f"INSERT INTO registros (hash, backend, ordem, {', '.join(COLUNAS_REGISTROS)}) "
+            f"VALUES (?, ?, ?, {', '.join('?' * len(COLUNAS_REGISTROS))})",
+            linhas,
+        )
+        _aplicar_limite(conn, limite_cache_bytes() if limite_bytes is None else limite_bytes)
+
+
+def _aplicar_limite(conn, limite_bytes):
+    """Remove documentos do menos recente para o mais recente até caber no limite"""
+    total = conn.execute("SELECT COALESCE(SUM(tamanho), 0) FROM documentos").fetchone()[0]
+    if total <= limite_bytes:
+        return
+    for hash_arquivo, backend, tamanho in conn.execute(
+        "SELECT hash, backend, tamanho FROM documentos ORDER BY acessado_em"
+    ).fetchall():
+        conn.execute("DELETE FROM documentos WHERE hash = ? AND backend = ?", (hash_arquivo, backend))
+        total -= tamanho
+        if total <= limite_bytes:
+            break
+
+
+def limpar_cache(diretorio=None):
+    with closing(_conectar(diretorio)) as conn, conn:
+        conn.execute("DELETE FROM documentos")
+    with closing(_conectar(diretorio)) as conn:
+        conn.execute("VACUUM")
+
+
+def resumo_cache(diretorio=None):
+    """Quantidade de documentos e tamanho ocupado pelo cache"""
+    with closing(_conectar(diretorio)) as conn:
+        quantidade, tamanho = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(tamanho), 0) FROM documentos"
+        ).fetchone()
+    return {'documentos': quantidade, 'tamanho': tamanho}
@@ -0,0 +1,523 @@
+"""Cálculo da multa diária por faixas, sem dependência do Streamlit.
+
+Pode ser importado por scripts e tarefas agendadas sem o custo de subir a
+interface: pandas, fpdf e a série SELIC só são carregados pelas funções que os
+usam. As entradas e saídas tipadas são Faixa, CasoMulta e ResultadoMulta; as
+calculadoras continuam trabalhando com os dicts equivalentes (como_dict).
+"""
+from collections import defaultdict
+from dataclasses import dataclass, field, fields
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+import numpy as np
+
+from calendario_forense import calcular_inicio_multa, feriados_periodo
+
+COLUNAS_DISTRIBUICAO = ['faixa', 'mes', 'dias', 'valor']
+COLUNAS_CORRECAO = [
+    'faixa', 'mes', 'dias', 'base', 'indice', 'corrigido', 'base_centavos', 'corrigido_centavos', 'acumulado_centavos',
+]
+TIPOS_PRAZO = ("Dias úteis", "Dias corridos")
+SEPARADOR_FAIXAS = "|"
+LIMITE_CACHE_FAIXAS = 4096
+FONTE_DEJAVU = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+NOTA_SELIC = (
+    "Nota: A correção foi realizada com base na taxa SELIC acumulada, conforme fatores "
+    "disponíveis no site do Banco Central do Brasil"
+)
+NOTA_CENTAVOS = (
+    "Nota: Valores mensais arredondados ao centavo pelos maiores restos, para que a soma dos meses feche com o total"
+)
+
+
+@dataclass(frozen=True)
+class Faixa:
+    """Período com o mesmo valor diário de multa"""
+    inicio: date
+    fim: date
+    valor: float
+    dias_uteis: bool = False
+    dias_abatidos: int = 0
+
+    @classmethod
+    def de_dict(cls, dados):
+        return cls(
+            dados["inicio"], dados["fim"], float(dados["valor"]),
+            bool(dados.get("dias_uteis", False)), int(dados.get("dias_abatidos", 0)),
+        )
+
+    def como_dict(self):
+        return {campo.name: getattr(self, campo.name) for campo in fields(self)}
+
+
+@dataclass
+class CasoMulta:
+    """Dados de entrada de um cálculo; indices (fração por 'AAAA-MM') substitui a SELIC"""
+    faixas: list
+    data_despacho: date
+    prazo_cumprimento: int
+    data_atualizacao: date
+    tipo_prazo: str = "Dias úteis"
+    indices: dict = None
+
+    def __post_init__(self):
+        if self.tipo_prazo not in TIPOS_PRAZO:
+            raise ValueError(f"Tipo de prazo inválido: {self.tipo_prazo!r} (use {' ou '.join(TIPOS_PRAZO)})")
+        self.faixas = [faixa if isinstance(faixa, Faixa) else Faixa.de_dict(faixa) for faixa in self.faixas]
+
+
+@dataclass
+class ResultadoMulta:
+    """Resultado de um cálculo, com os mesmos campos de st.session_state.resultado_multa;
+    correcao é a tabela_correcao() de onde saem os totais, a tela, o PDF e as planilhas,
+    e faixas (dicts) são as faixas do cálculo, para o PDF não pegar faixas editadas depois"""
+    total_dias: int
+    total_sem_correcao: float
+    total_corrigido: float
+    data_atualizacao: date
+    meses_ordenados: list
+    totais_mensais: dict
+    indices: dict
+    data_despacho: date
+    prazo_cumprimento: int
+    tipo_prazo: str
+    data_fim_prazo: date
+    data_inicio_multa: date
+    dias_faixas: list = field(default_factory=list)
+    correcao: object = None
+    faixas: list = field(default_factory=list)
+
+    def como_dict(self):
+        return {campo.name: getattr(self, campo.name) for campo in fields(self)}
+
+
+def _distribuir(faixas):
+    """Distribui todas as faixas pelos meses em uma única passada vetorizada.
+
+    Cada faixa (dict com inicio, fim, valor, dias_uteis e dias_abatidos) é
+    cortada nos meses que atravessa; os dias de cada pedaço saem de um só
+    numpy.busday_count com os feriados nacionais em cache (ou da diferença de
+    datas, para dias corridos). Os feriados locais e o recesso do calendário
+    forense só valem para o prazo de cumprimento (calcular_inicio_multa), não
+    para os dias de multa, como nas calculadoras antigas. Os dias abatidos
+    reduzem a faixa proporcionalmente em todos os meses, como no cálculo dia a dia.
+
+    Retorna arrays (faixa, mês datetime64[M], dias, valor) por pedaço com
+    dias contados e os dias de cada faixa já descontados os abatidos.
+    """
+    if not faixas:
+        vazio = np.zeros(0, dtype=int)
+        return vazio, np.zeros(0, dtype='datetime64[M]'), vazio, np.zeros(0), vazio
+
+    inicio = np.array([faixa['inicio'] for faixa in faixas], dtype='datetime64[D]')
+    fim = np.array([faixa['fim'] for faixa in faixas], dtype='datetime64[D]') + 1
+    valor = np.array([float(faixa['valor']) for faixa in faixas])
+    uteis = np.array([bool(faixa.get('dias_uteis', False)) for faixa in faixas])
+    abatidos = np.array([int(faixa.get('dias_abatidos', 0)) for faixa in faixas])
+
+    # Um pedaço por faixa e mês atravessado (nenhum se o fim vem antes do início)
+    mes_inicio = inicio.astype('datetime64[M]')
+    quantidade = np.where(fim > inicio, (fim - 1).astype('datetime64[M]') - mes_inicio + 1, 0).astype(int)
+    indice = np.repeat(np.arange(len(faixas)), quantidade)
+    deslocamento = np.arange(quantidade.sum()) - np.repeat(np.cumsum(quantidade) - quantidade, quantidade)
+    meses = mes_inicio[indice] + deslocamento
+    pedaco_inicio = np.maximum(meses.astype('datetime64[D]'), inicio[indice])
+    pedaco_fim = np.minimum((meses + 1).astype('datetime64[D]'), fim[indice])
+
+    dias = (pedaco_fim - pedaco_inicio).astype(int)
+    if uteis.any() and len(indice):
+        anos = pedaco_inicio.astype('datetime64[Y]').astype(int) + 1970
+        feriados = feriados_periodo(int(anos.min()), int(anos.max()), locais=False)
+        dias = np.where(uteis[indice], np.busday_count(pedaco_inicio, pedaco_fim, holidays=feriados), dias)
+
+    contados = np.bincount(indice, weights=dias, minlength=len(faixas)).astype(int)
+    dias_totais = np.maximum(0, contados - abatidos)
+    divisor = dias_totais + abatidos
+    fator = np.where(abatidos > 0, np.divide(dias_totais, divisor, out=np.zeros(len(faixas)), where=divisor > 0), 1.0)
+
+    contado = dias > 0
+    indice, meses, dias = indice[contado], meses[contado], dias[contado]
+    return indice, meses, dias, dias * valor[indice] * fator[indice], dias_totais
+
+
+def distribuir_faixas(faixas):
+    """Distribuição por faixa e mês em uma tabela faixa/mes/dias/valor (só meses
+    com dias contados) e os dias de cada faixa já descontados os abatidos"""
+    import pandas as pd
+
+    indice, meses, dias, valores, dias_totais = _distribuir(faixas)
+    distribuicao = pd.DataFrame({
+        'faixa': indice,
+        'mes': np.datetime_as_string(meses, unit='M'),
+        'dias': dias,
+        'valor': valores,
+    }, columns=COLUNAS_DISTRIBUICAO)
+    return distribuicao, dias_totais
+
+
+def _totais_por_mes(meses, valores):
+    """Soma dos pedaços por mês, em um defaultdict 'AAAA-MM' -> valor em ordem"""
+    meses_unicos, posicao = np.unique(meses, return_inverse=True)
+    totais = np.bincount(posicao, weights=valores, minlength=len(meses_unicos))
+    return defaultdict(float, zip(np.datetime_as_string(meses_unicos, unit='M').tolist(), totais.tolist()))
+
+
+def totalizar_faixas(faixas):
+    """Totais por mês ('AAAA-MM', em ordem) somando todas as faixas, e o total de dias"""
+    _, meses, _, valores, dias_totais = _distribuir(faixas)
+    return _totais_por_mes(meses, valores), int(dias_totais.sum())
+
+
+def chave_faixa(faixa):
+    """Tupla (inicio, fim, valor, dias_uteis, dias_abatidos) que identifica o cálculo de uma faixa"""
+    return (
+        faixa['inicio'], faixa['fim'], float(faixa['valor']),
+        bool(faixa.get('dias_uteis', False)), int(faixa.get('dias_abatidos', 0)),
+    )
+
+
+@lru_cache(maxsize=LIMITE_CACHE_FAIXAS)
+def _distribuicao_faixa(inicio, fim, valor, dias_uteis, dias_abatidos):
+    """Pares ('AAAA-MM', valor) e dias contados de uma faixa, guardados pela chave_faixa()"""
+    faixa = {'inicio': inicio, 'fim': fim, 'valor': valor, 'dias_uteis': dias_uteis, 'dias_abatidos': dias_abatidos}
+    _, meses, _, valores, dias_totais = _distribuir([faixa])
+    return tuple(zip(np.datetime_as_string(meses, unit='M').tolist(), valores.tolist())), int(dias_totais[0])
+
+
+@lru_cache(maxsize=16)
+def _totalizar_chaves(chaves):
+    """Totais de uma lista de faixas (pelas chaves); só as faixas novas são distribuídas"""
+    totais = defaultdict(float)
+    total_dias = 0
+    for chave in chaves:
+        valores_mes, dias = _distribuicao_faixa(*chave)
+        for mes, valor in valores_mes:
+            totais[mes] += valor
+        total_dias += dias
+    return tuple(sorted(totais.items())), total_dias
+
+
+def totalizar_faixas_incremental(faixas):
+    """totalizar_faixas() para as reruns da interface: cada faixa é distribuída uma
+    vez por (inicio, fim, valor, dias_uteis, dias_abatidos) e a soma da lista inteira
+    também fica guardada, então editar um índice não redistribui nada e editar uma
+    faixa só recalcula aquela faixa"""
+    totais, total_dias = _totalizar_chaves(tuple(map(chave_faixa, faixas)))
+    return defaultdict(float, totais), total_dias
+
+
+def limpar_cache_faixas():
+    """Descarta as distribuições guardadas (depois de recarregar_calendario())"""
+    _distribuicao_faixa.cache_clear()
+    _totalizar_chaves.cache_clear()
+
+
+def distribuir_valores_por_mes(inicio, fim, valor_diario, dias_uteis=False, dias_abatidos=0):
+    """Uma faixa só: (valores por mês, dias contados), como a versão dia a dia"""
+    faixa = {'inicio': inicio, 'fim': fim, 'valor': valor_diario, 'dias_uteis': dias_uteis, 'dias_abatidos': dias_abatidos}
+    valores_mes, dias = _distribuicao_faixa(*chave_faixa(faixa))
+    return defaultdict(float, valores_mes), dias
+
+
+def contar_dias_faixa(faixa):
+    """Dias contados da faixa, já descontados os abatidos"""
+    return _distribuicao_faixa(*chave_faixa(faixa))[1]
+
+
+def moeda_br(valor):
+    """Valor em reais no formato brasileiro, sem depender do locale do sistema"""
+    return f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+def interpretar_data(valor):
+    """Data de uma célula ou argumento: date/datetime ou texto dd/mm/aaaa (ou aaaa-mm-dd)"""
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    texto = str(valor).strip()
+    for formato in ("%d/%m/%Y", "%Y-%m-%d", "%d/%m/%y"):
+        try:
+            return datetime.strptime(texto, formato).date()
+        except ValueError:
+            pass
+    raise ValueError(f"Data inválida: {texto!r}")
+
+
+def interpretar_numero(texto):
+    """Número no formato brasileiro ("1.234,56") ou com ponto decimal ("1234.56")"""
+    texto = str(texto).strip().replace("R$", "").strip()
+    if "," in texto:
+        texto = texto.replace(".", "").replace(",", ".")
+    return float(texto)
+
+
+def interpretar_faixas(texto, data_inicio_multa):
+    """Faixas no formato texto "inicio-fim:valor[:uteis|corridos[:abatidos]]",
+    separadas por "|"; sem início, a faixa continua da anterior (a primeira,
+    do início da multa)"""
+    from unidecode import unidecode
+
+    faixas = []
+    proximo_inicio = data_inicio_multa
+    for trecho in str(texto).split(SEPARADOR_FAIXAS):
+        trecho = trecho.strip()
+        if not trecho:
+            continue
+        partes = [parte.strip() for parte in trecho.split(":")]
+        if len(partes) < 2 or "-" not in partes[0]:
+            raise ValueError(f"Faixa inválida: {trecho!r} (esperado inicio-fim:valor[:uteis|corridos[:abatidos]])")
+        inicio, fim = (parte.strip() for parte in partes[0].split("-", 1))
+        tipo = unidecode(partes[2]).lower() if len(partes) > 2 and partes[2] else "corridos"
+        if tipo not in ("uteis", "corridos"):
+            raise ValueError(f"Tipo de dias inválido na faixa {trecho!r}: {partes[2]!r}")
+        faixa = Faixa(
+            inicio=interpretar_data(inicio) if inicio else proximo_inicio,
+            fim=interpretar_data(fim),
+            valor=interpretar_numero(partes[1]),
+            dias_uteis=tipo == "uteis",
+            dias_abatidos=int(partes[3]) if len(partes) > 3 and partes[3] else 0,
+        )
+        if faixa.fim < faixa.inicio:
+            raise ValueError(f"Faixa com fim antes do início: {trecho!r}")
+        faixas.append(faixa)
+        proximo_inicio = faixa.fim + timedelta(days=1)
+    if not faixas:
+        raise ValueError("Nenhuma faixa informada")
+    return faixas
+
+
+def corrigir_totais(totais_mensais, indices):
+    """Multa sem correção e corrigida, aplicando a cada mês o seu índice (fração)"""
+    total_corrigido = sum(valor * (1 + indices.get(mes, 0.0)) for mes, valor in totais_mensais.items())
+    return sum(totais_mensais.values()), total_corrigido
+
+
+def _centavos(valor):
+    """Valor em centavos inteiros, com o mesmo arredondamento de moeda_br()"""
+    return int(round(round(float(valor), 2) * 100))
+
+
+def _ratear_centavos(valores, grupos, alvos):
+    """Centavos inteiros de cada valor, com a soma de cada grupo igual ao seu alvo:
+    cada valor fica com o piso e os centavos que faltam vão para os maiores restos"""
+    exatos = np.asarray(valores, dtype=float) * 100
+    centavos = np.floor(exatos).astype(np.int64)
+    faltam = np.asarray(alvos, dtype=np.int64) - np.bincount(grupos, weights=centavos, minlength=len(alvos)).astype(np.int64)
+    # Dentro de cada grupo, do maior resto para o menor; o posto de cada valor decide se ganha um centavo
+    ordem = np.lexsort((-(exatos - centavos), grupos))
+    inicio_grupo = np.searchsorted(grupos[ordem], grupos[ordem], side='left')
+    posto = np.arange(len(ordem)) - inicio_grupo
+    centavos[ordem] += (posto < faltam[grupos[ordem]]).astype(np.int64)
+    return centavos
+
+
+def tabela_correcao(faixas, indices):
+    """Correção de todas as faixas em uma passada, em uma tabela por faixa e mês.
+
+    Parte da matriz mês x faixa dos valores brutos (os pedaços de _distribuir,
+    só os não nulos) e do vetor de índices (fração por 'AAAA-MM'): corrigido é
+    base x (1 + índice). As colunas em centavos são rateadas a partir do total
+    arredondado, primeiro entre os meses e depois entre as faixas de cada mês,
+    então linhas, meses e total sempre fecham com o valor exibido;
+    acumulado_centavos é o corrigido acumulado até cada linha.
+
+    Nas calculadoras antigas cada mês era arredondado sozinho e a soma dos
+    meses podia diferir do total em alguns centavos. Aqui um mês pode sair
+    1 centavo acima ou abaixo do seu arredondamento isolado (os centavos que
+    faltam vão para os maiores restos); relatório e tela trazem NOTA_CENTAVOS.
+    """
+    return _tabela_correcao(_distribuir(faixas), indices)
+
+
+def _tabela_correcao(pedacos, indices):
+    """tabela_correcao() a partir dos pedaços já distribuídos"""
+    import pandas as pd
+
+    indice, meses, dias, valores, _ = pedacos
+    ordem = np.lexsort((indice, meses.astype(np.int64)))
+    indice, meses, dias, valores = indice[ordem], meses[ordem], dias[ordem], valores[ordem]
+    meses_unicos, posicao = np.unique(meses, return_inverse=True)
+    rotulos = np.datetime_as_string(meses_unicos, unit='M').astype(object)
+    indices_mes = np.array([indices.get(mes, 0.0) for mes in rotulos.tolist()], dtype=float)
+    corrigidos = valores * (1 + indices_mes[posicao])
+
+    centavos = {}
+    for nome, coluna in (('base', valores), ('corrigido', corrigidos)):
+        por_mes = np.bincount(posicao, weights=coluna, minlength=len(rotulos))
+        centavos_mes = _ratear_centavos(por_mes, np.zeros(len(rotulos), dtype=int), [_centavos(por_mes.sum())])
+        centavos[nome] = _ratear_centavos(coluna, posicao, centavos_mes)
+
+    # Arrays novos, criados acima: o DataFrame pode usá-los sem copiar
+    return pd.DataFrame({
+        'faixa': indice,
+        'mes': rotulos[posicao],
+        'dias': dias,
+        'base': valores,
+        'indice': indices_mes[posicao],
+        'corrigido': corrigidos,
+        'base_centavos': centavos['base'],
+        'corrigido_centavos': centavos['corrigido'],
+        'acumulado_centavos': np.cumsum(centavos['corrigido']),
+    }, columns=COLUNAS_CORRECAO, copy=False)
+
+
+def _somas_meses(correcao):
+    """Colunas do resumo_meses() em arrays, sem montar o DataFrame"""
+    # A tabela vem ordenada por mês: cada mês é um trecho contíguo de linhas
+    mes = correcao['mes'].to_numpy()
+    if len(mes):
+        inicio = np.flatnonzero(np.concatenate(([True], mes[1:] != mes[:-1])))
+    else:
+        inicio = np.zeros(0, dtype=int)
+    somas = {'mes': mes[inicio]}
+    for coluna in ('dias', 'base'):
+        somas[coluna] = np.add.reduceat(correcao[coluna].to_numpy(), inicio) if len(inicio) else correcao[coluna].to_numpy()
+    somas['indice'] = correcao['indice'].to_numpy()[inicio]
+    for coluna in ('corrigido', 'base_centavos', 'corrigido_centavos'):
+        somas[coluna] = np.add.reduceat(correcao[coluna].to_numpy(), inicio) if len(inicio) else correcao[coluna].to_numpy()
+    somas['acumulado_centavos'] = np.cumsum(somas['corrigido_centavos'])
+    return somas
+
+
+def resumo_meses(correcao):
+    """Correção mês a mês a partir da tabela_correcao(), com o acumulado de cada mês"""
+    import pandas as pd
+
+    return pd.DataFrame(_somas_meses(correcao), copy=False)
+
+
+def resumo_faixas(correcao, quantidade_faixas):
+    """Contribuição de cada faixa (dias, base e corrigido) a partir da tabela_correcao()"""
+    import pandas as pd
+
+    faixa = correcao['faixa'].to_numpy()
+    resumo = {'faixa': np.arange(quantidade_faixas)}
+    for coluna in ('dias', 'base', 'corrigido', 'base_centavos', 'corrigido_centavos'):
+        somas = np.bincount(faixa, weights=correcao[coluna].to_numpy(), minlength=quantidade_faixas)
+        resumo[coluna] = somas if coluna in ('base', 'corrigido') else somas.round().astype(np.int64)
+    return pd.DataFrame(resumo)
+
+
+def linhas_meses(correcao):
+    """Linhas (Mês/Ano, base, índice, corrigido, acumulado) já formatadas, para
+    a tela, o PDF e a linha de comando renderizarem a mesma tabela"""
+    somas = _somas_meses(correcao)
+    return [
+        (f"{mes[5:]}/{mes[:4]}", moeda_br(base / 100), f"{indice * 100:.2f}%", moeda_br(corrigido / 100), moeda_br(acumulado / 100))
+        for mes, base, indice, corrigido, acumulado in zip(*(
+            somas[coluna].tolist()
+            for coluna in ('mes', 'base_centavos', 'indice', 'corrigido_centavos', 'acumulado_centavos')
+        ))
+    ]
+
+
+def calcular_multa(caso, fatores=None):
+    """ResultadoMulta de um CasoMulta; fatores são os fatores publicados já
+    consultados {(inicio, fim): fator}, para reaproveitar em vários casos (sem
+    eles, usa a série SELIC local, que precisa chegar à competência da
+    atualização: senão, ValueError)"""
+    data_fim_prazo, data_inicio_multa = calcular_inicio_multa(
+        caso.data_despacho, caso.prazo_cumprimento, caso.tipo_prazo == "Dias úteis"
+    )
+    faixas = [faixa.como_dict() for faixa in caso.faixas]
+    pedacos = _distribuir(faixas)
+    _, meses, _, valores, dias_faixas = pedacos
+    totais_mensais = _totais_por_mes(meses, valores)
+    meses_ordenados = sorted(totais_mensais)
+
+    indices = caso.indices
+    if indices is None:
+        from indices_selic import conferir_cobertura, indices_correcao
+
+        if fatores is None:
+            conferir_cobertura(caso.data_atualizacao)
+        indices = {
+            mes: indice / 100
+            for mes, indice in indices_correcao(meses_ordenados, caso.data_atualizacao, fatores).items()
+        }
+    correcao = _tabela_correcao(pedacos, indices)
+    return ResultadoMulta(
+        total_dias=int(dias_faixas.sum()),
+        total_sem_correcao=int(correcao['base_centavos'].sum()) / 100,
+        total_corrigido=int(correcao['corrigido_centavos'].sum()) / 100,
+        data_atualizacao=caso.data_atualizacao,
+        meses_ordenados=meses_ordenados,
+        totais_mensais=totais_mensais,
+        indices=indices,
+        data_despacho=caso.data_despacho,
+        prazo_cumprimento=caso.prazo_cumprimento,
+        tipo_prazo=caso.tipo_prazo,
+        data_fim_prazo=data_fim_prazo,
+        data_inicio_multa=data_inicio_multa,
+        dias_faixas=dias_faixas.tolist(),
+        correcao=correcao,
+        faixas=faixas,
+    )
+
+
+def calcular_resultado(faixas, data_despacho, prazo_cumprimento, tipo_prazo, data_atualizacao, indices=None, fatores=None):
+    """calcular_multa() para as calculadoras: recebe as faixas em dicts e devolve
+    o dict de st.session_state.resultado_multa"""
+    caso = CasoMulta(faixas, data_despacho, prazo_cumprimento, data_atualizacao, tipo_prazo, indices)
+    return calcular_multa(caso, fatores).como_dict()
+
+
+def gerar_pdf_multa(res, faixas, numero_processo, nome_autor="", nome_reu="", observacao=None,
+                    logo=None, fonte_obs="DejaVu", tam_obs=8):
+    """Relatório da multa em PDF (bytes), com o mesmo conteúdo do relatório das calculadoras.
+
+    res é o ResultadoMulta (ou o dict equivalente) e faixas, as Faixa (ou dicts)
+    do caso. logo é o caminho ou os bytes (BytesIO) de uma imagem para o topo;
+    sem ela, o título vai no cabeçalho. Gerado por relatorio_multa, que também
+    junta vários casos em um PDF só (gerar_relatorios()).
+    """
+    from relatorio_multa import gerar_relatorio
+
+    return gerar_relatorio(res, faixas, numero_processo, nome_autor, nome_reu, observacao, logo, fonte_obs, tam_obs)
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Cálculo da multa diária por faixas")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    calcular = sub.add_parser("calcular", help="calcula um caso e, opcionalmente, gera o PDF")
+    calcular.add_argument("--despacho", required=True, help="data do despacho/intimação (dd/mm/aaaa)")
+    calcular.add_argument("--prazo", type=int, required=True, help="prazo para cumprimento, em dias")
+    calcular.add_argument("--corridos", action="store_true", help="prazo em dias corridos (padrão: dias úteis)")
+    calcular.add_argument("--faixas", required=True, help='"inicio-fim:valor[:uteis|corridos[:abatidos]] | ..."')
+    calcular.add_argument("--atualizacao", default=date.today().strftime("%d/%m/%Y"), help="data de atualização (dd/mm/aaaa)")
+    calcular.add_argument("--pdf", help="grava o relatório neste arquivo")
+    calcular.add_argument("--processo", default="")
+    calcular.add_argument("--json", action="store_true", help="resultado em JSON")
+    args = parser.parse_args()
+
+    tipo_prazo = "Dias corridos" if args.corridos else "Dias úteis"
+    try:
+        data_despacho = interpretar_data(args.despacho)
+        _, data_inicio_multa = calcular_inicio_multa(data_despacho, args.prazo, tipo_prazo == "Dias úteis")
+        caso = CasoMulta(
+            interpretar_faixas(args.faixas, data_inicio_multa), data_despacho, args.prazo,
+            interpretar_data(args.atualizacao), tipo_prazo,
+        )
+        resultado = calcular_multa(caso)
+    except ValueError as e:
+        raise SystemExit(f"Erro: {e}")
+    if args.pdf:
+        with open(args.pdf, "wb") as arquivo:
+            arquivo.write(gerar_pdf_multa(resultado, resultado.faixas, args.processo))
+
+    if args.json:
+        dados = resultado.como_dict()
+        dados['correcao'] = json.loads(resultado.correcao.to_json(orient='records'))
+        print(json.dumps(dados, default=str, ensure_ascii=False, indent=2))
+    else:
+        print(f"Fim do prazo: {resultado.data_fim_prazo.strftime('%d/%m/%Y')} | "
+              f"início da multa: {resultado.data_inicio_multa.strftime('%d/%m/%Y')}")
+        for mes_ano, base, indice, corrigido, acumulado in linhas_meses(resultado.correcao):
+            print(f"{mes_ano}: {base} x {indice} = {corrigido} (acumulado: {acumulado})")
+        print(f"Dias: {resultado.total_dias} | sem correção: {moeda_br(resultado.total_sem_correcao)} | "
+              f"corrigida até {resultado.data_atualizacao.strftime('%d/%m/%Y')}: {moeda_br(resultado.total_corrigido)}")
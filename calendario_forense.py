@@ -0,0 +1,200 @@
+"""Calendário forense das calculadoras de multa: feriados nacionais, locais e suspensões de prazo.
+
+Os feriados nacionais vêm do workalendar; feriados estaduais, municipais e da
+Justiça Federal e os períodos de suspensão (recesso) vêm de um CSV local
+(variável de ambiente CALENDARIO_FORENSE, vazia para desligar), no formato
+
+    inicio;fim;tipo;descricao;desde
+
+em que inicio/fim são "dd/mm" (todo ano), "dd/mm/aaaa" (só naquele ano) ou
+"pascoa+N"/"pascoa-N"; fim vazio é um dia só e fim antes do início atravessa o
+ano (20/12 a 20/01). tipo é "feriado" ou "suspensao"; desde é o primeiro ano
+em que a regra vale.
+
+Os dias úteis de cada intervalo de anos são calculados uma vez e guardados em
+um array ordenado: contar e somar dias úteis viram buscas binárias.
+"""
+import csv
+import os
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+import numpy as np
+from workalendar.america import Brazil
+
+CALENDARIO_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "calendario_forense.csv")
+TIPOS_PERIODO = ("feriado", "suspensao")
+DIAS_UTEIS_POR_ANO_MIN = 200
+
+
+def caminho_calendario():
+    """CSV de feriados locais e suspensões (variável de ambiente CALENDARIO_FORENSE)"""
+    return os.environ.get("CALENDARIO_FORENSE", CALENDARIO_PADRAO)
+
+
+@lru_cache(maxsize=None)
+def feriados_ano(ano):
+    """Feriados nacionais do ano (workalendar), calculados uma vez por processo"""
+    return tuple(sorted(dia for dia, _ in Brazil().holidays(ano)))
+
+
+@lru_cache(maxsize=4)
+def carregar_calendario(caminho=None):
+    """Regras do CSV local como tuplas (inicio, fim, tipo, descricao, desde)"""
+    caminho = caminho_calendario() if caminho is None else caminho
+    if not caminho or not os.path.exists(caminho):
+        return ()
+    regras = []
+    with open(caminho, encoding="utf-8", newline="") as arquivo:
+        for linha in csv.DictReader(arquivo, delimiter=";"):
+            inicio = (linha.get("inicio") or "").strip()
+            tipo = (linha.get("tipo") or "feriado").strip().lower()
+            if not inicio or inicio.startswith("#"):
+                continue
+            if tipo not in TIPOS_PERIODO:
+                raise ValueError(f"Tipo de período inválido em {caminho}: {tipo!r}")
+            desde = (linha.get("desde") or "").strip()
+            regras.append((
+                inicio.lower(),
+                (linha.get("fim") or "").strip().lower() or inicio.lower(),
+                tipo,
+                (linha.get("descricao") or "").strip(),
+                int(desde) if desde else None,
+            ))
+    return tuple(regras)
+
+
+def _data_regra(regra, ano):
+    """Data de uma regra ("dd/mm", "dd/mm/aaaa" ou "pascoa±N") no ano dado"""
+    if regra.startswith("pascoa"):
+        deslocamento = int(regra[len("pascoa"):] or 0)
+        return Brazil().get_easter_sunday(ano) + timedelta(days=deslocamento)
+    partes = regra.split("/")
+    if len(partes) == 3:
+        return datetime.strptime(regra, "%d/%m/%Y").date()
+    return date(ano, int(partes[1]), int(partes[0]))
+
+
+def periodos_locais(ano_inicio, ano_fim, tipo="feriado", caminho=None):
+    """Períodos (inicio, fim, descricao) do CSV local que tocam os anos pedidos"""
+    limite_inicio, limite_fim = date(ano_inicio, 1, 1), date(ano_fim, 12, 31)
+    periodos = []
+    for inicio, fim, tipo_regra, descricao, desde in carregar_calendario(caminho):
+        if tipo_regra != tipo:
+            continue
+        anual = inicio.count("/") != 2
+        # Regras anuais começam no ano anterior para pegar os períodos que atravessam o ano
+        for ano in (range(max(ano_inicio - 1, desde or ano_inicio - 1), ano_fim + 1) if anual else (None,)):
+            data_inicio = _data_regra(inicio, ano or limite_inicio.year)
+            data_fim = _data_regra(fim, data_inicio.year)
+            if data_fim < data_inicio:
+                data_fim = _data_regra(fim, data_inicio.year + 1)
+            if data_fim >= limite_inicio and data_inicio <= limite_fim:
+                periodos.append((max(data_inicio, limite_inicio), min(data_fim, limite_fim), descricao))
+    return sorted(periodos)
+
+
+def _dias_periodos(periodos):
+    """Todos os dias cobertos pelos períodos, em datetime64[D]"""
+    if not periodos:
+        return np.zeros(0, dtype='datetime64[D]')
+    return np.concatenate([
+        np.arange(inicio, fim + timedelta(days=1), dtype='datetime64[D]') for inicio, fim, _ in periodos
+    ])
+
+
+@lru_cache(maxsize=32)
+def feriados_periodo(ano_inicio, ano_fim, locais=True):
+    """Feriados (nacionais e, se locais, os do CSV) de ano_inicio a ano_fim em um
+    array datetime64[D] ordenado e sem repetições, no formato aceito por numpy.busday_count"""
+    nacionais = np.array(
+        [dia for ano in range(ano_inicio, ano_fim + 1) for dia in feriados_ano(ano)],
+        dtype='datetime64[D]',
+    )
+    if not locais:
+        return nacionais
+    return np.union1d(nacionais, _dias_periodos(periodos_locais(ano_inicio, ano_fim)))
+
+
+@lru_cache(maxsize=32)
+def dias_uteis_periodo(ano_inicio, ano_fim, suspensoes=False):
+    """Dias úteis de ano_inicio a ano_fim, ordenados: dias de semana fora dos
+    feriados e, com suspensoes, fora dos períodos de suspensão de prazos"""
+    dias = np.arange(date(ano_inicio, 1, 1), date(ano_fim + 1, 1, 1), dtype='datetime64[D]')
+    uteis = np.is_busday(dias, holidays=feriados_periodo(ano_inicio, ano_fim))
+    if suspensoes:
+        uteis &= ~np.isin(dias, _dias_periodos(periodos_locais(ano_inicio, ano_fim, "suspensao")))
+    resultado = dias[uteis]
+    resultado.flags.writeable = False
+    return resultado
+
+
+def contar_dias_uteis(inicio, fim, suspensoes=False):
+    """Dias úteis de inicio a fim, inclusive"""
+    if fim < inicio:
+        return 0
+    uteis = dias_uteis_periodo(inicio.year, fim.year, suspensoes)
+    primeiro = np.searchsorted(uteis, np.datetime64(inicio, 'D'), side='left')
+    return int(np.searchsorted(uteis, np.datetime64(fim, 'D'), side='right') - primeiro)
+
+
+def somar_dias_uteis(inicio, num_dias, suspensoes=False):
+    """Data em que se completam num_dias úteis, contando o próprio inicio como o
+    primeiro dia (como nas calculadoras), mesmo que ele não seja útil"""
+    if num_dias <= 1:
+        return inicio
+    ano_fim = inicio.year + num_dias // DIAS_UTEIS_POR_ANO_MIN + 1
+    while True:
+        uteis = dias_uteis_periodo(inicio.year, ano_fim, suspensoes)
+        posicao = np.searchsorted(uteis, np.datetime64(inicio, 'D'), side='right') + num_dias - 2
+        if posicao < len(uteis):
+            return uteis[posicao].astype(date)
+        ano_fim += 1
+
+
+def calcular_data_final(data_inicio, num_dias, dias_uteis=False, suspensoes=False):
+    """Último dia de um período de num_dias (úteis ou corridos) a partir de data_inicio"""
+    if dias_uteis:
+        return somar_dias_uteis(data_inicio, num_dias, suspensoes)
+    return data_inicio + timedelta(days=num_dias - 1)
+
+
+def calcular_inicio_multa(data_despacho, prazo_dias, dias_uteis=False):
+    """Fim do prazo de cumprimento e primeiro dia da multa; o prazo em dias
+    úteis também para durante as suspensões (recesso)"""
+    data_fim_prazo = calcular_data_final(data_despacho, prazo_dias, dias_uteis, suspensoes=True)
+    return data_fim_prazo, data_fim_prazo + timedelta(days=1)
+
+
+def recarregar_calendario():
+    """Descarta o calendário em memória (depois de editar o CSV local)"""
+    carregar_calendario.cache_clear()
+    feriados_periodo.cache_clear()
+    dias_uteis_periodo.cache_clear()
+
+
+def resumo_calendario(caminho=None):
+    """Quantidade de regras de feriado e de suspensão do CSV local"""
+    regras = carregar_calendario(caminho)
+    return {
+        'arquivo': caminho if caminho is not None else caminho_calendario(),
+        'feriados': sum(regra[2] == "feriado" for regra in regras),
+        'suspensoes': sum(regra[2] == "suspensao" for regra in regras),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Calendário forense das calculadoras de multa")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    listar = sub.add_parser("listar", help="feriados locais e suspensões de um ano")
+    listar.add_argument("ano", type=int)
+    args = parser.parse_args()
+
+    for tipo in TIPOS_PERIODO:
+        for inicio, fim, descricao in periodos_locais(args.ano, args.ano, tipo):
+            intervalo = inicio.strftime('%d/%m') + (f" a {fim.strftime('%d/%m')}" if fim != inicio else "")
+            print(f"{tipo:10} {intervalo:15} {descricao}")
+    print(f"Dias úteis: {len(dias_uteis_periodo(args.ano, args.ano))} "
+          f"({len(dias_uteis_periodo(args.ano, args.ano, True))} fora das suspensões)")
@@ -0,0 +1,95 @@
+"""Catálogo de referência das rubricas do HISCRE com índice de busca por prefixo."""
+import bisect
+import re
+
+import pandas as pd
+from unidecode import unidecode
+
+COLUNAS_CATALOGO = ['Código', 'Categoria', 'Nomenclatura', 'Descrição']
+CATEGORIA_DICIONARIO = "Dicionário de rubricas"
+
+PADRAO_CODIGO = re.compile(r'(\d{3})(?:\s*-\s*(\d{3}))?$')
+
+
+def normalizar(texto):
+    """Minúsculas e sem acentos, para a busca não depender de digitação"""
+    return unidecode(texto).casefold()
+
+
+def tokens(texto):
+    return re.findall(r'[a-z0-9]+', normalizar(texto))
+
+
+def linhas_markdown(texto):
+    """Lê (código, nomenclatura, descrição) de uma tabela markdown ou lista '- **101**: ...'"""
+    linhas = []
+    for linha in texto.splitlines():
+        linha = linha.strip()
+        if linha.startswith('|'):
+            colunas = [coluna.strip().strip('"').strip() for coluna in linha.strip('|').split('|')]
+            if not PADRAO_CODIGO.match(colunas[0]):
+                continue  # cabeçalho e separador
+            if len(colunas) >= 3:
+                linhas.append((colunas[0], colunas[1], colunas[2]))
+            else:
+                linhas.append((colunas[0], "", colunas[1] if len(colunas) > 1 else ""))
+        else:
+            item = re.match(r'-\s*\*\*(\d{3})\*\*:\s*(.+)', linha)
+            if item:
+                linhas.append((item.group(1), "", item.group(2).strip()))
+    return linhas
+
+
+def montar_catalogo(descricoes_rubricas, categorias_rubricas):
+    """Junta o dicionário de rubricas e as tabelas por categoria em um só catálogo"""
+    linhas = [
+        (codigo, CATEGORIA_DICIONARIO, "", descricao)
+        for codigo, descricao in descricoes_rubricas.items()
+    ]
+    for categoria, texto in categorias_rubricas.items():
+        linhas.extend((codigo, categoria, nomenclatura, descricao)
+                      for codigo, nomenclatura, descricao in linhas_markdown(texto))
+    tabela = pd.DataFrame(linhas, columns=COLUNAS_CATALOGO)
+    tabela = tabela.sort_values(['Código', 'Categoria'], kind='stable').reset_index(drop=True)
+    return {'tabela': tabela, **_montar_indice(tabela)}
+
+
+def _montar_indice(tabela):
+    """Índice invertido token -> linhas do catálogo, com os tokens ordenados para
+    achar por busca binária todos os que começam com um prefixo"""
+    linhas_por_token = {}
+    for posicao, (codigo, categoria, nomenclatura, descricao) in enumerate(tabela.itertuples(index=False)):
+        termos = set(tokens(f"{categoria} {nomenclatura} {descricao}"))
+        # Faixas como 219-250 respondem por cada código do intervalo
+        faixa = PADRAO_CODIGO.match(codigo)
+        if faixa:
+            inicio = int(faixa.group(1))
+            fim = int(faixa.group(2) or inicio)
+            termos.update(f"{numero:03d}" for numero in range(inicio, fim + 1))
+        for termo in termos:
+            linhas_por_token.setdefault(termo, set()).add(posicao)
+    return {'tokens': sorted(linhas_por_token), 'linhas_por_token': linhas_por_token}
+
+
+def _linhas_com_prefixo(catalogo, prefixo):
+    todos = catalogo['tokens']
+    linhas = set()
+    posicao = bisect.bisect_left(todos, prefixo)
+    while posicao < len(todos) and todos[posicao].startswith(prefixo):
+        linhas |= catalogo['linhas_por_token'][todos[posicao]]
+        posicao += 1
+    return linhas
+
+
+def buscar_catalogo(catalogo, consulta):
+    """Linhas em que cada palavra da consulta é prefixo de algum termo (código ou texto)"""
+    termos = tokens(consulta)
+    if not termos:
+        return catalogo['tabela']
+    linhas = None
+    for termo in termos:
+        encontrados = _linhas_com_prefixo(catalogo, termo)
+        linhas = encontrados if linhas is None else linhas & encontrados
+        if not linhas:
+            break
+    return catalogo['tabela'].iloc[sorted(linhas)]
@@ -0,0 +1,108 @@
+"""Cubo de totais do HISCRE: competência × rubrica × status, com subtotais por ano."""
+import io
+
+import pandas as pd
+from openpyxl.styles import Font
+
+from extrator_hiscre import periodos_competencia
+
+STATUS_CUBO = ("Pago", "Não Pago")
+SEM_STATUS = "Não encontrado"
+COLUNAS_CUBO = ['periodo', 'rubrica', 'status', 'valor', 'ocorrencias']
+
+
+def montar_cubo(registros):
+    """Soma e ocorrências por competência, rubrica e status em um único groupby"""
+    if registros.empty:
+        return pd.DataFrame(columns=COLUNAS_CUBO)
+    chaves = [
+        periodos_competencia(registros['competencia']).rename('periodo'),
+        registros['rubrica'],
+        registros['status'].fillna(SEM_STATUS),
+    ]
+    return registros['valor'].groupby(chaves, sort=True, dropna=False).agg(
+        valor='sum', ocorrencias='size'
+    ).reset_index()
+
+
+def _colunas_status(por_status):
+    """Pago e Não Pago sempre; linhas sem status só quando existirem"""
+    return [*STATUS_CUBO, *([SEM_STATUS] if SEM_STATUS in por_status else [])]
+
+
+def tabela_competencias(cubo, status=None, rubricas=None):
+    """Visão dinâmica: uma linha por competência com as rubricas em colunas,
+    o total, a divisão Pago/Não Pago, o acumulado e uma linha de subtotal por ano"""
+    dados = cubo.dropna(subset=['periodo'])
+    if status:
+        dados = dados[dados['status'] == status]
+    if rubricas:
+        dados = dados[dados['rubrica'].isin(frozenset(rubricas))]
+    if dados.empty:
+        return pd.DataFrame()
+
+    tabela = dados.pivot_table(index='periodo', columns='rubrica', values='valor', aggfunc='sum', fill_value=0.0)
+    tabela.columns.name = None
+    por_status = dados.pivot_table(index='periodo', columns='status', values='valor', aggfunc='sum', fill_value=0.0)
+    tabela['Total'] = tabela.sum(axis=1)
+    for nome_status in _colunas_status(por_status):
+        tabela[nome_status] = por_status[nome_status] if nome_status in por_status else 0.0
+    tabela['Acumulado'] = tabela['Total'].cumsum()
+
+    anos = tabela.index.year
+    subtotais = tabela.groupby(anos).sum()
+    subtotais['Acumulado'] = tabela['Acumulado'].groupby(anos).last()
+    partes = []
+    for ano, meses in tabela.groupby(anos):
+        partes.append(meses.set_axis(meses.index.strftime('%m/%Y')))
+        partes.append(subtotais.loc[[ano]].set_axis([f"Total {ano}"]))
+    resultado = pd.concat(partes)
+    resultado.index.name = 'Comp.'
+    return resultado.reset_index()
+
+
+def detalhar(cubo, ano, mes=None):
+    """Drill-down: rubricas × status de um ano inteiro ou de uma competência"""
+    selecao = cubo['periodo'].dt.year == ano
+    if mes:
+        selecao &= cubo['periodo'].dt.month == mes
+    dados = cubo[selecao]
+    if dados.empty:
+        return pd.DataFrame()
+
+    detalhe = dados.pivot_table(index='rubrica', columns='status', values='valor', aggfunc='sum', fill_value=0.0)
+    detalhe = detalhe.reindex(columns=_colunas_status(detalhe), fill_value=0.0)
+    detalhe.columns.name = None
+    detalhe['Total'] = detalhe.sum(axis=1)
+    detalhe['Ocorrências'] = dados.groupby('rubrica')['ocorrencias'].sum()
+    detalhe.index.name = 'Rubrica'
+    return detalhe.reset_index()
+
+
+def gerar_planilha_cubo(cubo):
+    """XLSX com a visão por competência (subtotais em negrito) e o cubo completo"""
+    competencias = tabela_competencias(cubo)
+    completo = pd.DataFrame({
+        'Comp.': cubo['periodo'].dt.strftime('%m/%Y').fillna("Não encontrada"),
+        'Rubrica': cubo['rubrica'],
+        'Status': cubo['status'],
+        'Valor (R$)': cubo['valor'],
+        'Ocorrências': cubo['ocorrencias'],
+    })
+
+    saida = io.BytesIO()
+    with pd.ExcelWriter(saida, engine='openpyxl') as planilha:
+        competencias.to_excel(planilha, sheet_name='Competências', index=False)
+        completo.to_excel(planilha, sheet_name='Cubo', index=False)
+
+        aba = planilha.sheets['Competências']
+        for linha in aba.iter_rows(min_row=2):
+            subtotal = str(linha[0].value).startswith("Total")
+            for celula in linha:
+                if celula.column > 1:
+                    celula.number_format = '"R$" #,##0.00'
+                if subtotal:
+                    celula.font = Font(bold=True)
+        for (valor,) in planilha.sheets['Cubo'].iter_rows(min_row=2, min_col=4, max_col=4):
+            valor.number_format = '"R$" #,##0.00'
+    return saida.getvalue()
@@ -0,0 +1,573 @@
+"""Motor de extração do HISCRE: lê o PDF uma única vez e monta a tabela de linhas."""
+import hashlib
+import io
+import os
+import re
+import tracemalloc
+from array import array
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pdfplumber
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+try:
+    import pymupdf
+except ImportError:
+    try:
+        import fitz as pymupdf
+    except ImportError:
+        pymupdf = None
+
+# Versão da lógica de extração: altere sempre que a tabela de registros mudar,
+# para invalidar os documentos guardados no cache local
+VERSAO_EXTRATOR = 4
+
+# Colunas da tabela de registros (uma linha por rubrica encontrada no documento)
+COLUNAS_REGISTROS = ['pagina', 'competencia', 'rubrica', 'descricao', 'valor', 'status', 'nb', 'nome']
+
+# Leitores de texto disponíveis; o PyMuPDF é bem mais rápido e o pdfplumber
+# fica como referência e como fallback para páginas de layout duvidoso
+BACKENDS = {'pymupdf': "PyMuPDF (rápido)", 'pdfplumber': "pdfplumber"}
+BACKEND_PADRAO = 'pymupdf' if pymupdf is not None else 'pdfplumber'
+TOLERANCIA_LINHA = 3
+
+# Modo de baixa memória: quantas páginas do PDF ficam abertas de cada vez
+# (variável de ambiente HISCRE_PAGINAS_JANELA) e o tipo do array de códigos
+# de cada coluna de texto
+PAGINAS_JANELA = int(os.environ.get("HISCRE_PAGINAS_JANELA", 50))
+TIPOS_CODIGOS = {'competencia': 'H', 'rubrica': 'H', 'descricao': 'I', 'status': 'B', 'nb': 'I', 'nome': 'I'}
+
+
+def ler_conteudo(file):
+    """Retorna os bytes de um arquivo enviado (UploadedFile, caminho ou bytes)"""
+    if isinstance(file, (bytes, bytearray)):
+        return bytes(file)
+    if isinstance(file, str):
+        with open(file, 'rb') as f:
+            return f.read()
+    if hasattr(file, 'getvalue'):
+        return file.getvalue()
+    file.seek(0)
+    return file.read()
+
+
+def hash_conteudo(conteudo):
+    """SHA-256 do conteúdo do PDF, usado como chave do documento processado"""
+    return hashlib.sha256(conteudo).hexdigest()
+
+
+def textos_paginas(conteudo, backend=None, inicio=0, fim=None):
+    """Gera (número da página, texto) para as páginas [inicio, fim) do PDF"""
+    backend = backend or BACKEND_PADRAO
+    if backend == 'pymupdf' and pymupdf is not None:
+        yield from _textos_pymupdf(conteudo, inicio, fim)
+    else:
+        yield from _textos_pdfplumber(conteudo, inicio, fim)
+
+
+def _textos_pdfplumber(conteudo, inicio=0, fim=None):
+    paginas = None if inicio == 0 and fim is None else list(range(inicio + 1, fim + 1))
+    with pdfplumber.open(io.BytesIO(conteudo), pages=paginas) as pdf:
+        for num_pagina, pagina in enumerate(pdf.pages, start=inicio + 1):
+            texto = pagina.extract_text()
+            # Libera os objetos de layout da página já lida
+            pagina.close()
+            yield num_pagina, texto
+
+
+def _textos_pymupdf(conteudo, inicio=0, fim=None):
+    """PyMuPDF como caminho rápido; páginas com linhas de rubrica que não
+    batem com o padrão esperado ou com competências fora de ordem são relidas
+    com o pdfplumber"""
+    pdf_plumber = None
+    try:
+        with pymupdf.open(stream=conteudo, filetype='pdf') as doc:
+            fim = len(doc) if fim is None else fim
+            # A ordem das competências é conferida contra a página anterior
+            # mesmo quando o intervalo começa no meio do documento, para que
+            # janelas e lotes releiam exatamente as mesmas páginas
+            anterior = _ultima_competencia(_texto_por_palavras(doc[inicio - 1])) if inicio > 0 else None
+            for indice in range(inicio, fim):
+                texto = _texto_por_palavras(doc[indice])
+                suspeita = _pagina_suspeita(texto, anterior)
+                anterior = _ultima_competencia(texto, anterior)
+                if suspeita:
+                    if pdf_plumber is None:
+                        pdf_plumber = pdfplumber.open(io.BytesIO(conteudo))
+                    pagina = pdf_plumber.pages[indice]
+                    texto = pagina.extract_text()
+                    pagina.close()
+                yield indice + 1, texto
+    finally:
+        if pdf_plumber is not None:
+            pdf_plumber.close()
+
+
+def _texto_por_palavras(pagina):
+    """Monta as linhas a partir das palavras, agrupadas pela altura na página,
+    separadas por um espaço como faz o extract_text() do pdfplumber"""
+    linhas = []
+    topo = None
+    for x0, y0, _x1, _y1, palavra, *_ in sorted(pagina.get_text("words"), key=lambda p: (p[1], p[0])):
+        if topo is None or y0 - topo > TOLERANCIA_LINHA:
+            linhas.append([])
+            topo = y0
+        linhas[-1].append((x0, palavra))
+    return '\n'.join(' '.join(palavra for _, palavra in sorted(linha)) for linha in linhas)
+
+
+def _competencias(texto):
+    """Gera (linha, (ano, mês)) para cada linha de competência do texto, e
+    (linha, None) para as linhas de NB, onde a ordem recomeça"""
+    for linha in texto.split('\n'):
+        if 'NB:' in linha:
+            yield linha, None
+        elif linha[2:3] == '/' and linha[:2].isdigit():
+            inicio = PADRAO_INICIO.match(linha)
+            if inicio is not None and inicio.lastgroup == 'competencia':
+                mes, ano = inicio.group('competencia').split('/')
+                yield linha, (int(ano), int(mes))
+
+
+def _ultima_competencia(texto, anterior=None):
+    """Última competência (ano, mês) do texto, ou 'anterior' se não houver"""
+    for _, competencia in _competencias(texto or ''):
+        anterior = competencia
+    return anterior
+
+
+def _pagina_suspeita(texto, anterior=None):
+    """Indica se a página deve ser relida pelo pdfplumber.
+
+    Além das linhas de rubrica fora do padrão, confere a ordem das linhas: o
+    HISCRE lista as competências em ordem crescente, então uma competência
+    menor que a anterior (nesta página ou na última da página anterior,
+    'anterior') ou uma linha de competência com valor em R$ indica linhas
+    reordenadas ou fundidas. Um falso positivo só custa a releitura da página.
+    """
+    if not texto:
+        return True
+    for linha in texto.split('\n'):
+        if linha.startswith('R$'):
+            return True
+        if 'R$' in linha and linha[:3].isdigit():
+            inicio = PADRAO_INICIO.match(linha)
+            if inicio is None or inicio.group('rubrica') is None:
+                return True
+    for linha, competencia in _competencias(texto):
+        if competencia is not None:
+            if 'R$' in linha or (anterior is not None and competencia < anterior):
+                return True
+        anterior = competencia
+    return False
+
+
+# ======= Classificador de linhas =======
+# Padrões compilados uma única vez. Linhas de rubrica e de competência são
+# mutuamente exclusivas (a rubrica começa com três dígitos, a competência com
+# "dd/"), então uma única alternação ancorada no início classifica as duas.
+PADRAO_NOME = re.compile(r'Nome:\s*([A-Z\s\.\-ÇÃÁÉÍÓÚÂÊÔ]+)')
+PADRAO_NB = re.compile(r'NB:\s*([\d\.\-]+)')
+PADRAO_IGNORAR = re.compile(
+    r'(?i:Compet\.\s*(?:Inicial|Final)|Nasc)'
+    r'|\d{2}/[A-Za-z]{3}/\d{4}\s+\d{2}:\d{2}:\d{2}'
+)
+PADRAO_INICIO = re.compile(
+    r'(?P<rubrica>\d{3})\s+(?P<descricao>[A-Z0-9\s\.\-ÇÃÁÉÍÓÚÂÊÔ\/]+)\s+R\$[\s]*(?P<valor>[\d\.,]+)'
+    r'|\s*(?P<competencia>\d{2}/\d{4})'
+)
+
+TIPOS_LINHA = ('nome', 'nbs', 'ignorada', 'competencia', 'status', 'rubrica', 'outra')
+
+
+def classificar_linha(linha, contagem=None):
+    """Classifica uma linha do HISCRE em uma única varredura.
+
+    Retorna um dicionário apenas com o que a linha informa (nome, nbs,
+    competencia, status, rubrica). Linhas ignoradas retornam 'ignorada' junto
+    com nome/nbs, que são capturados mesmo nelas.
+    """
+    info = {}
+    if 'Nome:' in linha:
+        nome_match = PADRAO_NOME.search(linha)
+        if nome_match:
+            info['nome'] = nome_match.group(1).strip()
+    if 'NB:' in linha:
+        nbs = PADRAO_NB.findall(linha)
+        if nbs:
+            info['nbs'] = nbs
+
+    if PADRAO_IGNORAR.search(linha):
+        info['ignorada'] = True
+    else:
+        inicio = PADRAO_INICIO.match(linha)
+        if inicio:
+            if inicio.lastgroup == 'competencia':
+                info['competencia'] = inicio.group('competencia')
+            else:
+                info['rubrica'] = inicio.group('rubrica', 'descricao', 'valor')
+        if "Pago" in linha:
+            info['status'] = "Não Pago" if "Não Pago" in linha else "Pago"
+
+    if contagem is not None:
+        for tipo in info:
+            contagem[tipo] += 1
+        if not info:
+            contagem['outra'] += 1
+    return info
+
+
+def novo_lote(registros=None):
+    """Lote vazio; 'registros' pode ser uma lista ou um ColunasRegistros"""
+    return {
+        'registros': [] if registros is None else registros,
+        'nbs': set(),
+        'nome': "",
+        'contagem': Counter(),
+    }
+
+
+def percorrer_paginas(paginas, lote):
+    """Processa as páginas uma a uma, gerando (número da página, registros da página).
+
+    Competência, status, NB e nome atravessam as páginas; registros, NBs e
+    contagem se acumulam em 'lote', e 'nome' só fica definitivo quando o
+    gerador é consumido até o fim.
+    """
+    registros = lote['registros']
+    nbs = lote['nbs']
+    contagem = lote['contagem']
+    nome = ""
+    nb_atual = None
+    competencia_atual = None
+    status_atual = None
+
+    for num_pagina, texto in paginas:
+        inicio_pagina = len(registros)
+        for linha in (texto.split('\n') if texto else ()):
+            info = classificar_linha(linha, contagem)
+            if not info:
+                continue
+
+            if 'nome' in info:
+                nome = info['nome']
+            if 'nbs' in info:
+                nbs.update(info['nbs'])
+                nb_atual = info['nbs'][-1]
+            if 'ignorada' in info:
+                continue
+
+            if 'competencia' in info:
+                competencia_atual = info['competencia']
+            if 'status' in info:
+                status_atual = info['status']
+
+            if 'rubrica' in info:
+                rubrica, descricao, valor_texto = info['rubrica']
+                registros.append((
+                    num_pagina,
+                    competencia_atual,
+                    rubrica,
+                    descricao.strip(),
+                    float(valor_texto.replace('.', '').replace(',', '.')),
+                    status_atual,
+                    nb_atual,
+                    nome or None,
+                ))
+        yield num_pagina, registros[inicio_pagina:]
+
+    lote['nome'] = nome
+
+
+def finalizar_lote(lote):
+    """Monta (nome, NBs, tabela de registros, contagem) a partir do lote"""
+    df = pd.DataFrame.from_records(lote['registros'], columns=COLUNAS_REGISTROS)
+    df = df.astype({'pagina': 'int32', 'valor': 'float64'})
+    return lote['nome'], sorted(lote['nbs']), df, dict(lote['contagem'])
+
+
+def processar_paginas(paginas):
+    """Percorre as linhas de todas as páginas e monta a tabela de registros"""
+    lote = novo_lote()
+    for _ in percorrer_paginas(paginas, lote):
+        pass
+    return finalizar_lote(lote)
+
+
+# ======= Modo de baixa memória =======
+class ColunasRegistros:
+    """Registros guardados coluna a coluna em arrays tipados, no lugar de uma
+    lista de tuplas: int32 para a página, float64 para o valor e códigos
+    compactos para os textos que se repetem (rubrica, status, competência...).
+
+    Aceita append(), len() e fatias como a lista usada por percorrer_paginas().
+    """
+
+    def __init__(self):
+        self.pagina = array('i')
+        self.valor = array('d')
+        self.codigos = {campo: array(tipo) for campo, tipo in TIPOS_CODIGOS.items()}
+        # O código 0 é reservado para o valor ausente (None)
+        self.categorias = {campo: [None] for campo in TIPOS_CODIGOS}
+        self._indices = {campo: {None: 0} for campo in TIPOS_CODIGOS}
+
+    def append(self, registro):
+        for campo, valor in zip(COLUNAS_REGISTROS, registro):
+            if campo == 'pagina':
+                self.pagina.append(valor)
+            elif campo == 'valor':
+                self.valor.append(valor)
+            else:
+                indice = self._indices[campo]
+                codigo = indice.get(valor)
+                if codigo is None:
+                    codigo = indice[valor] = len(self.categorias[campo])
+                    self.categorias[campo].append(valor)
+                self.codigos[campo].append(codigo)
+
+    def __len__(self):
+        return len(self.pagina)
+
+    def __getitem__(self, fatia):
+        return list(zip(*(
+            self.pagina[fatia] if campo == 'pagina'
+            else self.valor[fatia] if campo == 'valor'
+            else [self.categorias[campo][codigo] for codigo in self.codigos[campo][fatia]]
+            for campo in COLUNAS_REGISTROS
+        )))
+
+    def para_dataframe(self):
+        """Tabela de registros com as mesmas colunas e tipos de finalizar_lote();
+        os textos de cada coluna são compartilhados entre as linhas"""
+        colunas = {}
+        for campo in COLUNAS_REGISTROS:
+            if campo == 'pagina':
+                colunas[campo] = np.frombuffer(self.pagina, dtype=np.int32).copy()
+            elif campo == 'valor':
+                colunas[campo] = np.frombuffer(self.valor, dtype=np.float64).copy()
+            else:
+                categorias = np.array(self.categorias[campo], dtype=object)
+                colunas[campo] = categorias[np.frombuffer(self.codigos[campo], dtype=self.codigos[campo].typecode)]
+        return pd.DataFrame(colunas, columns=COLUNAS_REGISTROS)
+
+
+def textos_em_janelas(conteudo, backend=None, paginas_janela=None, total_paginas=None):
+    """Como textos_paginas(), mas reabrindo o PDF a cada 'paginas_janela' páginas,
+    para que o leitor nunca mantenha mais que uma janela carregada"""
+    paginas_janela = paginas_janela or PAGINAS_JANELA
+    total_paginas = contar_paginas(conteudo) if total_paginas is None else total_paginas
+    for inicio in range(0, total_paginas, paginas_janela):
+        yield from textos_paginas(conteudo, backend, inicio, min(inicio + paginas_janela, total_paginas))
+
+
+def finalizar_colunas(lote):
+    """Equivalente a finalizar_lote() para um lote em ColunasRegistros"""
+    return lote['nome'], sorted(lote['nbs']), lote['registros'].para_dataframe(), dict(lote['contagem'])
+
+
+def processar_baixa_memoria(conteudo, backend=None, paginas_janela=None):
+    """Processamento serial com o PDF aberto em janelas e registros em colunas"""
+    lote = novo_lote(ColunasRegistros())
+    for _ in percorrer_paginas(textos_em_janelas(conteudo, backend, paginas_janela), lote):
+        pass
+    return finalizar_colunas(lote)
+
+
+def medir_memoria(funcao, *args, rastrear=True):
+    """Executa a função e retorna (resultado, memória) com o pico de RSS do
+    processo e, com 'rastrear', o pico de alocações Python (tracemalloc), em MB.
+    O tracemalloc deixa o pdfplumber bem mais lento: use só em medições."""
+    pico = None
+    if rastrear:
+        ja_medindo = tracemalloc.is_tracing()
+        if ja_medindo:
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.start()
+    try:
+        resultado = funcao(*args)
+        if rastrear:
+            pico = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    finally:
+        if rastrear and not ja_medindo:
+            tracemalloc.stop()
+    # ru_maxrss vem em KB no Linux
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 if resource is not None else None
+    return resultado, {'pico_python_mb': pico, 'pico_rss_mb': rss}
+
+
+def contar_paginas(conteudo):
+    if pymupdf is not None:
+        with pymupdf.open(stream=conteudo, filetype='pdf') as doc:
+            return len(doc)
+    with pdfplumber.open(io.BytesIO(conteudo)) as pdf:
+        return len(pdf.pages)
+
+
+def extrair_documento(conteudo, backend=None, baixa_memoria=False, paginas_janela=None):
+    """Extrai o documento inteiro em uma única passada pelo PDF.
+
+    Com 'baixa_memoria' o PDF fica aberto com no máximo 'paginas_janela'
+    páginas de cada vez e os registros vão em colunas tipadas; o pico de
+    memória vai em 'memoria'.
+    """
+    backend = backend or BACKEND_PADRAO
+    memoria = None
+    if baixa_memoria:
+        (nome, nbs, registros, contagem), memoria = medir_memoria(
+            processar_baixa_memoria, conteudo, backend, paginas_janela, rastrear=False
+        )
+    else:
+        nome, nbs, registros, contagem = processar_paginas(textos_paginas(conteudo, backend))
+    documento = {
+        'hash': hash_conteudo(conteudo),
+        'backend': backend,
+        'nome': nome,
+        'nbs': nbs,
+        'registros': registros,
+        'contagem': contagem,
+    }
+    if memoria is not None:
+        documento['memoria'] = memoria
+    return documento
+
+
+def extrair_documento_incremental(conteudo, backend=None, baixa_memoria=False, paginas_janela=None):
+    """Extrai página a página, gerando o progresso à medida que avança.
+
+    Cada evento traz 'pagina', 'total_paginas' e os 'registros' novos daquela
+    página (já com competência, status, NB e nome corretos). O último evento
+    traz também o 'documento' completo, igual ao de extrair_documento().
+    """
+    backend = backend or BACKEND_PADRAO
+    total_paginas = contar_paginas(conteudo)
+    if baixa_memoria:
+        lote = novo_lote(ColunasRegistros())
+        paginas = textos_em_janelas(conteudo, backend, paginas_janela, total_paginas)
+    else:
+        lote = novo_lote()
+        paginas = textos_paginas(conteudo, backend)
+    for num_pagina, registros in percorrer_paginas(paginas, lote):
+        yield {'pagina': num_pagina, 'total_paginas': total_paginas, 'registros': registros}
+
+    nome, nbs, registros, contagem = finalizar_colunas(lote) if baixa_memoria else finalizar_lote(lote)
+    yield {
+        'pagina': total_paginas,
+        'total_paginas': total_paginas,
+        'registros': [],
+        'documento': {
+            'hash': hash_conteudo(conteudo),
+            'backend': backend,
+            'nome': nome,
+            'nbs': nbs,
+            'registros': registros,
+            'contagem': contagem,
+        },
+    }
+
+
+# Troca vírgula e ponto do formato americano para o brasileiro
+_TABELA_MOEDA_BR = str.maketrans(",.", ".,")
+
+
+def formatar_moeda(valor):
+    return f"R$ {valor:,.2f}".translate(_TABELA_MOEDA_BR)
+
+
+def formatar_moeda_serie(valores):
+    """Formata uma série numérica em Real de uma vez (só na exibição/exportação)"""
+    return "R$ " + valores.map("{:,.2f}".format).str.translate(_TABELA_MOEDA_BR)
+
+
+def periodos_competencia(competencias):
+    """Converte a coluna 'MM/AAAA' para Period mensal em lote (inválidas viram NaT)"""
+    return pd.to_datetime(competencias, format='%m/%Y', errors='coerce').dt.to_period('M')
+
+
+# ======= Filtro de rubricas =======
+PADRAO_FAIXA_RUBRICAS = re.compile(r'(\d{1,3})\s*(?:-|a|até)\s*(\d{1,3})', re.IGNORECASE)
+
+
+def compilar_filtro_rubricas(termos, categorias=None):
+    """Compila a busca em um conjunto de códigos para teste de pertinência O(1).
+
+    'termos' aceita códigos, faixas e nomes de categoria separados por vírgula,
+    ponto e vírgula ou quebra de linha (ex.: "101, 201-217, Consignações").
+    'categorias' associa o nome de cada categoria aos seus códigos.
+    Retorna (frozenset de códigos, lista de termos não reconhecidos).
+    """
+    categorias = {nome.casefold(): codigos for nome, codigos in (categorias or {}).items()}
+    codigos = set()
+    nao_reconhecidos = []
+    for termo in re.split(r'[,;\n]+', termos or ""):
+        termo = termo.strip()
+        if not termo:
+            continue
+        faixa = PADRAO_FAIXA_RUBRICAS.fullmatch(termo)
+        if faixa:
+            inicio, fim = sorted((int(faixa.group(1)), int(faixa.group(2))))
+            codigos.update(f"{codigo:03d}" for codigo in range(inicio, fim + 1))
+        elif termo.isdigit() and len(termo) <= 3:
+            codigos.add(termo.zfill(3))
+        elif termo.casefold() in categorias:
+            codigos.update(categorias[termo.casefold()])
+        else:
+            nao_reconhecidos.append(termo)
+    return frozenset(codigos), nao_reconhecidos
+
+
+def filtrar_rubricas(registros, rubricas_filtrar):
+    """Consulta da aba de busca: rubricas filtradas, em ordem de competência.
+
+    'Valor (R$)' continua numérico e 'Período' guarda a competência como
+    Period; a formatação em Real fica para formatar_exibicao().
+    """
+    df = registros
+    if rubricas_filtrar:
+        df = df[df['rubrica'].isin(frozenset(rubricas_filtrar))]
+    if df.empty:
+        return pd.DataFrame()
+
+    df = pd.DataFrame({
+        'p.p HISCRE': df['pagina'],
+        'Comp.': df['competencia'].fillna("Não encontrada"),
+        'Rubrica': df['rubrica'],
+        'Descrição': df['descricao'],
+        'Valor (R$)': df['valor'],
+        'Status': df['status'].fillna("Não encontrado"),
+        'Período': periodos_competencia(df['competencia']),
+    })
+    return df.sort_values('Período', kind='stable', na_position='last').reset_index(drop=True)
+
+
+def formatar_exibicao(df):
+    """Tabela de busca pronta para tela/CSV: valor em Real e sem a coluna auxiliar"""
+    if df.empty:
+        return df
+    exibicao = df.drop(columns=['Período'])
+    exibicao['Valor (R$)'] = formatar_moeda_serie(exibicao['Valor (R$)'])
+    return exibicao
+
+
+def resumir_rubricas(registros, descricoes_referencia):
+    """Consulta da aba de análise: rubricas únicas com descrição e ocorrências"""
+    rubricas_encontradas = {}
+    if registros.empty:
+        return rubricas_encontradas
+
+    resumo = registros.groupby('rubrica', sort=False).agg(
+        descricao_doc=('descricao', 'first'),
+        ocorrencias=('rubrica', 'size'),
+    )
+    for rubrica, linha in resumo.iterrows():
+        rubricas_encontradas[rubrica] = {
+            "descricao_doc": linha['descricao_doc'],
+            "descricao_ref": descricoes_referencia.get(rubrica, "Não encontrada na referência"),
+            "ocorrencias": int(linha['ocorrencias']),
+        }
+    return rubricas_encontradas
@@ -0,0 +1,510 @@
+"""Armazenamento local (SQLite) das taxas SELIC mensais usadas nas calculadoras de multa.
+
+As taxas ficam em disco e são lidas uma vez por processo. A atualização é
+explícita e incremental: só os meses posteriores ao último já guardado são
+acrescentados. Sem rede (SELIC_OFFLINE=1), a fonte é o selic.csv distribuído
+ao lado do módulo (ou o CSV de SELIC_CSV), no mesmo formato do arquivo
+publicado ("mês/ano;taxa"); "python indices_selic.py atualizar" regrava esse
+CSV e o selic_fatores.csv a partir do banco atualizado.
+"""
+import hashlib
+import os
+import sqlite3
+import time
+from contextlib import closing
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import requests
+
+URL_SELIC = "https://raw.githubusercontent.com/carlospatrickds/vscode_python/master/selic.csv"
+TIMEOUT_SEGUNDOS = 15
+
+DIRETORIO_PADRAO = os.path.join(os.path.expanduser("~"), ".cache", "multa")
+CSV_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "selic.csv")
+FATORES_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "selic_fatores.csv")
+TOLERANCIA_FATORES = 1e-12
+
+MESES = {
+    'jan': 1, 'fev': 2, 'mar': 3, 'abr': 4, 'mai': 5, 'jun': 6,
+    'jul': 7, 'ago': 8, 'set': 9, 'out': 10, 'nov': 11, 'dez': 12,
+    'mr': 3, 'det': 12,  # Tratamento para erros comuns
+}
+
+
+def diretorio_dados():
+    """Diretório do banco de taxas (variável de ambiente SELIC_DIR)"""
+    return os.environ.get("SELIC_DIR", DIRETORIO_PADRAO)
+
+
+def caminho_csv_local():
+    """CSV local usado no modo offline (variável de ambiente SELIC_CSV)"""
+    return os.environ.get("SELIC_CSV", CSV_PADRAO)
+
+
+def caminho_fatores():
+    """CSV de fatores acumulados distribuído com o aplicativo (variável de ambiente SELIC_FATORES)"""
+    return os.environ.get("SELIC_FATORES", FATORES_PADRAO)
+
+
+def modo_offline():
+    return os.environ.get("SELIC_OFFLINE", "").lower() in ("1", "true", "sim")
+
+
+def _conectar(diretorio=None):
+    diretorio = diretorio or diretorio_dados()
+    os.makedirs(diretorio, exist_ok=True)
+    conn = sqlite3.connect(os.path.join(diretorio, "selic.sqlite3"), timeout=30)
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS selic (
+            mes TEXT PRIMARY KEY,
+            taxa REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS metadados (
+            chave TEXT PRIMARY KEY,
+            valor TEXT
+        );
+        CREATE TABLE IF NOT EXISTS fatores_acumulados (
+            versao TEXT NOT NULL,
+            inicio TEXT NOT NULL,
+            fim TEXT NOT NULL,
+            fator REAL NOT NULL,
+            PRIMARY KEY (versao, inicio, fim)
+        );
+    """)
+    return conn
+
+
+def interpretar_csv(texto):
+    """Lê o CSV "mês/ano;taxa" (ex.: "jan/20;0,0038") em um DataFrame Data/Taxa.
+
+    Mesmas regras de antes, em operações de coluna: mês pelas três primeiras
+    letras, ano pelos dígitos restantes (dois dígitos viram 20xx) e taxa com
+    vírgula decimal. Linhas inválidas são descartadas e, se um mês se repetir,
+    vale a primeira ocorrência.
+    """
+    linhas = pd.Series(texto.splitlines(), dtype=object).str.strip()
+    linhas = linhas[linhas.str.contains(';', regex=False)]
+    if linhas.empty:
+        return pd.DataFrame({'Data': pd.Series(dtype='datetime64[ns]'), 'Taxa': pd.Series(dtype=float)})
+
+    partes = linhas.str.split(';', n=2, expand=True)
+    mes_ano = partes[0].str.strip().str.lower()
+    ano = mes_ano.str[3:].str.replace(r'\D', '', regex=True)
+    ano = ano.mask(ano.str.len() == 2, '20' + ano).mask(ano.str.len() == 1, '200' + ano)
+    taxa = partes[1].str.strip().str.replace(',', '.', regex=False).str.replace(r'[^\d.]', '', regex=True)
+
+    df = pd.DataFrame({
+        'year': pd.to_numeric(ano, errors='coerce'),
+        'month': mes_ano.str[:3].map(MESES),
+        'day': 1,
+    })
+    df = pd.DataFrame({
+        'Data': pd.to_datetime(df.dropna(), errors='coerce').reindex(df.index),
+        'Taxa': pd.to_numeric(taxa, errors='coerce'),
+    }).dropna(subset=['Data', 'Taxa'])
+    df = df.sort_values('Data', kind='stable').drop_duplicates('Data')
+    return df.reset_index(drop=True)
+
+
+def interpretar_indices_colados(texto):
+    """Índices (%) por competência 'AAAA-MM' de um texto colado do site do BCB ou
+    de uma planilha: uma competência por linha ("01/2024", "jan/2024" ou
+    "2024-01") e, no fim da linha, o índice com vírgula ou ponto decimal (o "%"
+    é opcional). Linhas sem os dois são ignoradas; se um mês se repetir, vale a
+    primeira ocorrência."""
+    linhas = pd.Series(texto.splitlines(), dtype=object).str.strip().str.lower()
+    partes = linhas.str.extract(
+        r'^(?:(?P<ano_iso>\d{4})-(?P<mes_iso>\d{2})|(?P<mes>\d{1,2}|[a-zç]{3})[a-zç]*\s*[/.\- ]\s*(?P<ano>\d{4}|\d{2}))'
+        r'\D.*?(?P<valor>-?\d[\d.]*(?:,\d+)?)\s*%?$'
+    )
+    mes = partes['mes'].fillna(partes['mes_iso'])
+    mes = pd.to_numeric(mes, errors='coerce').fillna(mes.str[:3].map(MESES))
+    ano = partes['ano'].fillna(partes['ano_iso'])
+    ano = pd.to_numeric(ano.mask(ano.str.len() == 2, '20' + ano), errors='coerce')
+    valor = partes['valor']
+    valor = valor.mask(valor.str.contains(',', regex=False, na=False),
+                       valor.str.replace('.', '', regex=False).str.replace(',', '.', regex=False))
+    df = pd.DataFrame({'ano': ano, 'mes': mes, 'valor': pd.to_numeric(valor, errors='coerce')}).dropna()
+    df = df[df['mes'].between(1, 12)].astype({'ano': int, 'mes': int})
+    df['competencia'] = df['ano'].astype(str).str.zfill(4) + '-' + df['mes'].astype(str).str.zfill(2)
+    df = df.drop_duplicates('competencia').sort_values('competencia')
+    return dict(zip(df['competencia'], df['valor'].tolist()))
+
+
+def ultimo_mes(diretorio=None):
+    """Último mês guardado ('AAAA-MM') ou None com o banco vazio"""
+    with closing(_conectar(diretorio)) as conn:
+        return conn.execute("SELECT MAX(mes) FROM selic").fetchone()[0]
+
+
+def gravar_taxas(df, origem, diretorio=None):
+    """Acrescenta os meses posteriores ao último guardado e regrava o último, que
+    pode ter sido gravado ainda parcial ou revisto pela fonte; retorna quantos
+    meses entraram ou mudaram"""
+    with closing(_conectar(diretorio)) as conn:
+        ultimo, taxa_ultimo = conn.execute(
+            "SELECT mes, taxa FROM selic ORDER BY mes DESC LIMIT 1"
+        ).fetchone() or (None, None)
+    meses = df['Data'].dt.strftime('%Y-%m')
+    novos = df[meses >= ultimo] if ultimo else df
+    meses_novos = novos['Data'].dt.strftime('%Y-%m')
+    revisado = bool(ultimo) and (novos.loc[meses_novos == ultimo, 'Taxa'] != taxa_ultimo).any()
+    with closing(_conectar(diretorio)) as conn, conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO selic (mes, taxa) VALUES (?, ?)",
+            zip(meses_novos, novos['Taxa'].astype(float)),
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO metadados (chave, valor) VALUES (?, ?)",
+            [('origem', origem), ('atualizado_em', str(time.time()))],
+        )
+    serie_selic.cache_clear()
+    fatores_selic.cache_clear()
+    versao_serie.cache_clear()
+    alterados = int((meses_novos > ultimo).sum() + revisado) if ultimo else len(novos)
+    if alterados:
+        regenerar_fatores(diretorio)
+    return alterados
+
+
+def importar_csv(caminho=None, diretorio=None):
+    """Alimenta o banco a partir de um CSV local (modo offline)"""
+    caminho = caminho or caminho_csv_local()
+    with open(caminho, encoding='utf-8-sig') as arquivo:
+        return gravar_taxas(interpretar_csv(arquivo.read()), f"arquivo {os.path.basename(caminho)}", diretorio)
+
+
+def exportar_csv(caminho=None, diretorio=None):
+    """Grava a série do banco no formato publicado ("mês/ano;taxa"), para
+    distribuir com o aplicativo como fonte do modo offline; retorna quantos meses"""
+    nomes = {numero: nome for nome, numero in list(MESES.items())[:12]}
+    with closing(_conectar(diretorio)) as conn:
+        linhas = conn.execute("SELECT mes, taxa FROM selic ORDER BY mes").fetchall()
+    with open(caminho or caminho_csv_local(), 'w', encoding='utf-8', newline='') as arquivo:
+        for mes, taxa in linhas:
+            taxa = f"{taxa:.10f}".rstrip('0').replace('.', ',')
+            arquivo.write(f"{nomes[int(mes[5:])]}/{mes[:4]};{taxa}\n")
+    return len(linhas)
+
+
+def atualizar_selic(url=URL_SELIC, diretorio=None, timeout=TIMEOUT_SEGUNDOS):
+    """Atualização incremental a partir do CSV publicado.
+
+    Envia o ETag da última leitura: se o arquivo não mudou, o servidor responde
+    304 e nada é baixado. No modo offline lê o CSV local.
+    """
+    if modo_offline():
+        return importar_csv(diretorio=diretorio)
+
+    with closing(_conectar(diretorio)) as conn:
+        linha = conn.execute("SELECT valor FROM metadados WHERE chave = 'etag'").fetchone()
+    cabecalhos = {'If-None-Match': linha[0]} if linha and ultimo_mes(diretorio) else {}
+    resposta = requests.get(url, headers=cabecalhos, timeout=timeout)
+    if resposta.status_code == 304:
+        return 0
+    resposta.raise_for_status()
+
+    novos = gravar_taxas(interpretar_csv(resposta.text), "rede", diretorio)
+    if resposta.headers.get('ETag'):
+        with closing(_conectar(diretorio)) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO metadados (chave, valor) VALUES ('etag', ?)",
+                (resposta.headers['ETag'],),
+            )
+    return novos
+
+
+@lru_cache(maxsize=1)
+def serie_selic(diretorio=None):
+    """Taxas mensais (Data, Taxa) em ordem, lidas do banco uma vez por processo.
+
+    Com o banco vazio, faz a carga inicial pelo CSV local (o selic.csv
+    distribuído com o aplicativo, ou SELIC_CSV), se existir, ou pela rede
+    (fora do modo offline). Se ainda assim não houver taxas, levanta
+    ValueError em vez de devolver uma série vazia.
+    """
+    if ultimo_mes(diretorio) is None:
+        if os.path.exists(caminho_csv_local()):
+            importar_csv(diretorio=diretorio)
+        elif not modo_offline():
+            atualizar_selic(diretorio=diretorio)
+    with closing(_conectar(diretorio)) as conn:
+        df = pd.read_sql_query("SELECT mes, taxa FROM selic ORDER BY mes", conn)
+    if df.empty:
+        raise ValueError(
+            f"Nenhuma taxa SELIC disponível: o banco local ({diretorio or diretorio_dados()}) está vazio "
+            f"e não há CSV em {caminho_csv_local()}"
+            + (" (modo offline)" if modo_offline() else "")
+        )
+    return pd.DataFrame({
+        'Data': pd.to_datetime(df['mes'], format='%Y-%m'),
+        'Taxa': df['taxa'].astype(float),
+    })
+
+
+def conferir_cobertura(data_atualizacao, diretorio=None):
+    """Série local (como serie_selic()) se ela chegar à competência da data de
+    atualização; vazia ou mais curta, levanta ValueError em vez de deixar os
+    meses sem taxa entrarem com índice zero"""
+    serie = serie_selic(diretorio)
+    if serie.empty:
+        raise ValueError(
+            "Nenhuma taxa SELIC disponível: atualize a série (indices_selic.py atualizar) "
+            "ou informe um CSV local (SELIC_CSV)"
+        )
+    ultimo = serie['Data'].iloc[-1]
+    if (ultimo.year, ultimo.month) < (data_atualizacao.year, data_atualizacao.month):
+        raise ValueError(
+            f"A série SELIC local vai até {ultimo:%m/%Y}, antes da competência da atualização "
+            f"({data_atualizacao:%m/%Y}): atualize a série ou use uma data de atualização anterior"
+        )
+    return serie
+
+
+def _numero_mes(ano, mes):
+    """Meses desde o ano zero, para indexar arrays mês a mês"""
+    return ano * 12 + mes - 1
+
+
+def tabela_fatores(serie):
+    """Produtos acumulados de (1 + taxa) em um array contínuo mês a mês.
+
+    Retorna (número do primeiro mês, prefixo) com prefixo[0] = 1 e
+    prefixo[i] = produto das taxas dos i primeiros meses. Meses sem taxa
+    na série entram com fator 1, como no cálculo mês a mês.
+    """
+    primeiro, taxas = _taxas_mensais(serie)
+    return primeiro, np.concatenate(([1.0], np.cumprod(1.0 + taxas)))
+
+
+def _taxas_mensais(serie):
+    """(número do primeiro mês, taxas mês a mês), com 0 nos meses sem taxa"""
+    if serie.empty:
+        return 0, np.zeros(0)
+    meses = _numero_mes(serie['Data'].dt.year.to_numpy(), serie['Data'].dt.month.to_numpy())
+    primeiro = int(meses.min())
+    taxas = np.zeros(int(meses.max()) - primeiro + 1)
+    taxas[meses - primeiro] = serie['Taxa'].to_numpy()
+    return primeiro, taxas
+
+
+@lru_cache(maxsize=1)
+def fatores_selic(diretorio=None):
+    """tabela_fatores() da série local, calculada uma vez por processo"""
+    return tabela_fatores(serie_selic(diretorio))
+
+
+def _numero_competencia(competencia):
+    return _numero_mes(int(competencia[:4]), int(competencia[5:7]))
+
+
+def _fatores_prefixo(fatores, inicio, fim):
+    """Fatores de inicio a fim (números de mês, inclusive) por divisão de prefixos;
+    meses fora da série entram com fator 1"""
+    primeiro, prefixo = fatores
+    ultimo = len(prefixo) - 1
+    inicio = np.clip(np.asarray(inicio) - primeiro, 0, ultimo)
+    fim = np.clip(np.maximum(np.asarray(fim) - primeiro + 1, inicio), 0, ultimo)
+    return prefixo[fim] / prefixo[inicio]
+
+
+def _fatores_diretos(serie, pares):
+    """Fator de cada par (inicio, fim) pelo produto direto das taxas mensais, para conferência"""
+    primeiro, taxas = _taxas_mensais(serie)
+    fatores = []
+    for inicio, fim in pares:
+        a = min(max(_numero_competencia(inicio) - primeiro, 0), len(taxas))
+        b = min(max(_numero_competencia(fim) - primeiro + 1, 0), len(taxas))
+        fatores.append(float(np.prod(1.0 + taxas[a:b])) if b > a else 1.0)
+    return np.array(fatores)
+
+
+@lru_cache(maxsize=1)
+def versao_serie(diretorio=None):
+    """Versão da série local: hash dos meses e taxas guardados. Cada fator
+    acumulado publicado vale para a versão com que foi calculado"""
+    serie = serie_selic(diretorio)
+    conteudo = "\n".join(f"{data:%Y-%m};{taxa!r}" for data, taxa in zip(serie['Data'], serie['Taxa'].tolist()))
+    return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()[:16]
+
+
+def _gravar_fatores(versao, pares, fatores, diretorio=None):
+    with closing(_conectar(diretorio)) as conn, conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO fatores_acumulados (versao, inicio, fim, fator) VALUES (?, ?, ?, ?)",
+            [(versao, inicio, fim, fator) for (inicio, fim), fator in zip(pares, fatores)],
+        )
+
+
+@lru_cache(maxsize=4)
+def _fatores_publicados(versao, diretorio=None):
+    """Fatores acumulados {(inicio, fim): fator} já publicados para uma versão da
+    série; na primeira leitura de uma versão sem fatores no banco, apaga os das
+    versões anteriores (que não voltam a valer: a série só cresce ou é revista)
+    e importa os do CSV distribuído com o aplicativo, se forem da mesma versão"""
+    with closing(_conectar(diretorio)) as conn, conn:
+        vazio = conn.execute("SELECT 1 FROM fatores_acumulados WHERE versao = ? LIMIT 1", (versao,)).fetchone() is None
+        if vazio:
+            conn.execute("DELETE FROM fatores_acumulados WHERE versao != ?", (versao,))
+    if vazio and os.path.exists(caminho_fatores()):
+        importar_fatores(caminho_fatores(), diretorio, versao)
+    with closing(_conectar(diretorio)) as conn:
+        linhas = conn.execute("SELECT inicio, fim, fator FROM fatores_acumulados WHERE versao = ?", (versao,)).fetchall()
+    return {(inicio, fim): fator for inicio, fim, fator in linhas}
+
+
+def fatores_acumulados(pares, diretorio=None):
+    """Fator SELIC acumulado de cada par (mês inicial, mês final) 'AAAA-MM', inclusive.
+
+    Os pares já publicados para a versão atual da série são consultas ao
+    dicionário em memória. Os novos são calculados pelos prefixos, conferidos
+    com o produto direto das taxas mensais e gravados no banco: enquanto a
+    série não mudar, a mesma consulta devolve sempre o mesmo fator.
+    """
+    versao = versao_serie(diretorio)
+    tabela = _fatores_publicados(versao, diretorio)
+    novos = sorted({par for par in pares if par not in tabela})
+    if novos:
+        calculados = _fatores_prefixo(
+            fatores_selic(diretorio),
+            [_numero_competencia(inicio) for inicio, _ in novos],
+            [_numero_competencia(fim) for _, fim in novos],
+        )
+        diretos = _fatores_diretos(serie_selic(diretorio), novos)
+        if not np.allclose(calculados, diretos, rtol=TOLERANCIA_FATORES, atol=0):
+            raise ValueError("Fatores SELIC acumulados não conferem com a série mensal")
+        _gravar_fatores(versao, novos, calculados.tolist(), diretorio)
+        tabela.update(zip(novos, calculados.tolist()))
+    return np.array([tabela[par] for par in pares], dtype=float)
+
+
+def fatores_correcao(meses, data_atualizacao, fatores=None):
+    """Fator SELIC de cada competência ('AAAA-MM') até o mês da atualização,
+    inclusive, pela tabela de fatores publicados: fatores_acumulados() ou,
+    com fatores, um trecho dela já consultado {(inicio, fim): fator}, como o
+    que o lote envia aos processos filhos"""
+    if not len(meses):
+        return np.ones(0)
+    fim = f"{data_atualizacao.year:04d}-{data_atualizacao.month:02d}"
+    pares = [(mes, fim) for mes in meses]
+    if fatores is None:
+        return fatores_acumulados(pares)
+    return np.array([fatores[par] for par in pares], dtype=float)
+
+
+def regenerar_fatores(diretorio=None):
+    """Republica para a versão atual da série os pares (inicio, fim) que já
+    tinham sido pedidos em versões anteriores, conferidos com a série nova;
+    retorna quantos"""
+    versao = versao_serie(diretorio)
+    with closing(_conectar(diretorio)) as conn:
+        pares = conn.execute(
+            "SELECT DISTINCT inicio, fim FROM fatores_acumulados WHERE versao != ? ORDER BY inicio, fim", (versao,)
+        ).fetchall()
+    if pares:
+        fatores_acumulados([tuple(par) for par in pares], diretorio)
+    return len(pares)
+
+
+def importar_fatores(caminho=None, diretorio=None, versao=None):
+    """Grava no banco os fatores de um CSV publicado ("versao;inicio;fim;fator")
+    que sejam da versão atual da série e confiram com ela; retorna quantos entraram"""
+    versao = versao or versao_serie(diretorio)
+    publicados = pd.read_csv(caminho or caminho_fatores(), sep=';', dtype={'versao': str, 'inicio': str, 'fim': str})
+    publicados = publicados[publicados['versao'] == versao]
+    if publicados.empty:
+        return 0
+    pares = list(zip(publicados['inicio'], publicados['fim']))
+    fatores = publicados['fator'].to_numpy(dtype=float)
+    if not np.allclose(fatores, _fatores_diretos(serie_selic(diretorio), pares), rtol=TOLERANCIA_FATORES, atol=0):
+        raise ValueError(f"Fatores de {caminho or caminho_fatores()} não conferem com a série mensal")
+    _gravar_fatores(versao, pares, fatores.tolist(), diretorio)
+    _fatores_publicados.cache_clear()
+    return len(pares)
+
+
+def exportar_fatores(caminho=None, diretorio=None):
+    """Grava os fatores publicados da versão atual em CSV, para distribuir com o aplicativo"""
+    versao = versao_serie(diretorio)
+    with closing(_conectar(diretorio)) as conn:
+        linhas = conn.execute(
+            "SELECT versao, inicio, fim, fator FROM fatores_acumulados WHERE versao = ? ORDER BY inicio, fim", (versao,)
+        ).fetchall()
+    with open(caminho or caminho_fatores(), 'w', encoding='utf-8', newline='') as arquivo:
+        arquivo.write("versao;inicio;fim;fator\n")
+        arquivo.writelines(f"{v};{inicio};{fim};{fator!r}\n" for v, inicio, fim, fator in linhas)
+    return len(linhas)
+
+
+def validar_fatores(diretorio=None):
+    """Confere todos os fatores publicados da versão atual com o produto direto
+    das taxas mensais; retorna (quantidade, maior diferença relativa, fatores de
+    versões antigas da série)"""
+    versao = versao_serie(diretorio)
+    with closing(_conectar(diretorio)) as conn:
+        linhas = conn.execute("SELECT inicio, fim, fator FROM fatores_acumulados WHERE versao = ?", (versao,)).fetchall()
+        antigos = conn.execute("SELECT COUNT(*) FROM fatores_acumulados WHERE versao != ?", (versao,)).fetchone()[0]
+    if not linhas:
+        return 0, 0.0, antigos
+    fatores = np.array([fator for _, _, fator in linhas])
+    diretos = _fatores_diretos(serie_selic(diretorio), [(inicio, fim) for inicio, fim, _ in linhas])
+    return len(linhas), float(np.max(np.abs(fatores - diretos) / diretos)), antigos
+
+
+def indices_correcao(meses, data_atualizacao, fatores=None):
+    """Índice percentual de correção por competência, como o antigo cálculo mês a mês"""
+    meses = sorted(meses)
+    indices = (fatores_correcao(meses, data_atualizacao, fatores) - 1) * 100
+    return dict(zip(meses, indices.tolist()))
+
+
+def resumo_selic(diretorio=None):
+    """Quantidade de meses, intervalo coberto e origem da última carga"""
+    with closing(_conectar(diretorio)) as conn:
+        quantidade, primeiro, ultimo = conn.execute("SELECT COUNT(*), MIN(mes), MAX(mes) FROM selic").fetchone()
+        metadados = dict(conn.execute("SELECT chave, valor FROM metadados").fetchall())
+        fatores = conn.execute("SELECT COUNT(*) FROM fatores_acumulados").fetchone()[0]
+    return {
+        'meses': quantidade,
+        'primeiro': primeiro,
+        'ultimo': ultimo,
+        'origem': metadados.get('origem'),
+        'fatores': fatores,
+        'atualizado_em': float(metadados['atualizado_em']) if 'atualizado_em' in metadados else None,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Taxas SELIC locais das calculadoras de multa")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    sub.add_parser("atualizar", help="acrescenta os meses novos do CSV publicado")
+    importar = sub.add_parser("importar", help="alimenta o banco a partir de um CSV local")
+    importar.add_argument("arquivo", nargs="?", default=None)
+    sub.add_parser("resumo", help="meses disponíveis no banco local")
+    fatores = sub.add_parser("fatores", help="tabela de fatores acumulados publicados")
+    fatores.add_argument("acao", choices=("validar", "exportar", "importar"))
+    fatores.add_argument("arquivo", nargs="?", default=None, help="CSV (padrão: selic_fatores.csv ao lado do módulo)")
+    args = parser.parse_args()
+
+    if args.comando == "fatores":
+        if args.acao == "exportar":
+            print(f"{exportar_fatores(args.arquivo)} fator(es) gravado(s) (versão {versao_serie()})")
+        elif args.acao == "importar":
+            print(f"{importar_fatores(args.arquivo)} fator(es) importado(s) (versão {versao_serie()})")
+        quantidade, diferenca, antigos = validar_fatores()
+        print(f"Versão da série: {versao_serie()} | fatores publicados: {quantidade} | "
+              f"maior diferença relativa: {diferenca:.1e} | de versões antigas: {antigos}")
+        raise SystemExit(0 if diferenca <= TOLERANCIA_FATORES else 1)
+
+    if args.comando in ("atualizar", "importar"):
+        novos = atualizar_selic() if args.comando == "atualizar" else importar_csv(args.arquivo)
+        print(f"{novos} mês(es) novo(s)")
+        # a série e a tabela distribuídas com o aplicativo acompanham o banco
+        print(f"{exportar_csv()} mês(es) em {caminho_csv_local()}")
+        print(f"{exportar_fatores()} fator(es) em {caminho_fatores()} (versão {versao_serie()})")
+    resumo = resumo_selic()
+    print(f"{resumo['meses']} meses ({resumo['primeiro']} a {resumo['ultimo']}), origem: {resumo['origem']}")
@@ -0,0 +1,63 @@
+"""Logos dos relatórios de multa em PDF, lidas do repositório e preparadas uma vez por processo.
+
+Cada logo é procurada primeiro ao lado deste módulo (as PNGs já versionadas) e
+só na falta dela baixada do repositório publicado. A imagem é decodificada,
+achatada sobre fundo branco, reduzida para a largura em que vai ao PDF e
+regravada em JPEG, que o FPDF embute sem recomprimir (uma PNG com canal alfa
+é decodificada e comprimida de novo a cada documento). O resultado fica em
+memória e cada relatório recebe um BytesIO, sem arquivo temporário.
+"""
+import io
+import os
+from functools import lru_cache
+
+from PIL import Image
+
+DIRETORIO_LOGOS = os.path.dirname(os.path.abspath(__file__))
+URL_LOGOS = "https://raw.githubusercontent.com/carlospatrickds/NovoRepositorio/main/"
+TIMEOUT_SEGUNDOS = 15
+
+LOGO_TJPE = "PODER_JUD_PE_2.png"
+LOGO_JFPE = "logjfpe.png"
+LARGURA_LOGO_MM = 80
+DPI_LOGO = 200
+QUALIDADE_JPEG = 92
+
+
+def _ler_logo(nome):
+    """Bytes da imagem: arquivo local do repositório ou, sem ele, download"""
+    caminho = os.path.join(DIRETORIO_LOGOS, nome)
+    if os.path.exists(caminho):
+        with open(caminho, 'rb') as arquivo:
+            return arquivo.read()
+    import requests
+
+    resposta = requests.get(URL_LOGOS + nome, timeout=TIMEOUT_SEGUNDOS)
+    resposta.raise_for_status()
+    return resposta.content
+
+
+@lru_cache(maxsize=8)
+def preparar_logo(nome, largura_mm=LARGURA_LOGO_MM, dpi=DPI_LOGO):
+    """JPEG sobre fundo branco, com no máximo largura_mm na resolução dpi"""
+    imagem = Image.open(io.BytesIO(_ler_logo(nome)))
+    if imagem.mode in ('RGBA', 'LA', 'P'):
+        imagem = imagem.convert('RGBA')
+        fundo = Image.new('RGB', imagem.size, (255, 255, 255))
+        fundo.paste(imagem, mask=imagem.getchannel('A'))
+        imagem = fundo
+    else:
+        imagem = imagem.convert('RGB')
+
+    largura_px = round(largura_mm / 25.4 * dpi)
+    if imagem.width > largura_px:
+        imagem = imagem.resize((largura_px, round(imagem.height * largura_px / imagem.width)), Image.LANCZOS)
+
+    saida = io.BytesIO()
+    imagem.save(saida, format='JPEG', quality=QUALIDADE_JPEG, optimize=True)
+    return saida.getvalue()
+
+
+def logo_pdf(nome, largura_mm=LARGURA_LOGO_MM):
+    """Imagem pronta para FPDF.image(), em memória"""
+    return io.BytesIO(preparar_logo(nome, largura_mm))
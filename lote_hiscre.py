@@ -0,0 +1,189 @@
+"""Processamento em lote de HISCRE: vários PDFs (ou ZIP) em uma planilha consolidada."""
+import io
+import multiprocessing
+import os
+import re
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+
+from extrator_hiscre import extrair_documento, hash_conteudo, periodos_competencia
+
+
+def arquivos_do_lote(uploads):
+    """Lista (nome do arquivo, bytes) dos PDFs enviados, abrindo os ZIPs; um ZIP
+    ilegível entra como (nome, exceção), que processar_arquivos() devolve como
+    erro daquele arquivo sem interromper o lote"""
+    arquivos = []
+    for nome_arquivo, conteudo in uploads:
+        if nome_arquivo.lower().endswith('.zip'):
+            try:
+                with zipfile.ZipFile(io.BytesIO(conteudo)) as zip_lote:
+                    arquivos.extend(
+                        (info.filename, zip_lote.read(info))
+                        for info in zip_lote.infolist()
+                        if not info.is_dir() and info.filename.lower().endswith('.pdf')
+                    )
+            except zipfile.BadZipFile as e:
+                arquivos.append((nome_arquivo, e))
+        else:
+            arquivos.append((nome_arquivo, conteudo))
+    return arquivos
+
+
+def _resultado_erro(nome_arquivo, erro):
+    return {'arquivo': nome_arquivo, 'documento': None, 'erro': f"{type(erro).__name__}: {erro}", 'tempo': 0.0, 'cache': False}
+
+
+def _processar_arquivo(args):
+    """Executado no processo filho: extrai um PDF e mede o tempo"""
+    nome_arquivo, conteudo, backend = args
+    inicio = time.perf_counter()
+    try:
+        documento = extrair_documento(conteudo, backend=backend)
+        erro = None
+    except Exception as e:
+        documento = None
+        erro = f"{type(e).__name__}: {e}"
+    return {
+        'arquivo': nome_arquivo,
+        'documento': documento,
+        'erro': erro,
+        'tempo': time.perf_counter() - inicio,
+        'cache': False,
+    }
+
+
+def processar_arquivos(arquivos, processos=None, backend=None, ler_cache=None, gravar_cache=None, ao_concluir=None):
+    """Extrai os PDFs em paralelo e devolve um resultado por arquivo, na ordem de entrada.
+
+    'ler_cache'/'gravar_cache' (opcionais) consultam e alimentam o cache local;
+    'ao_concluir' é chamado a cada arquivo terminado (para barra de progresso).
+    """
+    resultados = [None] * len(arquivos)
+    pendentes = []
+    for indice, (nome_arquivo, conteudo) in enumerate(arquivos):
+        if isinstance(conteudo, Exception):
+            resultados[indice] = _resultado_erro(nome_arquivo, conteudo)
+            if ao_concluir:
+                ao_concluir(resultados[indice])
+            continue
+        documento = ler_cache(hash_conteudo(conteudo), backend) if ler_cache else None
+        if documento is not None:
+            resultados[indice] = {'arquivo': nome_arquivo, 'documento': documento, 'erro': None, 'tempo': 0.0, 'cache': True}
+            if ao_concluir:
+                ao_concluir(resultados[indice])
+        else:
+            pendentes.append(indice)
+
+    if pendentes:
+        processos = min(processos or os.cpu_count() or 1, len(pendentes))
+        contexto = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=processos, mp_context=contexto) as pool:
+            futuros = {
+                pool.submit(_processar_arquivo, (*arquivos[indice], backend)): indice
+                for indice in pendentes
+            }
+            for futuro in as_completed(futuros):
+                try:
+                    resultado = futuro.result()
+                except BrokenProcessPool as e:
+                    # um processo filho morreu: os já concluídos ficam, os demais saem como erro
+                    resultado = _resultado_erro(arquivos[futuros[futuro]][0], e)
+                resultados[futuros[futuro]] = resultado
+                if gravar_cache and resultado['documento'] is not None:
+                    gravar_cache(resultado['documento'])
+                if ao_concluir:
+                    ao_concluir(resultado)
+    return resultados
+
+
+def tabela_situacao(resultados):
+    """Uma linha por arquivo: beneficiário, registros, tempo e erro"""
+    linhas = []
+    for resultado in resultados:
+        documento = resultado['documento'] or {}
+        linhas.append({
+            'Arquivo': resultado['arquivo'],
+            'Nome': documento.get('nome', ""),
+            'NB': ", ".join(documento.get('nbs', [])),
+            'Registros': len(documento['registros']) if documento else 0,
+            'Tempo (s)': round(resultado['tempo'], 2),
+            'Origem': "cache" if resultado['cache'] else "PDF",
+            'Erro': resultado['erro'] or "",
+        })
+    return pd.DataFrame(linhas)
+
+
+def registros_consolidados(resultados):
+    """Todos os registros do lote em uma tabela, com o arquivo de origem"""
+    tabelas = [
+        resultado['documento']['registros'].assign(arquivo=resultado['arquivo'])
+        for resultado in resultados
+        if resultado['documento'] is not None
+    ]
+    if not tabelas:
+        return pd.DataFrame()
+    return pd.concat(tabelas, ignore_index=True)
+
+
+def totais_por_competencia(registros):
+    """Resumo do lote: soma de cada rubrica por competência, em ordem cronológica"""
+    if registros.empty:
+        return pd.DataFrame()
+    totais = registros.assign(periodo=periodos_competencia(registros['competencia'])).pivot_table(
+        index='periodo', columns='rubrica', values='valor', aggfunc='sum', fill_value=0.0
+    )
+    totais.columns.name = None
+    totais['Total'] = totais.sum(axis=1)
+    totais.index = totais.index.strftime('%m/%Y')
+    totais.index.name = 'Comp.'
+    return totais.reset_index()
+
+
+def _nome_aba(nome, usados):
+    """Nome de aba válido no Excel (até 31 caracteres, sem []:*?/\\) e único"""
+    base = re.sub(r'[\[\]:*?/\\]', ' ', nome).strip()[:31] or "Sem nome"
+    nome_aba = base
+    sufixo = 2
+    while nome_aba.casefold() in usados:
+        nome_aba = f"{base[:31 - len(str(sufixo)) - 1]} {sufixo}"
+        sufixo += 1
+    usados.add(nome_aba.casefold())
+    return nome_aba
+
+
+def gerar_planilha(resultados):
+    """XLSX com a situação de cada arquivo, o resumo por competência e uma aba por beneficiário"""
+    registros = registros_consolidados(resultados)
+    saida = io.BytesIO()
+    usados = {'arquivos', 'totais por competência'}
+    with pd.ExcelWriter(saida, engine='openpyxl') as planilha:
+        tabela_situacao(resultados).to_excel(planilha, sheet_name='Arquivos', index=False)
+        totais_por_competencia(registros).to_excel(planilha, sheet_name='Totais por competência', index=False)
+
+        if not registros.empty:
+            registros = registros.assign(periodo=periodos_competencia(registros['competencia']))
+            beneficiario = registros['nome'].fillna(registros['arquivo'])
+            for nome, grupo in registros.groupby(beneficiario, sort=True):
+                grupo = grupo.sort_values('periodo', kind='stable')
+                pd.DataFrame({
+                    'Arquivo': grupo['arquivo'],
+                    'p.p HISCRE': grupo['pagina'],
+                    'Comp.': grupo['competencia'],
+                    'Rubrica': grupo['rubrica'],
+                    'Descrição': grupo['descricao'],
+                    'Valor (R$)': grupo['valor'],
+                    'Status': grupo['status'],
+                    'NB': grupo['nb'],
+                }).to_excel(planilha, sheet_name=_nome_aba(nome, usados), index=False)
+
+        for aba in planilha.book.worksheets:
+            for celula in aba[1]:
+                if celula.value == 'Valor (R$)' or (aba.title == 'Totais por competência' and celula.column > 1):
+                    for (valor,) in aba.iter_rows(min_row=2, min_col=celula.column, max_col=celula.column):
+                        valor.number_format = '"R$" #,##0.00'
+    return saida.getvalue()
@@ -0,0 +1,419 @@
+"""Cálculo em lote de multas diárias: uma planilha de casos em uma planilha consolidada e os relatórios em PDF.
+
+Cada linha da planilha (CSV ou XLSX) é um caso, com as colunas
+
+    processo; despacho; prazo; faixas; atualizacao
+
+e, opcionalmente, tipo_prazo ("úteis" ou "corridos"; padrão úteis), autor, reu
+e observacao. As datas são dd/mm/aaaa. A coluna faixas lista as faixas
+separadas por "|", cada uma no formato
+
+    inicio-fim:valor[:uteis|corridos[:dias abatidos]]
+
+por exemplo "10/01/2024-31/03/2024:100,00:uteis:2 | -30/06/2024:150". Sem
+início, a faixa começa no dia seguinte ao fim da anterior (a primeira, no
+início da multa).
+
+Os fatores SELIC de todas as competências do lote são consultados uma vez na
+tabela de fatores publicados (indices_selic.fatores_acumulados) e enviados a
+todos os casos, que são avaliados em paralelo (ProcessPoolExecutor) a partir
+de CASOS_MIN_PARALELO.
+Os relatórios saem em um ZIP (um PDF por caso) ou em um PDF único, com um
+caso a partir de cada página (relatorio_multa).
+"""
+import io
+import multiprocessing
+import os
+import re
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+from unidecode import unidecode
+
+from calculo_multa import (
+    CasoMulta,
+    calcular_multa,
+    gerar_pdf_multa,
+    interpretar_data,
+    interpretar_faixas,
+    interpretar_numero,
+    resumo_meses,
+)
+from calendario_forense import calcular_inicio_multa
+from indices_selic import conferir_cobertura, fatores_acumulados
+
+COLUNAS_OBRIGATORIAS = ('processo', 'despacho', 'prazo', 'faixas', 'atualizacao')
+COLUNAS_OPCIONAIS = ('tipo_prazo', 'autor', 'reu', 'observacao')
+CASOS_MIN_PARALELO = 100
+
+# Fatores SELIC de cada processo filho, recebidos uma vez na criação (_iniciar_processo)
+_fatores_processo = None
+
+
+def _nome_coluna(nome):
+    """Cabeçalho normalizado: 'Data de Atualização' -> 'data_de_atualizacao'"""
+    return re.sub(r'\W+', '_', unidecode(str(nome)).strip().lower()).strip('_')
+
+
+APELIDOS_COLUNAS = {
+    'n_processo': 'processo', 'no_processo': 'processo', 'numero_processo': 'processo', 'numero_do_processo': 'processo',
+    'data_despacho': 'despacho', 'data_do_despacho': 'despacho', 'intimacao': 'despacho',
+    'prazo_dias': 'prazo', 'prazo_para_cumprimento': 'prazo',
+    'data_atualizacao': 'atualizacao', 'data_de_atualizacao': 'atualizacao',
+    'tipo_de_prazo': 'tipo_prazo', 'observacoes': 'observacao',
+}
+
+
+def ler_casos(nome_arquivo, conteudo):
+    """Planilha de casos (CSV com ; ou , ou XLSX) com os cabeçalhos normalizados"""
+    if nome_arquivo.lower().endswith(('.xlsx', '.xls')):
+        casos = pd.read_excel(io.BytesIO(conteudo), dtype=object)
+    else:
+        texto = conteudo.decode('utf-8-sig') if isinstance(conteudo, bytes) else conteudo
+        casos = pd.read_csv(io.StringIO(texto), sep=None, engine='python', dtype=str, keep_default_na=False)
+    casos.columns = [APELIDOS_COLUNAS.get(nome, nome) for nome in map(_nome_coluna, casos.columns)]
+    faltando = [coluna for coluna in COLUNAS_OBRIGATORIAS if coluna not in casos.columns]
+    if faltando:
+        raise ValueError(f"Colunas obrigatórias ausentes: {', '.join(faltando)}")
+    for coluna in COLUNAS_OPCIONAIS:
+        if coluna not in casos.columns:
+            casos[coluna] = ""
+    casos = casos.fillna("")
+    casos = casos[casos['processo'].astype(str).str.strip() != ""]
+    return casos[list(COLUNAS_OBRIGATORIAS + COLUNAS_OPCIONAIS)].to_dict('records')
+
+
+def _iniciar_processo(fatores):
+    """Inicializador dos processos filhos: guarda os fatores SELIC do lote"""
+    global _fatores_processo
+    _fatores_processo = fatores
+
+
+def _resultado_erro(caso, erro):
+    return {
+        'processo': str(caso['processo']).strip(), 'autor': str(caso['autor']), 'reu': str(caso['reu']),
+        'observacao': str(caso['observacao']), 'faixas': [], 'resultado': None, 'pdf': None,
+        'erro': f"{type(erro).__name__}: {erro}", 'tempo': 0.0,
+    }
+
+
+def _interpretar_caso(caso):
+    """CasoMulta de uma linha da planilha (ValueError se alguma coluna for inválida)"""
+    tipo_prazo = "Dias corridos" if "corrid" in unidecode(str(caso['tipo_prazo'])).lower() else "Dias úteis"
+    data_despacho = interpretar_data(caso['despacho'])
+    prazo = int(interpretar_numero(caso['prazo']))
+    _, data_inicio_multa = calcular_inicio_multa(data_despacho, prazo, tipo_prazo == "Dias úteis")
+    faixas = interpretar_faixas(caso['faixas'], data_inicio_multa)
+    return CasoMulta(faixas, data_despacho, prazo, interpretar_data(caso['atualizacao']), tipo_prazo)
+
+
+def fatores_lote(casos):
+    """Fatores publicados {(inicio, fim): fator} de todas as competências que as
+    faixas dos casos atravessam até a atualização de cada um, consultados de uma
+    vez em fatores_acumulados(); casos inválidos ficam de fora (saem com erro)"""
+    pares = set()
+    for caso in casos:
+        try:
+            caso = _interpretar_caso(caso)
+        except (ValueError, TypeError):
+            continue
+        fim = f"{caso.data_atualizacao.year:04d}-{caso.data_atualizacao.month:02d}"
+        for faixa in caso.faixas:
+            meses = pd.period_range(faixa.inicio, faixa.fim, freq='M').strftime('%Y-%m')
+            pares.update((mes, fim) for mes in meses)
+    pares = sorted(pares)
+    return dict(zip(pares, fatores_acumulados(pares).tolist())) if pares else {}
+
+
+def _calcular_caso(args):
+    """Executado no processo filho (ou no próprio processo, em lotes pequenos):
+    calcula um caso e gera o PDF com os fatores SELIC recebidos (sem eles, os
+    que o processo filho recebeu ao ser criado)"""
+    caso, gerar_pdf, fatores = args
+    fatores = _fatores_processo if fatores is None else fatores
+    inicio = time.perf_counter()
+    processo = str(caso['processo']).strip()
+    try:
+        dados = _interpretar_caso(caso)
+        faixas = dados.faixas
+        resultado = calcular_multa(dados, fatores).como_dict()
+        pdf = gerar_pdf_multa(
+            resultado, faixas, processo, str(caso['autor']), str(caso['reu']), str(caso['observacao'])
+        ) if gerar_pdf else None
+        erro = None
+    except Exception as e:
+        faixas, resultado, pdf = [], None, None
+        erro = f"{type(e).__name__}: {e}"
+    return {
+        'processo': processo,
+        'autor': str(caso['autor']),
+        'reu': str(caso['reu']),
+        'observacao': str(caso['observacao']),
+        'faixas': faixas,
+        'resultado': resultado,
+        'pdf': pdf,
+        'erro': erro,
+        'tempo': time.perf_counter() - inicio,
+    }
+
+
+def conferir_selic_lote(casos):
+    """Levanta ValueError se a série SELIC local não servir ao lote inteiro:
+    vazia ou terminando antes da atualização mais recente entre os casos"""
+    datas = []
+    for caso in casos:
+        try:
+            datas.append(interpretar_data(caso['atualizacao']))
+        except ValueError:
+            pass  # o próprio caso sai com o erro da data
+    conferir_cobertura(max(datas, default=date.min))
+
+
+def processar_casos(casos, processos=None, gerar_pdf=True, fatores=None, ao_concluir=None):
+    """Calcula todos os casos e devolve um resultado por caso, na ordem de entrada.
+
+    Antes de começar, confere uma vez se a série SELIC cobre o lote
+    (conferir_selic_lote): sem isso, nenhum caso é calculado. Os fatores SELIC
+    (fatores_lote) são consultados uma vez aqui e enviados uma vez a cada
+    processo filho, pelo inicializador do pool; 'ao_concluir' é chamado a cada
+    caso terminado (para barra de progresso).
+    """
+    conferir_selic_lote(casos)
+    fatores = fatores if fatores is not None else fatores_lote(casos)
+    processos = min(processos or os.cpu_count() or 1, len(casos))
+    if processos <= 1 or len(casos) < CASOS_MIN_PARALELO:
+        resultados = []
+        for caso in casos:
+            resultados.append(_calcular_caso((caso, gerar_pdf, fatores)))
+            if ao_concluir:
+                ao_concluir(resultados[-1])
+        return resultados
+
+    resultados = [None] * len(casos)
+    contexto = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(
+        max_workers=processos, mp_context=contexto, initializer=_iniciar_processo, initargs=(fatores,)
+    ) as pool:
+        futuros = {pool.submit(_calcular_caso, (caso, gerar_pdf, None)): indice for indice, caso in enumerate(casos)}
+        for futuro in as_completed(futuros):
+            try:
+                resultado = futuro.result()
+            except BrokenProcessPool as e:
+                # um processo filho morreu: os já calculados ficam, os demais saem como erro
+                resultado = _resultado_erro(casos[futuros[futuro]], e)
+            resultados[futuros[futuro]] = resultado
+            if ao_concluir:
+                ao_concluir(resultado)
+    return resultados
+
+
+def tabela_casos(resultados):
+    """Uma linha por caso: prazo, início da multa, dias, totais e erro"""
+    linhas = []
+    for item in resultados:
+        res = item['resultado'] or {}
+        linhas.append({
+            'Processo': item['processo'],
+            'Autor': item['autor'],
+            'Réu': item['reu'],
+            'Faixas': len(item['faixas']),
+            'Fim do prazo': res.get('data_fim_prazo'),
+            'Início da multa': res.get('data_inicio_multa'),
+            'Atualização': res.get('data_atualizacao'),
+            'Dias': res.get('total_dias'),
+            'Multa sem correção (R$)': res.get('total_sem_correcao'),
+            'Multa corrigida (R$)': res.get('total_corrigido'),
+            'Tempo (s)': round(item['tempo'], 3),
+            'Erro': item['erro'] or "",
+        })
+    return pd.DataFrame(linhas)
+
+
+def tabela_meses(resultados):
+    """Correção mês a mês de todos os casos, uma linha por processo e competência"""
+    partes = []
+    for item in resultados:
+        res = item['resultado']
+        if res is None:
+            continue
+        resumo = resumo_meses(res['correcao'])
+        partes.append(pd.DataFrame({
+            'Processo': item['processo'],
+            'Mês/Ano': resumo['mes'].str[5:] + "/" + resumo['mes'].str[:4],
+            'Base (R$)': resumo['base_centavos'] / 100,
+            'Índice (%)': resumo['indice'] * 100,
+            'Corrigido (R$)': resumo['corrigido_centavos'] / 100,
+            'Acumulado (R$)': resumo['acumulado_centavos'] / 100,
+        }))
+    colunas = ['Processo', 'Mês/Ano', 'Base (R$)', 'Índice (%)', 'Corrigido (R$)', 'Acumulado (R$)']
+    return pd.concat(partes, ignore_index=True)[colunas] if partes else pd.DataFrame(columns=colunas)
+
+
+def tabela_faixas_meses(resultados):
+    """Tabela de correção (tabela_correcao()) de todos os casos, uma linha por
+    processo, faixa e competência, para auditoria"""
+    partes = []
+    for item in resultados:
+        res = item['resultado']
+        if res is None:
+            continue
+        correcao = res['correcao']
+        partes.append(pd.DataFrame({
+            'Processo': item['processo'],
+            'Faixa': correcao['faixa'] + 1,
+            'Mês/Ano': correcao['mes'].str[5:] + "/" + correcao['mes'].str[:4],
+            'Dias': correcao['dias'],
+            'Base (R$)': correcao['base_centavos'] / 100,
+            'Índice (%)': correcao['indice'] * 100,
+            'Corrigido (R$)': correcao['corrigido_centavos'] / 100,
+            'Acumulado (R$)': correcao['acumulado_centavos'] / 100,
+        }))
+    colunas = ['Processo', 'Faixa', 'Mês/Ano', 'Dias', 'Base (R$)', 'Índice (%)', 'Corrigido (R$)', 'Acumulado (R$)']
+    return pd.concat(partes, ignore_index=True)[colunas] if partes else pd.DataFrame(columns=colunas)
+
+
+def gerar_planilha_lote(resultados):
+    """XLSX com o resumo por caso, a correção mês a mês e por faixa e mês de todos os casos"""
+    saida = io.BytesIO()
+    with pd.ExcelWriter(saida, engine='openpyxl') as planilha:
+        tabela_casos(resultados).to_excel(planilha, sheet_name='Casos', index=False)
+        tabela_meses(resultados).to_excel(planilha, sheet_name='Meses', index=False)
+        tabela_faixas_meses(resultados).to_excel(planilha, sheet_name='Faixas x meses', index=False)
+        for aba in planilha.book.worksheets:
+            for celula in aba[1]:
+                if '(R$)' in str(celula.value) or str(celula.value) in ('Fim do prazo', 'Início da multa', 'Atualização'):
+                    formato = '"R$" #,##0.00' if '(R$)' in celula.value else 'DD/MM/YYYY'
+                    for (valor,) in aba.iter_rows(min_row=2, min_col=celula.column, max_col=celula.column):
+                        valor.number_format = formato
+    return saida.getvalue()
+
+
+def _nome_pdf(processo, usados):
+    """Nome de arquivo seguro e único para o PDF de um processo"""
+    base = re.sub(r'[^\w.\-]+', '_', processo).strip('_') or "processo"
+    nome = f"relatorio_{base}.pdf"
+    sufixo = 2
+    while nome in usados:
+        nome = f"relatorio_{base}_{sufixo}.pdf"
+        sufixo += 1
+    usados.add(nome)
+    return nome
+
+
+def gerar_zip_pdfs(resultados):
+    """ZIP com o relatório em PDF de cada caso calculado"""
+    saida = io.BytesIO()
+    usados = set()
+    with zipfile.ZipFile(saida, 'w', zipfile.ZIP_DEFLATED) as zip_lote:
+        for item in resultados:
+            if item['pdf']:
+                zip_lote.writestr(_nome_pdf(item['processo'], usados), item['pdf'])
+    return saida.getvalue()
+
+
+def gerar_pdf_lote(resultados):
+    """PDF único com o relatório de cada caso calculado, um a partir de cada página"""
+    from relatorio_multa import gerar_relatorios
+
+    return gerar_relatorios(
+        {
+            'res': item['resultado'], 'faixas': item['faixas'], 'numero_processo': item['processo'],
+            'nome_autor': item['autor'], 'nome_reu': item['reu'], 'observacao': item['observacao'],
+        }
+        for item in resultados if item['erro'] is None
+    )
+
+
+def _casos_exemplo(quantidade):
+    """Casos sintéticos para o benchmark: 3 a 8 faixas de 1 a 4 meses cada"""
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    casos = []
+    for i in range(quantidade):
+        despacho = date(2018, 1, 1) + timedelta(days=int(rng.integers(0, 1800)))
+        fim = despacho + timedelta(days=15)
+        faixas = []
+        for _ in range(int(rng.integers(3, 9))):
+            fim += timedelta(days=int(rng.integers(30, 120)))
+            tipo = "uteis" if rng.integers(0, 2) else "corridos"
+            faixas.append(f"-{fim.strftime('%d/%m/%Y')}:{int(rng.integers(50, 1000))},00:{tipo}:{int(rng.integers(0, 3))}")
+        casos.append({
+            'processo': f"0800{i:03d}-00.2020.4.05.8300", 'despacho': despacho.strftime('%d/%m/%Y'),
+            'prazo': "15", 'faixas': " | ".join(faixas), 'atualizacao': "01/06/2025",
+            'tipo_prazo': "úteis", 'autor': f"Autor {i}", 'reu': "INSS", 'observacao': "",
+        })
+    return casos
+
+
+def _mesmo_resultado(a, b):
+    """Compara dois resultados, a tabela de correção pelo conteúdo"""
+    if a is None or b is None:
+        return a is b
+    sem_tabela = lambda res: {chave: valor for chave, valor in res.items() if chave != 'correcao'}
+    return sem_tabela(a) == sem_tabela(b) and a['correcao'].equals(b['correcao'])
+
+
+def benchmark_lote(quantidade=200, processos=None):
+    """Lote sintético em série x em paralelo, com os fatores SELIC compartilhados"""
+    casos = _casos_exemplo(quantidade)
+    fatores = fatores_lote(casos)
+
+    inicio = time.perf_counter()
+    serie = processar_casos(casos, processos=1, fatores=fatores)
+    tempo_serie = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    paralelo = processar_casos(casos, processos=processos, fatores=fatores)
+    tempo_paralelo = time.perf_counter() - inicio
+
+    identico = len(serie) == len(paralelo) and all(
+        _mesmo_resultado(a['resultado'], b['resultado']) for a, b in zip(serie, paralelo)
+    )
+    erros = sum(item['erro'] is not None for item in paralelo)
+    print(f"Casos: {quantidade} | erros: {erros} | processos: {processos or os.cpu_count()}")
+    print(f"Em série:    {tempo_serie:.2f}s")
+    print(f"Em paralelo: {tempo_paralelo:.2f}s ({tempo_serie / tempo_paralelo:.1f}x)")
+    print(f"Resultado idêntico: {'sim' if identico else 'NÃO'}")
+    return identico and not erros
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Cálculo de multas em lote")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    calcular = sub.add_parser("calcular", help="planilha de casos -> planilha consolidada, ZIP de PDFs e PDF único")
+    calcular.add_argument("planilha")
+    calcular.add_argument("--saida", default=".")
+    calcular.add_argument("--processos", type=int, default=None)
+    bench = sub.add_parser("benchmark", help="lote sintético em série x em paralelo")
+    bench.add_argument("--casos", type=int, default=200)
+    bench.add_argument("--processos", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.comando == "benchmark":
+        raise SystemExit(0 if benchmark_lote(args.casos, args.processos) else 1)
+
+    try:
+        with open(args.planilha, 'rb') as arquivo:
+            casos = ler_casos(args.planilha, arquivo.read())
+        resultados = processar_casos(casos, args.processos)
+    except ValueError as e:
+        raise SystemExit(f"Erro: {e}")
+    carimbo = datetime.now().strftime('%Y%m%d_%H%M')
+    os.makedirs(args.saida, exist_ok=True)
+    with open(os.path.join(args.saida, f"multas_lote_{carimbo}.xlsx"), 'wb') as arquivo:
+        arquivo.write(gerar_planilha_lote(resultados))
+    with open(os.path.join(args.saida, f"relatorios_multa_{carimbo}.zip"), 'wb') as arquivo:
+        arquivo.write(gerar_zip_pdfs(resultados))
+    with open(os.path.join(args.saida, f"relatorios_multa_{carimbo}.pdf"), 'wb') as arquivo:
+        arquivo.write(gerar_pdf_lote(resultados))
+    for item in resultados:
+        if item['erro']:
+            print(f"{item['processo']}: {item['erro']}")
+    print(f"{len(resultados)} caso(s), {sum(item['erro'] is None for item in resultados)} calculado(s)")
@@ -0,0 +1,367 @@
+"""Relatórios em PDF da multa diária: um caso por documento, vários casos em um PDF ou em um ZIP.
+
+As tabelas de faixas e da correção mês a mês têm quebra de página automática
+e o cabeçalho repetido em cada página. Quando todos os textos cabem nas
+colunas, as linhas têm altura fixa e o texto vai direto na página, a partir
+das larguras das fontes padrão do PDF (em cache); senão, a tabela sai pela
+API de tabelas do FPDF2 (pdf.table()), com quebra de texto nas células. Os
+textos vão na Helvetica, sem arquivo de fonte para ler nem subconjunto para
+gerar. A DejaVu só é registrada quando
+a observação pede por ela, uma vez por documento (um PDF com centenas de casos
+a lê uma vez só), e numa versão reduzida aos alfabetos latinos, preparada uma
+vez por processo. A existência da fonte também é verificada uma vez por
+processo; sem ela, o texto sai na Helvetica, com os caracteres fora do
+Latin-1 transliterados.
+"""
+import io
+import os
+import zipfile
+from functools import lru_cache
+
+from fpdf import FPDF, XPos, YPos
+from fpdf.fonts import CORE_FONTS_CHARWIDTHS, FontFace
+from unidecode import unidecode
+
+from calculo_multa import (
+    FONTE_DEJAVU,
+    NOTA_CENTAVOS,
+    NOTA_SELIC,
+    linhas_meses,
+    moeda_br,
+    resumo_faixas,
+    tabela_correcao,
+)
+
+FONTE_PADRAO = "helvetica"
+TITULO = "Relatório de Multa Diária Corrigida"
+ASSINATURA = "Documento é assinado e datado eletronicamente."
+LARGURA_LOGO_MM = 80
+TOPO_LOGO_MM = 8
+ESPACO_LOGO_MM = 7
+TAMANHO_TABELA = 9
+ALTURA_LINHA_TABELA = 5
+PADDING_TABELA = 1
+COR_CABECALHO = (230, 230, 230)
+COR_LINHAS = (190, 190, 190)
+FAIXAS_OBSERVACAO = ((0x20, 0x24F), (0x2000, 0x206F), (0x20A0, 0x20BF), (0x2100, 0x21FF))
+COLUNAS_FAIXAS = (("Faixa", 12), ("Período", 48), ("Dias", 34), ("Valor diário", 45), ("Total", 51))
+COLUNAS_MESES = (("Mês/Ano", 30), ("Base", 42), ("Índice", 30), ("Corrigido", 44), ("Acumulado", 44))
+
+
+@lru_cache(maxsize=None)
+def fonte_unicode():
+    """Caminho da DejaVu, se existir no sistema (verificado uma vez por processo)"""
+    return FONTE_DEJAVU if os.path.exists(FONTE_DEJAVU) else None
+
+
+@lru_cache(maxsize=None)
+def fonte_observacao():
+    """DejaVu reduzida aos alfabetos latinos, pontuação, moedas e símbolos, gravada
+    uma vez por processo num arquivo temporário: (caminho, caracteres cobertos).
+    Com ~80 KB em vez de ~750 KB, é lida em cada PDF em um terço do tempo."""
+    import atexit
+    import shutil
+    import tempfile
+
+    from fontTools import subset, ttLib
+
+    opcoes = subset.Options()
+    opcoes.hinting = False
+    opcoes.layout_features = []
+    opcoes.name_IDs = ["*"]
+    opcoes.drop_tables += ["FFTM"]
+    subsetter = subset.Subsetter(opcoes)
+    subsetter.populate(unicodes=[c for inicio, fim in FAIXAS_OBSERVACAO for c in range(inicio, fim + 1)])
+    fonte = ttLib.TTFont(fonte_unicode())
+    subsetter.subset(fonte)
+
+    diretorio = tempfile.mkdtemp(prefix="relatorio_multa_")
+    atexit.register(shutil.rmtree, diretorio, ignore_errors=True)
+    caminho = os.path.join(diretorio, "DejaVuSans-latin.ttf")
+    fonte.save(caminho)
+    return caminho, frozenset(map(chr, fonte.getBestCmap())) | frozenset("\n\r\t")
+
+
+def _latin1(texto):
+    """Texto para as fontes padrão do PDF: só os caracteres fora do Latin-1 são transliterados"""
+    texto = str(texto)
+    if texto.isascii():
+        return texto
+    return "".join(c if ord(c) < 256 else unidecode(c) for c in texto)
+
+
+def novo_documento():
+    """FPDF com as margens e a quebra de página automática dos relatórios"""
+    pdf = FPDF()
+    pdf.set_margins(left=10, top=10, right=10)
+    pdf.set_auto_page_break(True, margin=15)
+    return pdf
+
+
+def _usar_fonte_observacao(pdf, texto, fonte_obs, tam_obs):
+    """DejaVu (registrada uma vez por documento) ou a fonte padrão; retorna se é a DejaVu.
+    A DejaVu completa só entra quando o texto tem caracteres fora da reduzida."""
+    if fonte_obs == "DejaVu" and fonte_unicode():
+        caminho, cobertos = fonte_observacao()
+        familia = "DejaVu" if cobertos.issuperset(texto) else "DejaVuCompleta"
+        if familia.lower() not in pdf.fonts:
+            pdf.add_font(familia, "", caminho if familia == "DejaVu" else fonte_unicode())
+        pdf.set_font(familia, "", tam_obs)
+        return True
+    pdf.set_font(FONTE_PADRAO, "I", tam_obs)
+    return False
+
+
+def _linha(pdf, texto, altura=6, **kwargs):
+    pdf.cell(0, altura, _latin1(texto), new_x=XPos.LMARGIN, new_y=YPos.NEXT, **kwargs)
+
+
+def _secao(pdf, titulo):
+    pdf.set_font(FONTE_PADRAO, "B", 10)
+    _linha(pdf, titulo)
+    pdf.set_font(FONTE_PADRAO, "", 10)
+
+
+def _rotulos(pdf, pares):
+    for rotulo, valor in pares:
+        pdf.cell(90, 6, _latin1(rotulo))
+        _linha(pdf, valor)
+
+
+@lru_cache(maxsize=4096)
+def largura_texto(fonte, texto):
+    """Largura do texto numa fonte padrão do PDF, em milésimos do corpo (métricas em cache)"""
+    larguras = CORE_FONTS_CHARWIDTHS[fonte]
+    return sum(larguras[c] for c in texto)
+
+
+def _linha_tabela(pdf, colunas, valores, alinhamentos):
+    """Uma linha da tabela na posição atual, com o texto posto direto na página"""
+    escala = pdf.font_size / 1000
+    x, y = pdf.l_margin, pdf.y
+    base = y + (ALTURA_LINHA_TABELA + pdf.font_size * 0.7) / 2
+    for (_, largura), valor, alinhamento in zip(colunas, valores, alinhamentos):
+        if alinhamento == "R":
+            deslocamento = largura - PADDING_TABELA - largura_texto(pdf.current_font.fontkey, valor) * escala
+        else:
+            deslocamento = PADDING_TABELA
+        pdf.text(x + deslocamento, base, valor)
+        x += largura
+    pdf.line(pdf.l_margin, y + ALTURA_LINHA_TABELA, x, y + ALTURA_LINHA_TABELA)
+    pdf.set_y(y + ALTURA_LINHA_TABELA)
+
+
+def _cabecalho_tabela(pdf, colunas, alinhamentos):
+    pdf.set_font(FONTE_PADRAO, "B", TAMANHO_TABELA)
+    pdf.rect(pdf.l_margin, pdf.y, sum(largura for _, largura in colunas), ALTURA_LINHA_TABELA, style="F")
+    _linha_tabela(pdf, colunas, [titulo for titulo, _ in colunas], alinhamentos)
+    pdf.set_font(FONTE_PADRAO, "", TAMANHO_TABELA)
+
+
+def _cabe(colunas, linhas, fonte):
+    """Se todos os textos (cabeçalho em negrito) cabem numa linha das suas colunas"""
+    escala = TAMANHO_TABELA / 72 * 25.4 / 1000
+    titulos = [titulo for titulo, _ in colunas]
+    return all(
+        largura_texto(fonte + ("B" if linha is titulos else ""), valor) * escala <= largura - 2 * PADDING_TABELA
+        for linha in [titulos, *linhas] for (_, largura), valor in zip(colunas, linha)
+    )
+
+
+def _tabela_fpdf(pdf, colunas, linhas):
+    """Tabela pela API de tabelas do FPDF2: textos longos quebram dentro da célula
+    (a linha cresce junto) e o cabeçalho se repete a cada página"""
+    with pdf.table(
+        col_widths=[largura for _, largura in colunas],
+        width=sum(largura for _, largura in colunas),
+        align="LEFT",
+        text_align=["LEFT"] + ["RIGHT"] * (len(colunas) - 1),
+        borders_layout="HORIZONTAL_LINES",
+        headings_style=FontFace(emphasis="BOLD", fill_color=COR_CABECALHO),
+        line_height=ALTURA_LINHA_TABELA - 2 * PADDING_TABELA,
+        padding=PADDING_TABELA,
+    ) as tabela:
+        tabela.row([titulo for titulo, _ in colunas])
+        for linha in linhas:
+            tabela.row(linha)
+
+
+def _tabela_direta(pdf, colunas, linhas):
+    """Tabela de linhas de altura fixa com o texto posto direto na página, para
+    quando tudo cabe numa linha (_cabe()), com o cabeçalho repetido a cada página"""
+    alinhamentos = ["L"] + ["R"] * (len(colunas) - 1)
+    pdf.set_fill_color(*COR_CABECALHO)
+    _cabecalho_tabela(pdf, colunas, alinhamentos)
+    for linha in linhas:
+        if pdf.will_page_break(ALTURA_LINHA_TABELA):
+            pdf.add_page()
+            _cabecalho_tabela(pdf, colunas, alinhamentos)
+        _linha_tabela(pdf, colunas, linha, alinhamentos)
+
+
+def _tabela(pdf, colunas, linhas):
+    """Tabela com a primeira coluna à esquerda e as demais à direita, quebra de
+    página automática e o cabeçalho repetido no topo de cada página.
+
+    Com todos os textos cabendo nas colunas (o normal: datas, dias e valores),
+    as linhas são postas direto na página (_tabela_direta); se algum texto
+    precisar quebrar, a tabela inteira sai pela API de tabelas do FPDF2
+    (_tabela_fpdf), que mede e desenha cada célula com multi_cell e custa
+    várias vezes mais (benchmarks/relatorios.py mede os dois caminhos).
+    """
+    colunas = [(_latin1(titulo), largura) for titulo, largura in colunas]
+    linhas = [[_latin1(valor) for valor in linha] for linha in linhas]
+    pdf.set_font(FONTE_PADRAO, "", TAMANHO_TABELA)
+    pdf.set_draw_color(*COR_LINHAS)
+    pdf.set_line_width(0.2)
+    if _cabe(colunas, linhas, pdf.current_font.fontkey):
+        _tabela_direta(pdf, colunas, linhas)
+    else:
+        _tabela_fpdf(pdf, colunas, linhas)
+    pdf.set_draw_color(0)
+    pdf.set_font(FONTE_PADRAO, "", 10)
+
+
+def escrever_relatorio(pdf, res, faixas, numero_processo, nome_autor="", nome_reu="", observacao=None,
+                       logo=None, fonte_obs="DejaVu", tam_obs=8):
+    """Acrescenta ao documento o relatório de um caso, a partir de uma página nova.
+
+    res é o ResultadoMulta (ou o dict equivalente) e faixas, as Faixa (ou dicts)
+    do caso; as tabelas saem de res['correcao'] (tabela_correcao()). Sem
+    data_despacho no resultado, a seção do início da multa é omitida.
+    """
+    # como_dict() e não isinstance: com `python calculo_multa.py`, as classes vêm de __main__
+    if hasattr(res, 'como_dict'):
+        res = res.como_dict()
+    faixas = [faixa.como_dict() if hasattr(faixa, 'como_dict') else faixa for faixa in faixas]
+    correcao = res.get('correcao')
+    if correcao is None:
+        correcao = tabela_correcao(faixas, res['indices'])
+
+    pdf.add_page()
+    pdf.set_font(FONTE_PADRAO, "B", 12)
+    pdf.start_section(_latin1(f"Processo {numero_processo}" if numero_processo else TITULO))
+    if logo:
+        imagem = pdf.image(logo, x=(190 - LARGURA_LOGO_MM) / 2 + 10, y=TOPO_LOGO_MM, w=LARGURA_LOGO_MM)
+        pdf.set_y(TOPO_LOGO_MM + imagem.rendered_height + ESPACO_LOGO_MM)
+    else:
+        _linha(pdf, TITULO, 8, align="C")
+        pdf.ln(5)
+
+    pdf.set_font(FONTE_PADRAO, "", 11)
+    _linha(pdf, f"Número do Processo: {numero_processo}")
+    _linha(pdf, f"Autor: {nome_autor}")
+    _linha(pdf, f"Réu: {nome_reu}")
+    pdf.ln(10)
+    if logo:
+        pdf.set_font(FONTE_PADRAO, "B", 12)
+        _linha(pdf, TITULO, 8, align="C")
+        pdf.ln(5)
+
+    if res.get('data_despacho'):
+        _secao(pdf, "Cálculo do Início da Multa:")
+        _rotulos(pdf, (
+            ("Data do despacho/intimação:", res['data_despacho'].strftime('%d/%m/%Y')),
+            ("Prazo para cumprimento:", f"{res['prazo_cumprimento']} {res['tipo_prazo'].lower()}"),
+            ("Fim do prazo:", res['data_fim_prazo'].strftime('%d/%m/%Y')),
+            ("Início da multa:", res['data_inicio_multa'].strftime('%d/%m/%Y')),
+        ))
+        pdf.ln(5)
+
+    _secao(pdf, "Detalhamento das Faixas:")
+    contribuicoes = resumo_faixas(correcao, len(faixas))
+    dias_faixas, centavos_faixas = contribuicoes['dias'].tolist(), contribuicoes['base_centavos'].tolist()
+    _tabela(pdf, COLUNAS_FAIXAS, [
+        (
+            str(i + 1),
+            f"{faixa['inicio'].strftime('%d/%m/%Y')} a {faixa['fim'].strftime('%d/%m/%Y')}",
+            f"{dias} {'úteis' if faixa.get('dias_uteis', False) else 'corridos'}",
+            f"{moeda_br(faixa['valor'])}/dia",
+            moeda_br(centavos / 100),
+        )
+        for i, (faixa, dias, centavos) in enumerate(zip(faixas, dias_faixas, centavos_faixas))
+    ])
+    pdf.ln(5)
+
+    _secao(pdf, "Atualização da multa:")
+    _rotulos(pdf, (
+        ("Data de atualização:", res['data_atualizacao'].strftime('%d/%m/%Y')),
+        ("Total de dias em atraso:", f"{res['total_dias']}"),
+        ("Multa sem correção:", moeda_br(correcao['base_centavos'].sum() / 100)),
+    ))
+    pdf.ln(5)
+
+    _secao(pdf, "Correção mês a mês:")
+    _tabela(pdf, COLUNAS_MESES, linhas_meses(correcao))
+    pdf.ln(5)
+
+    pdf.set_font(FONTE_PADRAO, "B", 10)
+    pdf.cell(90, 6, "Multa corrigida:")
+    _linha(pdf, moeda_br(correcao['corrigido_centavos'].sum() / 100))
+    pdf.ln(8)
+
+    if observacao and str(observacao).strip():
+        pdf.ln(3)
+        texto = f"Observação: {str(observacao).strip()}"
+        unicode_ok = _usar_fonte_observacao(pdf, texto, fonte_obs, tam_obs)
+        pdf.multi_cell(0, 3, texto if unicode_ok else _latin1(texto))
+
+    pdf.ln(8)
+    pdf.set_font(FONTE_PADRAO, "I", 8)
+    _linha(pdf, NOTA_SELIC, altura=4)
+    _linha(pdf, NOTA_CENTAVOS, altura=4)
+    pdf.ln(8)
+    pdf.set_font(FONTE_PADRAO, "", 10)
+    _linha(pdf, ASSINATURA)
+    return pdf
+
+
+def gerar_relatorio(res, faixas, numero_processo, nome_autor="", nome_reu="", observacao=None,
+                    logo=None, fonte_obs="DejaVu", tam_obs=8):
+    """PDF (bytes) com o relatório de um caso"""
+    pdf = novo_documento()
+    escrever_relatorio(pdf, res, faixas, numero_processo, nome_autor, nome_reu, observacao, logo, fonte_obs, tam_obs)
+    return bytes(pdf.output())
+
+
+def _ler_logo(logo):
+    """Bytes da logo (caminho, bytes ou BytesIO), para reaproveitar em vários relatórios"""
+    if logo is None or isinstance(logo, bytes):
+        return logo
+    if isinstance(logo, (str, os.PathLike)):
+        with open(logo, 'rb') as arquivo:
+            return arquivo.read()
+    return logo.getvalue()
+
+
+def gerar_relatorios(relatorios, logo=None, fonte_obs="DejaVu", tam_obs=8):
+    """Um PDF (bytes) com o relatório de cada caso, um a partir de cada página nova
+    e com um marcador por processo. relatorios são dicts com res, faixas,
+    numero_processo e, opcionalmente, nome_autor, nome_reu e observacao; a logo
+    e as fontes entram no documento uma vez só"""
+    logo = _ler_logo(logo)
+    pdf = novo_documento()
+    for relatorio in relatorios:
+        escrever_relatorio(
+            pdf, relatorio['res'], relatorio['faixas'], relatorio['numero_processo'],
+            relatorio.get('nome_autor', ""), relatorio.get('nome_reu', ""), relatorio.get('observacao'),
+            io.BytesIO(logo) if logo else None, fonte_obs, tam_obs,
+        )
+    if not pdf.pages:
+        pdf.add_page()
+    return bytes(pdf.output())
+
+
+def gerar_zip_relatorios(relatorios, logo=None, fonte_obs="DejaVu", tam_obs=8, nome_arquivo=None):
+    """ZIP com um PDF por caso; nome_arquivo(relatorio) dá o nome de cada PDF"""
+    logo = _ler_logo(logo)
+    nome_arquivo = nome_arquivo or (lambda relatorio: f"relatorio_{relatorio['numero_processo']}.pdf")
+    saida = io.BytesIO()
+    with zipfile.ZipFile(saida, 'w', zipfile.ZIP_DEFLATED) as arquivo_zip:
+        for relatorio in relatorios:
+            arquivo_zip.writestr(nome_arquivo(relatorio), gerar_relatorio(
+                relatorio['res'], relatorio['faixas'], relatorio['numero_processo'],
+                relatorio.get('nome_autor', ""), relatorio.get('nome_reu', ""), relatorio.get('observacao'),
+                io.BytesIO(logo) if logo else None, fonte_obs, tam_obs,
+            ))
+    return saida.getvalue()
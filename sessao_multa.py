@@ -0,0 +1,131 @@
+"""Arquivo de sessão das calculadoras de multa: JSON compacto, colunar e comprimido com gzip.
+
+O formato antigo (JSON indentado em base64, num .txt) continua sendo lido. O
+novo grava um cabeçalho com formato e versão, as datas das faixas em colunas
+de dias desde 1970-01-01 e os índices como pares de listas meses/valores, tudo
+em gzip. Na leitura o gzip é descomprimido em fluxo direto para o json e as
+datas de todas as faixas são convertidas de uma vez pelo numpy.
+"""
+import base64
+import gzip
+import io
+import json
+from datetime import date
+
+import numpy as np
+
+FORMATO_SESSAO = "calculadora-multa"
+VERSAO_SESSAO = 2
+EXTENSAO_SESSAO = ".multa.gz"
+NIVEL_GZIP = 6
+CAMPOS_DATA = ("data_despacho", "data_atualizacao")
+CAMPOS_INDICES = ("indices_selic", "indices_manuais")
+
+
+def _dias(datas):
+    """Datas em dias desde 1970-01-01"""
+    return np.array(datas, dtype='datetime64[D]').astype(np.int64).tolist()
+
+
+def _datas(dias):
+    """Dias desde 1970-01-01 de volta para date"""
+    return np.array(dias, dtype=np.int64).astype('datetime64[D]').astype(date).tolist()
+
+
+def serializar_sessao(dados):
+    """Bytes do arquivo de sessão (versão atual) a partir do dict das calculadoras:
+    datas como date, faixas como lista de dicts e índices como dicts"""
+    faixas = dados.get("faixas", [])
+    conteudo = {chave: valor for chave, valor in dados.items() if chave not in CAMPOS_DATA + CAMPOS_INDICES + ("faixas",)}
+    conteudo.update({
+        "formato": FORMATO_SESSAO,
+        "versao": VERSAO_SESSAO,
+        **{campo: dados[campo].isoformat() for campo in CAMPOS_DATA if campo in dados},
+        "faixas": {
+            "inicio": _dias([faixa["inicio"] for faixa in faixas]),
+            "fim": _dias([faixa["fim"] for faixa in faixas]),
+            "valor": [float(faixa["valor"]) for faixa in faixas],
+            "dias_uteis": [int(bool(faixa.get("dias_uteis", False))) for faixa in faixas],
+            "dias_abatidos": [int(faixa.get("dias_abatidos", 0)) for faixa in faixas],
+        },
+        **{
+            campo: {"chaves": list(dados.get(campo, {})), "valores": list(dados.get(campo, {}).values())}
+            for campo in CAMPOS_INDICES
+        },
+    })
+    texto = json.dumps(conteudo, ensure_ascii=False, separators=(",", ":"))
+    return gzip.compress(texto.encode("utf-8"), compresslevel=NIVEL_GZIP, mtime=0)
+
+
+def _ler_versao_atual(conteudo):
+    """Dict das calculadoras a partir do JSON da versão atual"""
+    if conteudo.get("formato") != FORMATO_SESSAO:
+        raise ValueError("Arquivo não é uma sessão da calculadora de multa")
+    if conteudo.get("versao", 0) > VERSAO_SESSAO:
+        raise ValueError(f"Sessão gravada por uma versão mais nova (formato {conteudo['versao']})")
+    colunas = conteudo.pop("faixas")
+    faixas = [
+        {"inicio": inicio, "fim": fim, "valor": valor, "dias_uteis": bool(uteis), "dias_abatidos": abatidos}
+        for inicio, fim, valor, uteis, abatidos in zip(
+            _datas(colunas["inicio"]), _datas(colunas["fim"]), colunas["valor"],
+            colunas["dias_uteis"], colunas["dias_abatidos"],
+        )
+    ]
+    dados = {chave: valor for chave, valor in conteudo.items() if chave not in ("formato", "versao")}
+    dados["faixas"] = faixas
+    for campo in CAMPOS_INDICES:
+        pares = conteudo.get(campo) or {"chaves": [], "valores": []}
+        dados[campo] = dict(zip(pares["chaves"], pares["valores"]))
+    return dados
+
+
+def _ler_versao_1(conteudo):
+    """Dict das calculadoras a partir do JSON antigo (datas em ISO, faixa a faixa)"""
+    dados = dict(conteudo)
+    dados["faixas"] = [
+        {
+            "inicio": date.fromisoformat(faixa["inicio"]),
+            "fim": date.fromisoformat(faixa["fim"]),
+            "valor": faixa["valor"],
+            "dias_uteis": faixa.get("dias_uteis", False),
+            "dias_abatidos": faixa.get("dias_abatidos", 0),
+        }
+        for faixa in conteudo.get("faixas", [])
+    ]
+    for campo in CAMPOS_INDICES:
+        dados[campo] = conteudo.get(campo, {})
+    return dados
+
+
+def ler_sessao(conteudo):
+    """Dict das calculadoras (datas como date) a partir dos bytes de um arquivo de
+    sessão: gzip da versão atual ou o .txt em base64 das versões antigas"""
+    if isinstance(conteudo, str):
+        conteudo = conteudo.encode("utf-8")
+    if conteudo[:2] == b"\x1f\x8b":
+        with gzip.GzipFile(fileobj=io.BytesIO(conteudo)) as arquivo:
+            dados = _ler_versao_atual(json.load(arquivo))
+    else:
+        dados = _ler_versao_1(json.loads(base64.b64decode(conteudo.strip()).decode("utf-8")))
+    for campo in CAMPOS_DATA:
+        if campo in dados:
+            dados[campo] = date.fromisoformat(dados[campo])
+    return dados
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Arquivo de sessão das calculadoras de multa")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    converter = sub.add_parser("converter", help="regrava uma sessão antiga (.txt) no formato atual")
+    converter.add_argument("origem")
+    converter.add_argument("destino", nargs="?")
+    args = parser.parse_args()
+
+    with open(args.origem, "rb") as arquivo:
+        dados = ler_sessao(arquivo.read())
+    destino = args.destino or args.origem.rsplit(".", 1)[0] + EXTENSAO_SESSAO
+    with open(destino, "wb") as arquivo:
+        arquivo.write(serializar_sessao(dados))
+    print(f"{len(dados['faixas'])} faixas gravadas em {destino}")
@@ -0,0 +1,42 @@
+"""Configuração comum dos testes: módulos da raiz no caminho e série SELIC isolada por teste.
+
+tests/dados/selic.csv tem taxas fictícias de jan/2015 a dez/2025, no mesmo
+formato do CSV publicado; os testes nunca acessam a rede nem o banco do usuário.
+"""
+import os
+import shutil
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DADOS = os.path.join(RAIZ, "tests", "dados")
+sys.path.insert(0, RAIZ)
+
+
+def _limpar_caches_selic():
+    import indices_selic
+
+    for funcao in (indices_selic.serie_selic, indices_selic.fatores_selic,
+                   indices_selic.versao_serie, indices_selic._fatores_publicados):
+        funcao.cache_clear()
+
+
+@pytest.fixture
+def selic(tmp_path, monkeypatch):
+    """Banco SELIC vazio em tmp_path, alimentado no modo offline por uma cópia do
+    CSV de teste (a linha de comando regrava o CSV ao atualizar)"""
+    monkeypatch.setenv("SELIC_DIR", str(tmp_path / "selic"))
+    monkeypatch.setenv("SELIC_OFFLINE", "1")
+    monkeypatch.setenv("SELIC_CSV", shutil.copy(os.path.join(DADOS, "selic.csv"), str(tmp_path / "selic.csv")))
+    monkeypatch.setenv("SELIC_FATORES", str(tmp_path / "selic_fatores.csv"))
+    _limpar_caches_selic()
+    yield str(tmp_path / "selic")
+    _limpar_caches_selic()
+
+
+@pytest.fixture
+def selic_vazia(selic, tmp_path, monkeypatch):
+    """Modo offline sem CSV local e sem banco"""
+    monkeypatch.setenv("SELIC_CSV", str(tmp_path / "inexistente.csv"))
+    return selic
@@ -0,0 +1,87 @@
+"""Gera os HISCREs de amostra usados nos testes de paridade PyMuPDF x pdfplumber.
+
+Os PDFs ficam versionados em tests/dados; rode este script só para recriá-los
+(python tests/dados/gerar_amostras_hiscre.py). Dados fictícios, com o layout em
+colunas do HISCRE: a competência e as rubricas são células separadas, e as
+quebras de página caem no meio das rubricas de uma competência.
+"""
+import os
+from datetime import datetime, timezone
+
+from fpdf import FPDF
+
+DADOS = os.path.dirname(os.path.abspath(__file__))
+
+RUBRICAS = [
+    ("101", "VALOR TOTAL DE MR DO PERÍODO", "1.412,00"),
+    ("201", "IMPOSTO DE RENDA RETIDO NA FONTE", "35,10"),
+    ("216", "CONSIGNAÇÃO EMPRÉSTIMO BANCÁRIO", "250,33"),
+    ("104", "VALOR DO DÉCIMO-TERCEIRO SALÁRIO", "706,00"),
+]
+
+
+def _documento():
+    pdf = FPDF()
+    pdf.set_creation_date(datetime(2025, 1, 15, tzinfo=timezone.utc))
+    pdf.set_auto_page_break(True, margin=20)
+    pdf.set_font("Helvetica", size=9)
+    return pdf
+
+
+def _cabecalho(pdf, nome, nb):
+    pdf.cell(0, 5, f"Nome: {nome}", new_x="LMARGIN", new_y="NEXT")
+    pdf.cell(0, 5, f"NB: {nb}   Data de Nascimento: 01/01/1950", new_x="LMARGIN", new_y="NEXT")
+    pdf.cell(0, 5, "Compet. Inicial: 01/2018 Compet. Final: 12/2024", new_x="LMARGIN", new_y="NEXT")
+
+
+def _competencia(pdf, mes, ano, status):
+    pdf.cell(20, 5, f"{mes:02d}/{ano}")
+    pdf.cell(25, 5, f"01/{mes:02d}/{ano}")
+    pdf.cell(25, 5, f"28/{mes:02d}/{ano}")
+    pdf.cell(25, 5, status, new_x="LMARGIN", new_y="NEXT")
+    for rubrica, descricao, valor in RUBRICAS:
+        pdf.set_x(15)
+        pdf.cell(12, 5, rubrica)
+        pdf.cell(110, 5, descricao)
+        pdf.cell(35, 5, f"R$ {valor}", align="R", new_x="LMARGIN", new_y="NEXT")
+
+
+def _meses(inicio_ano, quantidade):
+    for i in range(quantidade):
+        yield i % 12 + 1, inicio_ano + i // 12
+
+
+def quebra_pagina():
+    """Três páginas de um benefício; competência e status ('Não Pago')
+    continuam de uma página para a outra"""
+    pdf = _documento()
+    pdf.add_page()
+    _cabecalho(pdf, "MARIA DAS GRAÇAS DA SILVA", "123.456.789-0")
+    for i, (mes, ano) in enumerate(_meses(2019, 28)):
+        _competencia(pdf, mes, ano, "Não Pago" if i in (9, 10, 20) else "Pago")
+    return pdf
+
+
+def dois_beneficios():
+    """Dois NBs no mesmo documento: as competências recomeçam no segundo"""
+    pdf = _documento()
+    pdf.add_page()
+    _cabecalho(pdf, "JOSE DE SOUZA", "111.222.333-4")
+    for mes, ano in _meses(2022, 12):
+        _competencia(pdf, mes, ano, "Pago")
+    _cabecalho(pdf, "JOSE DE SOUZA", "555.666.777-8")
+    for mes, ano in _meses(2020, 10):
+        _competencia(pdf, mes, ano, "Pago")
+    return pdf
+
+
+AMOSTRAS = {
+    "hiscre_quebra_pagina.pdf": quebra_pagina,
+    "hiscre_dois_beneficios.pdf": dois_beneficios,
+}
+
+
+if __name__ == "__main__":
+    for arquivo, gerar in AMOSTRAS.items():
+        gerar().output(os.path.join(DADOS, arquivo))
+        print(arquivo)
@@ -0,0 +1,148 @@
+import os
+import subprocess
+import sys
+from datetime import date
+
+import pytest
+
+from calculo_multa import (
+    CasoMulta,
+    Faixa,
+    _distribuicao_faixa,
+    calcular_multa,
+    limpar_cache_faixas,
+    linhas_meses,
+    moeda_br,
+    resumo_meses,
+    tabela_correcao,
+    totalizar_faixas,
+    totalizar_faixas_incremental,
+)
+from conftest import RAIZ
+
+
+def _caso(atualizacao):
+    return CasoMulta(
+        [Faixa(date(2024, 1, 10), date(2024, 3, 31), 100.0)],
+        date(2023, 12, 15), 15, atualizacao, "Dias corridos",
+    )
+
+
+def test_corrige_pela_serie_local(selic):
+    resultado = calcular_multa(_caso(date(2025, 6, 1)))
+    assert resultado.total_sem_correcao == 8200.0
+    assert resultado.total_corrigido > resultado.total_sem_correcao
+    assert all(indice > 0 for indice in resultado.indices.values())
+
+
+def test_serie_vazia_levanta_erro(selic_vazia):
+    with pytest.raises(ValueError, match="Nenhuma taxa SELIC"):
+        calcular_multa(_caso(date(2025, 6, 1)))
+
+
+def test_serie_antes_da_atualizacao_levanta_erro(selic):
+    with pytest.raises(ValueError, match="vai até 12/2025"):
+        calcular_multa(_caso(date(2026, 2, 1)))
+
+
+def test_indices_informados_dispensam_a_serie(selic_vazia):
+    caso = _caso(date(2026, 2, 1))
+    caso.indices = {"2024-01": 0.1, "2024-02": 0.1, "2024-03": 0.1}
+    assert calcular_multa(caso).total_corrigido == 9020.0
+
+
+def test_linha_de_comando_sai_com_erro_sem_serie(selic_vazia):
+    execucao = subprocess.run(
+        [sys.executable, os.path.join(RAIZ, "calculo_multa.py"), "calcular", "--despacho", "15/12/2023",
+         "--prazo", "15", "--corridos", "--faixas", "10/01/2024-31/03/2024:100", "--atualizacao", "01/06/2025"],
+        capture_output=True, text=True, env=os.environ.copy(),
+    )
+    assert execucao.returncode != 0
+    assert "Nenhuma taxa SELIC" in execucao.stderr
+    assert "R$" not in execucao.stdout
+
+
+def test_distribui_dias_corridos_pelos_meses():
+    faixas = [{'inicio': date(2024, 1, 15), 'fim': date(2024, 3, 10), 'valor': 10.0},
+              {'inicio': date(2024, 3, 1), 'fim': date(2024, 3, 31), 'valor': 1.0}]
+    totais, dias = totalizar_faixas(faixas)
+    assert dict(totais) == {"2024-01": 170.0, "2024-02": 290.0, "2024-03": 131.0}
+    assert dias == 56 + 31
+
+
+def test_dias_uteis_descontam_fins_de_semana_e_feriados_nacionais():
+    # Outubro de 2023: 22 dias de semana, com 12/10 (quinta) feriado nacional
+    totais, dias = totalizar_faixas([{'inicio': date(2023, 10, 1), 'fim': date(2023, 10, 31), 'valor': 1.0, 'dias_uteis': True}])
+    assert dias == 21 and dict(totais) == {"2023-10": 21.0}
+
+
+def test_dias_abatidos_reduzem_todos_os_meses_na_mesma_proporcao():
+    faixa = {'inicio': date(2024, 1, 1), 'fim': date(2024, 2, 29), 'valor': 60.0, 'dias_abatidos': 6}
+    totais, dias = totalizar_faixas([faixa])
+    assert dias == 54
+    assert totais["2024-01"] == pytest.approx(31 * 60 * 54 / 60) and totais["2024-02"] == pytest.approx(29 * 60 * 54 / 60)
+    assert sum(totais.values()) == pytest.approx(54 * 60.0)
+
+
+def test_faixa_invertida_ou_toda_abatida_nao_conta():
+    totais, dias = totalizar_faixas([
+        {'inicio': date(2024, 5, 10), 'fim': date(2024, 5, 1), 'valor': 100.0},
+        {'inicio': date(2024, 6, 1), 'fim': date(2024, 6, 3), 'valor': 100.0, 'dias_abatidos': 5},
+    ])
+    assert dias == 0 and sum(totais.values()) == 0.0
+
+
+def _faixas_reruns():
+    return [
+        {'inicio': date(2023, 1, 1), 'fim': date(2023, 2, 15), 'valor': 100.0, 'dias_uteis': True},
+        {'inicio': date(2023, 2, 16), 'fim': date(2023, 5, 31), 'valor': 50.0, 'dias_abatidos': 2},
+        {'inicio': date(2023, 6, 1), 'fim': date(2023, 6, 30), 'valor': 80.0},
+    ]
+
+
+def test_totais_incrementais_iguais_aos_completos():
+    limpar_cache_faixas()
+    faixas = _faixas_reruns()
+    assert totalizar_faixas_incremental(faixas) == totalizar_faixas(faixas)
+    faixas[1]['valor'] = 55.0
+    incremental, dias = totalizar_faixas_incremental(faixas)
+    completo, dias_completo = totalizar_faixas(faixas)
+    assert dias == dias_completo and list(incremental) == list(completo)
+    assert all(incremental[mes] == pytest.approx(completo[mes]) for mes in completo)
+
+
+def test_editar_uma_faixa_so_redistribui_aquela_faixa():
+    limpar_cache_faixas()
+    faixas = _faixas_reruns()
+    totalizar_faixas_incremental(faixas)
+    distribuidas = _distribuicao_faixa.cache_info().misses
+    totalizar_faixas_incremental(faixas)  # rerun sem mudança nas faixas (ex.: índice editado)
+    assert _distribuicao_faixa.cache_info().misses == distribuidas
+    faixas[2]['valor'] = 90.0
+    totalizar_faixas_incremental(faixas)
+    assert _distribuicao_faixa.cache_info().misses == distribuidas + 1
+
+
+def test_centavos_dos_meses_e_das_faixas_fecham_com_o_total():
+    # 31,00465 + 29,00435 + 31,00465 = 91,01365: os meses arredondados um a um somam 91,00
+    faixas = [{'inicio': date(2024, 1, 1), 'fim': date(2024, 3, 31), 'valor': 1.0}]
+    indices = {"2024-01": 0.00015, "2024-02": 0.00015, "2024-03": 0.00015}
+    correcao = tabela_correcao(faixas, indices)
+    resumo = resumo_meses(correcao)
+    assert int(correcao['corrigido_centavos'].sum()) == int(resumo['corrigido_centavos'].sum()) == 9101
+    isolados = [round(valor * 100) for valor in resumo['corrigido']]
+    assert sum(isolados) == 9100
+    assert sorted(int(c) - i for c, i in zip(resumo['corrigido_centavos'], isolados)) == [0, 0, 1]
+    assert resumo['acumulado_centavos'].iloc[-1] == 9101
+
+
+def test_linhas_meses_formatam_o_resumo_meses():
+    faixas = [{'inicio': date(2023, 11, 20), 'fim': date(2024, 2, 10), 'valor': 33.33, 'dias_uteis': True}]
+    correcao = tabela_correcao(faixas, {"2023-12": 0.1234, "2024-01": 0.1111})
+    resumo = resumo_meses(correcao)
+    assert linhas_meses(correcao) == [
+        (f"{linha.mes[5:]}/{linha.mes[:4]}", moeda_br(linha.base_centavos / 100), f"{linha.indice * 100:.2f}%",
+         moeda_br(linha.corrigido_centavos / 100), moeda_br(linha.acumulado_centavos / 100))
+        for linha in resumo.itertuples()
+    ]
+    assert [linha[0] for linha in linhas_meses(correcao)] == ["11/2023", "12/2023", "01/2024", "02/2024"]
@@ -0,0 +1,64 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+import calendario_forense
+from calculo_multa import limpar_cache_faixas, totalizar_faixas
+from calendario_forense import calcular_inicio_multa, contar_dias_uteis, feriados_periodo, periodos_locais, somar_dias_uteis
+
+
+@pytest.fixture
+def calendario(tmp_path, monkeypatch):
+    """Calendário forense de um CSV escrito pelo teste"""
+    def escrever(*linhas):
+        caminho = tmp_path / "calendario.csv"
+        caminho.write_text("\n".join(("inicio;fim;tipo;descricao;desde",) + linhas) + "\n", encoding="utf-8")
+        monkeypatch.setenv("CALENDARIO_FORENSE", str(caminho))
+        calendario_forense.recarregar_calendario()
+        limpar_cache_faixas()
+    yield escrever
+    monkeypatch.delenv("CALENDARIO_FORENSE")
+    calendario_forense.recarregar_calendario()
+    limpar_cache_faixas()
+
+
+def test_prazo_pula_feriado_local():
+    # 24/06/2024 (segunda) é São João no calendário distribuído
+    assert somar_dias_uteis(date(2024, 6, 21), 2) == date(2024, 6, 25)
+    assert contar_dias_uteis(date(2024, 6, 24), date(2024, 6, 28)) == 4
+
+
+def test_prazo_para_no_recesso():
+    assert calcular_inicio_multa(date(2024, 12, 18), 3, dias_uteis=True) == (date(2025, 1, 21), date(2025, 1, 22))
+    assert calcular_inicio_multa(date(2024, 12, 18), 3) == (date(2024, 12, 20), date(2024, 12, 21))
+
+
+def test_multa_em_dias_uteis_nao_desconta_feriado_local():
+    # Junho de 2024: 20 dias de semana, nenhum feriado nacional; 24/06 é só local
+    totais, dias = totalizar_faixas([{'inicio': date(2024, 6, 1), 'fim': date(2024, 6, 30), 'valor': 1.0, 'dias_uteis': True}])
+    assert dias == 20 and dict(totais) == {"2024-06": 20.0}
+    assert np.datetime64("2024-06-24") in feriados_periodo(2024, 2024)
+    assert np.datetime64("2024-06-24") not in feriados_periodo(2024, 2024, locais=False)
+
+
+def test_regras_do_csv(calendario):
+    calendario(
+        "15/08;;feriado;Anual desde 2020;2020",
+        "10/03/2021;;feriado;Só em 2021;",
+        "pascoa+60;;feriado;Corpus Christi;",
+        "28/12;05/01;suspensao;Recesso;",
+    )
+    assert periodos_locais(2019, 2019) == [(date(2019, 6, 20), date(2019, 6, 20), "Corpus Christi")]
+    assert [inicio for inicio, _, _ in periodos_locais(2021, 2021)] == [date(2021, 3, 10), date(2021, 6, 3), date(2021, 8, 15)]
+    assert periodos_locais(2021, 2021, "suspensao") == [
+        (date(2021, 1, 1), date(2021, 1, 5), "Recesso"), (date(2021, 12, 28), date(2021, 12, 31), "Recesso"),
+    ]
+    # 10/03/2021 (quarta) não é útil para o prazo
+    assert somar_dias_uteis(date(2021, 3, 9), 2) == date(2021, 3, 11)
+
+
+def test_tipo_invalido_no_csv(calendario):
+    calendario("01/05;;ferias;Tipo errado;")
+    with pytest.raises(ValueError, match="Tipo de período inválido"):
+        periodos_locais(2024, 2024)
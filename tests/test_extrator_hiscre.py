@@ -0,0 +1,148 @@
+import os
+from collections import Counter
+
+import pytest
+
+import extrator_hiscre
+from conftest import DADOS
+
+pytest.importorskip("pymupdf")
+
+AMOSTRAS = ["hiscre_quebra_pagina.pdf", "hiscre_dois_beneficios.pdf"]
+
+
+def _amostra(arquivo):
+    return extrator_hiscre.ler_conteudo(os.path.join(DADOS, arquivo))
+
+
+def _extrair(conteudo, backend):
+    return extrator_hiscre.processar_paginas(extrator_hiscre.textos_paginas(conteudo, backend))
+
+
+def _iguais(a, b):
+    return a[:2] == b[:2] and a[2].equals(b[2])
+
+
+@pytest.mark.parametrize("arquivo", AMOSTRAS)
+def test_pymupdf_e_pdfplumber_extraem_as_mesmas_linhas(arquivo):
+    conteudo = _amostra(arquivo)
+    pymupdf, pdfplumber = _extrair(conteudo, 'pymupdf'), _extrair(conteudo, 'pdfplumber')
+    assert _iguais(pymupdf, pdfplumber)
+    assert len(pymupdf[2]) > 0 and pymupdf[2][['competencia', 'status', 'nb', 'nome']].notna().all().all()
+
+
+def test_competencia_e_status_atravessam_a_quebra_de_pagina():
+    _, nbs, registros, _ = _extrair(_amostra("hiscre_quebra_pagina.pdf"), 'pymupdf')
+    assert nbs == ["123.456.789-0"]
+    por_pagina = registros.groupby('pagina')
+    assert list(por_pagina.size().index) == [1, 2, 3]
+    # A página 3 começa pelas duas últimas rubricas de 09/2020 (Não Pago)
+    inicio = por_pagina.head(2).query("pagina == 3")
+    assert inicio['rubrica'].tolist() == ["216", "104"]
+    assert set(inicio['competencia']) == {"09/2020"} and set(inicio['status']) == {"Não Pago"}
+    assert registros.groupby('competencia').size().eq(4).all()
+
+
+def test_competencias_recomecam_no_segundo_beneficio():
+    _, nbs, registros, _ = _extrair(_amostra("hiscre_dois_beneficios.pdf"), 'pymupdf')
+    assert nbs == ["111.222.333-4", "555.666.777-8"]
+    assert registros.groupby('nb')['competencia'].nunique().tolist() == [12, 10]
+
+
+@pytest.mark.parametrize("arquivo", AMOSTRAS)
+def test_janelas_de_uma_pagina_dao_o_mesmo_resultado(arquivo):
+    conteudo = _amostra(arquivo)
+    janelas = extrator_hiscre.processar_baixa_memoria(conteudo, 'pymupdf', paginas_janela=1)
+    assert _iguais(janelas, _extrair(conteudo, 'pymupdf'))
+
+
+def test_pagina_com_linhas_reordenadas_e_relida_pelo_pdfplumber(monkeypatch):
+    conteudo = _amostra("hiscre_quebra_pagina.pdf")
+    original = extrator_hiscre._texto_por_palavras
+
+    def competencia_no_fim(pagina):
+        linhas = original(pagina).split('\n')
+        if pagina.number == 1:
+            linhas.append(linhas.pop(0))
+        return '\n'.join(linhas)
+
+    monkeypatch.setattr(extrator_hiscre, "_texto_por_palavras", competencia_no_fim)
+    pymupdf = dict(extrator_hiscre.textos_paginas(conteudo, 'pymupdf'))
+    pdfplumber = dict(extrator_hiscre.textos_paginas(conteudo, 'pdfplumber'))
+    assert pymupdf[2] == pdfplumber[2]
+    assert _iguais(_extrair(conteudo, 'pymupdf'), _extrair(conteudo, 'pdfplumber'))
+
+
+@pytest.mark.parametrize("texto, anterior, suspeita", [
+    ("01/2020 01/01/2020 31/01/2020 Pago\n101 VALOR R$ 1,00\n02/2020 01/02/2020 29/02/2020 Pago", None, False),
+    ("02/2020 01/02/2020 29/02/2020 Pago\n101 VALOR R$ 1,00\n01/2020 01/01/2020 31/01/2020 Pago", None, True),
+    ("101 VALOR R$ 1,00\n03/2020 01/03/2020 31/03/2020 Pago", (2020, 2), False),
+    ("101 VALOR R$ 1,00\n01/2020 01/01/2020 31/01/2020 Pago", (2020, 2), True),
+    ("NB: 555.666.777-8\n01/2018 01/01/2018 31/01/2018 Pago", (2020, 2), False),
+    ("01/2020 01/01/2020 31/01/2020 Pago 101 VALOR R$ 1,00", None, True),
+    ("R$ 1,00\n101 VALOR", None, True),
+    ("", None, True),
+])
+def test_heuristica_de_pagina_suspeita(texto, anterior, suspeita):
+    assert extrator_hiscre._pagina_suspeita(texto, anterior) is suspeita
+
+
+def test_extracao_incremental_da_o_mesmo_documento():
+    conteudo = _amostra("hiscre_quebra_pagina.pdf")
+    eventos = list(extrator_hiscre.extrair_documento_incremental(conteudo))
+    documento = extrator_hiscre.extrair_documento(conteudo)
+    final = eventos[-1]['documento']
+    assert (final['nome'], final['nbs']) == (documento['nome'], documento['nbs'])
+    assert final['registros'].equals(documento['registros'])
+    assert sum(len(evento['registros']) for evento in eventos) == len(documento['registros'])
+
+
+@pytest.mark.parametrize("linha, info", [
+    ("Nome: MARIA DAS GRAÇAS DA SILVA", {'nome': "MARIA DAS GRAÇAS DA SILVA"}),
+    ("Data de Nascimento: 01/01/1950 NB: 987.654.321-0", {'nbs': ["987.654.321-0"], 'ignorada': True}),
+    ("Compet. Inicial: 01/2005 Compet. Final: 12/2024", {'ignorada': True}),
+    ("15/Jan/2025 10:32:11 Página 3 de 300", {'ignorada': True}),
+    ("02/2020 01/02/2020 29/02/2020 Não Pago", {'competencia': "02/2020", 'status': "Não Pago"}),
+    ("01/2020 01/01/2020 31/01/2020 Pago", {'competencia': "01/2020", 'status': "Pago"}),
+    ("216 CONSIGNAÇÃO EMPRÉSTIMO BANCÁRIO R$ 250,33", {'rubrica': ("216", "CONSIGNAÇÃO EMPRÉSTIMO BANCÁRIO", "250,33")}),
+    ("104 VALOR DO DÉCIMO-TERCEIRO SALÁRIO R$1.412,00", {'rubrica': ("104", "VALOR DO DÉCIMO-TERCEIRO SALÁRIO", "1.412,00")}),
+    ("Líquido: R$ 1.126,57", {}),
+])
+def test_classificador_de_linhas(linha, info):
+    assert extrator_hiscre.classificar_linha(linha) == info
+
+
+def test_classificador_conta_os_tipos_de_linha():
+    contagem = Counter()
+    for linha in ["Nome: JOSE", "NB: 1.2-3", "01/2020 01/01/2020 31/01/2020 Pago", "101 VALOR R$ 1,00", "Banco: 001"]:
+        extrator_hiscre.classificar_linha(linha, contagem)
+    assert contagem == Counter(nome=1, nbs=1, competencia=1, status=1, rubrica=1, outra=1)
+
+
+def test_colunas_registros_se_comportam_como_a_lista():
+    registros = [
+        (1, "01/2020", "101", "VALOR", 1412.0, "Pago", "1.2-3", "JOSE"),
+        (1, "01/2020", "201", "IR", 35.1, "Pago", "1.2-3", "JOSE"),
+        (2, None, "101", "VALOR", 706.0, None, None, None),
+    ]
+    colunas = extrator_hiscre.ColunasRegistros()
+    for registro in registros:
+        colunas.append(registro)
+    assert len(colunas) == 3 and colunas[1:] == registros[1:]
+    lista = extrator_hiscre.finalizar_lote(extrator_hiscre.novo_lote(registros))[2]
+    df = colunas.para_dataframe()
+    assert df.equals(lista) and df.dtypes.equals(lista.dtypes)
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+def test_baixa_memoria_da_o_mesmo_documento(incremental):
+    conteudo = _amostra("hiscre_dois_beneficios.pdf")
+    normal = extrator_hiscre.extrair_documento(conteudo)
+    if incremental:
+        eventos = list(extrator_hiscre.extrair_documento_incremental(conteudo, baixa_memoria=True, paginas_janela=1))
+        documento = eventos[-1]['documento']
+    else:
+        documento = extrator_hiscre.extrair_documento(conteudo, baixa_memoria=True, paginas_janela=1)
+        assert documento['memoria']['pico_rss_mb'] is None or documento['memoria']['pico_rss_mb'] > 0
+    assert documento['registros'].equals(normal['registros'])
+    assert (documento['nome'], documento['nbs'], documento['contagem']) == (normal['nome'], normal['nbs'], normal['contagem'])
@@ -0,0 +1,114 @@
+import os
+import sqlite3
+import subprocess
+import sys
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import indices_selic
+from calculo_multa import calcular_multa
+from conftest import DADOS, RAIZ
+from lote_multa import _casos_exemplo, _interpretar_caso, processar_casos
+
+
+def _fatores_gravados(diretorio):
+    with sqlite3.connect(os.path.join(diretorio, "selic.sqlite3")) as conn:
+        return conn.execute("SELECT versao, inicio, fim, fator FROM fatores_acumulados ORDER BY inicio, fim").fetchall()
+
+
+def _csv_parcial(tmp_path, linhas):
+    with open(os.path.join(DADOS, "selic.csv"), encoding="utf-8") as arquivo:
+        parcial = arquivo.readlines()[:linhas]
+    caminho = tmp_path / "selic_parcial.csv"
+    caminho.write_text("".join(parcial), encoding="utf-8")
+    return str(caminho)
+
+
+def test_fatores_conferem_com_produto_das_taxas(selic):
+    serie = indices_selic.serie_selic()
+    fatores = indices_selic.fatores_acumulados([("2020-01", "2020-03"), ("2015-01", "2025-12")])
+    taxas = serie.set_index(serie['Data'].dt.strftime('%Y-%m'))['Taxa']
+    assert np.isclose(fatores[0], np.prod(1 + taxas.loc["2020-01":"2020-03"]), rtol=1e-12)
+    assert np.isclose(fatores[1], np.prod(1 + taxas), rtol=1e-12)
+    assert len(_fatores_gravados(selic)) == 2
+
+
+def test_lote_consulta_a_tabela_publicada(selic):
+    casos = _casos_exemplo(4)
+    resultados = processar_casos(casos, processos=1, gerar_pdf=False)
+    gravados = {(inicio, fim): fator for _, inicio, fim, fator in _fatores_gravados(selic)}
+    versoes = {versao for versao, *_ in _fatores_gravados(selic)}
+    assert versoes == {indices_selic.versao_serie()}
+    for caso, item in zip(casos, resultados):
+        res = item['resultado']
+        assert all((mes, "2025-06") in gravados for mes in res['meses_ordenados'])
+        individual = calcular_multa(_interpretar_caso(caso))
+        assert individual.total_corrigido == res['total_corrigido']
+
+
+def test_atualizacao_republica_os_pares_pedidos(selic, tmp_path, monkeypatch):
+    monkeypatch.setenv("SELIC_CSV", _csv_parcial(tmp_path, 120))
+    indices_selic.fatores_acumulados([("2020-01", "2024-06"), ("2024-01", "2024-12")])
+    versao_antiga = indices_selic.versao_serie()
+
+    assert indices_selic.importar_csv(os.path.join(DADOS, "selic.csv")) == 12
+    gravados = _fatores_gravados(selic)
+    assert {versao for versao, *_ in gravados} == {indices_selic.versao_serie()} != {versao_antiga}
+    assert [(inicio, fim) for _, inicio, fim, _ in gravados] == [("2020-01", "2024-06"), ("2024-01", "2024-12")]
+
+
+def test_linha_de_comando_exporta_a_tabela_na_atualizacao(selic, tmp_path):
+    indices_selic.fatores_acumulados([("2019-05", "2025-06")])
+    execucao = subprocess.run(
+        [sys.executable, os.path.join(RAIZ, "indices_selic.py"), "importar", os.path.join(DADOS, "selic.csv")],
+        capture_output=True, text=True, env=os.environ.copy(),
+    )
+    assert execucao.returncode == 0, execucao.stderr
+    publicados = pd.read_csv(tmp_path / "selic_fatores.csv", sep=';', dtype=str)
+    assert publicados[['inicio', 'fim']].values.tolist() == [["2019-05", "2025-06"]]
+    assert publicados['versao'].tolist() == [indices_selic.versao_serie()]
+
+
+def test_indices_de_fatores_ja_consultados(selic):
+    fatores = {("2024-01", "2024-03"): 1.05, ("2024-02", "2024-03"): 1.02}
+    indices = indices_selic.indices_correcao(["2024-02", "2024-01"], date(2024, 3, 20), fatores)
+    assert indices == pytest.approx({"2024-01": 5.0, "2024-02": 2.0})
+
+
+def test_offline_sem_csv_e_sem_banco_levanta_erro(selic_vazia):
+    with pytest.raises(ValueError, match="Nenhuma taxa SELIC.*modo offline"):
+        indices_selic.serie_selic()
+
+
+def test_csv_exportado_volta_a_mesma_serie(selic, tmp_path):
+    serie = indices_selic.serie_selic()
+    caminho = str(tmp_path / "exportado.csv")
+    assert indices_selic.exportar_csv(caminho) == len(serie) == 132
+    with open(caminho, encoding="utf-8") as arquivo:
+        texto = arquivo.read()
+    assert texto.startswith("jan/2015;0,0035\nfev/2015;0,0089\n")
+    pd.testing.assert_frame_equal(indices_selic.interpretar_csv(texto), serie)
+
+
+def test_prefixos_conferem_com_o_produto_mes_a_mes_mesmo_com_meses_faltando():
+    serie = pd.DataFrame({'Data': pd.to_datetime(["2020-01-01", "2020-02-01", "2020-05-01", "2020-06-01"]),
+                          'Taxa': [0.01, 0.02, 0.03, 0.04]})
+    pares = [("2020-01", "2020-06"), ("2020-03", "2020-04"), ("2019-11", "2020-02"),
+             ("2020-05", "2021-03"), ("2021-01", "2021-02"), ("2020-06", "2020-01")]
+    inicio = [indices_selic._numero_competencia(a) for a, _ in pares]
+    fim = [indices_selic._numero_competencia(b) for _, b in pares]
+    prefixos = indices_selic._fatores_prefixo(indices_selic.tabela_fatores(serie), inicio, fim)
+    np.testing.assert_allclose(prefixos, indices_selic._fatores_diretos(serie, pares), rtol=1e-14)
+    assert prefixos[0] == pytest.approx(1.01 * 1.02 * 1.03 * 1.04)
+    assert prefixos[1] == prefixos[4] == prefixos[5] == 1.0
+
+
+def test_competencia_posterior_a_atualizacao_nao_e_corrigida(selic):
+    indices = indices_selic.indices_correcao(["2025-05", "2025-06", "2025-07"], date(2025, 6, 10))
+    taxas = indices_selic.serie_selic().set_index('Data')['Taxa']
+    assert indices["2025-07"] == 0.0
+    assert indices["2025-06"] == pytest.approx(taxas[pd.Timestamp("2025-06-01")] * 100, rel=1e-12)
+    assert indices["2025-05"] == pytest.approx(((1 + taxas["2025-05":"2025-06"]).prod() - 1) * 100, rel=1e-12)
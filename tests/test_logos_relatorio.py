@@ -0,0 +1,65 @@
+import io
+
+import pytest
+from PIL import Image
+
+import logos_relatorio
+
+
+@pytest.fixture
+def logos(tmp_path, monkeypatch):
+    """Diretório de logos vazio em tmp_path, sem nada preparado em memória"""
+    monkeypatch.setattr(logos_relatorio, "DIRETORIO_LOGOS", str(tmp_path))
+    logos_relatorio.preparar_logo.cache_clear()
+    yield tmp_path
+    logos_relatorio.preparar_logo.cache_clear()
+
+
+def _png_transparente(largura, altura):
+    imagem = Image.new("RGBA", (largura, altura), (0, 0, 0, 0))
+    imagem.paste((200, 0, 0, 255), (0, 0, largura // 2, altura))
+    saida = io.BytesIO()
+    imagem.save(saida, format="PNG")
+    return saida.getvalue()
+
+
+def test_logo_vira_jpeg_reduzido_sobre_fundo_branco(logos):
+    (logos / "logo.png").write_bytes(_png_transparente(2000, 400))
+    imagem = Image.open(io.BytesIO(logos_relatorio.preparar_logo("logo.png")))
+    assert imagem.format == "JPEG" and imagem.mode == "RGB"
+    assert imagem.size == (630, 126)  # 80 mm a 200 dpi
+    vermelho, branco = imagem.getpixel((10, 60)), imagem.getpixel((620, 60))
+    assert vermelho[0] > 180 and vermelho[1] < 40 and min(branco) > 245
+
+
+def test_logo_pequena_nao_e_ampliada(logos):
+    (logos / "logo.png").write_bytes(_png_transparente(100, 50))
+    assert Image.open(io.BytesIO(logos_relatorio.preparar_logo("logo.png"))).size == (100, 50)
+
+
+def test_logo_preparada_uma_vez_e_entregue_em_memoria(logos):
+    (logos / "logo.png").write_bytes(_png_transparente(300, 100))
+    primeira = logos_relatorio.logo_pdf("logo.png")
+    (logos / "logo.png").unlink()
+    segunda = logos_relatorio.logo_pdf("logo.png")
+    assert primeira is not segunda and primeira.getvalue() == segunda.getvalue()
+
+
+def test_logo_ausente_e_baixada_do_repositorio(logos, monkeypatch):
+    import requests
+
+    pedidos = []
+
+    class Resposta:
+        content = _png_transparente(50, 50)
+
+        def raise_for_status(self):
+            pass
+
+    def get(url, timeout):
+        pedidos.append(url)
+        return Resposta()
+
+    monkeypatch.setattr(requests, "get", get)
+    assert Image.open(io.BytesIO(logos_relatorio.preparar_logo("remota.png"))).size == (50, 50)
+    assert pedidos == [logos_relatorio.URL_LOGOS + "remota.png"]
@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import RAIZ
+from lote_multa import _casos_exemplo, processar_casos
+
+
+def test_lote_corrigido_pela_serie_local(selic):
+    resultados = processar_casos(_casos_exemplo(5), processos=1, gerar_pdf=False)
+    assert [item['erro'] for item in resultados] == [None] * 5
+    assert all(item['resultado']['total_corrigido'] > item['resultado']['total_sem_correcao'] for item in resultados)
+
+
+def test_serie_vazia_falha_o_lote_inteiro(selic_vazia):
+    with pytest.raises(ValueError, match="Nenhuma taxa SELIC"):
+        processar_casos(_casos_exemplo(3), processos=1, gerar_pdf=False)
+
+
+def test_atualizacao_alem_da_serie_falha_o_lote_inteiro(selic):
+    casos = _casos_exemplo(3)
+    casos[1]['atualizacao'] = "01/03/2026"
+    with pytest.raises(ValueError, match="vai até 12/2025"):
+        processar_casos(casos, processos=1, gerar_pdf=False)
+
+
+def test_data_invalida_continua_erro_do_caso(selic):
+    casos = _casos_exemplo(2)
+    casos[0]['atualizacao'] = "amanhã"
+    resultados = processar_casos(casos, processos=1, gerar_pdf=False)
+    assert "Data inválida" in resultados[0]['erro']
+    assert resultados[1]['erro'] is None
+
+
+def test_linha_de_comando_nao_grava_lote_sem_serie(selic_vazia, tmp_path):
+    planilha = tmp_path / "casos.csv"
+    planilha.write_text(
+        "processo;despacho;prazo;faixas;atualizacao\n0800001;15/12/2023;15;10/01/2024-31/03/2024:100;01/06/2025\n",
+        encoding="utf-8",
+    )
+    saida = tmp_path / "saida"
+    execucao = subprocess.run(
+        [sys.executable, os.path.join(RAIZ, "lote_multa.py"), "calcular", str(planilha), "--saida", str(saida)],
+        capture_output=True, text=True, env=os.environ.copy(),
+    )
+    assert execucao.returncode != 0
+    assert "Nenhuma taxa SELIC" in execucao.stderr
+    assert not saida.exists()
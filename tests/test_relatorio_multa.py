@@ -0,0 +1,72 @@
+from datetime import date
+
+import pymupdf
+
+import relatorio_multa
+from calculo_multa import NOTA_CENTAVOS, CasoMulta, Faixa, calcular_multa, calcular_resultado, moeda_br
+
+
+def _relatorio(meses=12, observacao=None):
+    inicio = date(2015, 1, 1)
+    fim = date(2015 + (meses - 1) // 12, (meses - 1) % 12 + 1, 28)
+    faixas = [Faixa(inicio, fim, 123.45)]
+    caso = CasoMulta(faixas, date(2014, 12, 1), 15, date(2025, 1, 1), "Dias corridos", indices={})
+    return calcular_multa(caso), faixas
+
+
+def _paginas(conteudo):
+    with pymupdf.open(stream=conteudo, filetype="pdf") as documento:
+        return [pagina.get_text() for pagina in documento]
+
+
+def test_tabela_longa_quebra_pagina_e_repete_cabecalho():
+    res, faixas = _relatorio(meses=120)
+    paginas = _paginas(relatorio_multa.gerar_relatorio(res, faixas, "0800001-00.2020.4.05.8300"))
+    assert len(paginas) >= 3
+    com_meses = [texto for texto in paginas if "/2019" in texto or "/2022" in texto]
+    assert com_meses and all("Mês/Ano" in texto and "Acumulado" in texto for texto in com_meses)
+    texto = "".join(paginas)
+    assert all(f"{mes:02d}/{ano}" in texto for ano in range(2015, 2025) for mes in range(1, 13))
+    assert " ".join(NOTA_CENTAVOS.split()[-6:]) in " ".join(texto.split())
+
+
+def test_texto_longo_quebra_dentro_da_celula():
+    pdf = relatorio_multa.novo_documento()
+    pdf.add_page()
+    longo = "Faixa suspensa por decisão liminar no agravo de instrumento"
+    colunas = (("Descrição", 40), ("Valor", 30))
+    relatorio_multa._tabela(pdf, colunas, [(longo, "R$ 1,00"), ("curta", "R$ 2,00")])
+    with pymupdf.open(stream=bytes(pdf.output()), filetype="pdf") as documento:
+        palavras = documento[0].get_text("words")
+    descricao = [p for p in palavras if p[4] in longo.split()]
+    assert {p[4] for p in descricao} == set(longo.split())
+    assert max(p[2] for p in descricao) <= pdf.l_margin * 72 / 25.4 + 40 * 72 / 25.4
+    assert len({round(p[3]) for p in descricao}) > 1  # mais de uma linha
+
+
+def test_textos_que_cabem_ficam_numa_linha():
+    pdf = relatorio_multa.novo_documento()
+    pdf.add_page()
+    relatorio_multa._tabela(pdf, (("Mês/Ano", 30), ("Base", 42)), [("01/2024", "R$ 1.234,56")])
+    assert pdf.y == 10 + 2 * relatorio_multa.ALTURA_LINHA_TABELA
+
+
+def test_varios_casos_num_pdf_com_um_marcador_cada():
+    relatorios = []
+    for i in range(3):
+        res, faixas = _relatorio(meses=6 + i)
+        relatorios.append({'res': res, 'faixas': faixas, 'numero_processo': f"080000{i}", 'observacao': "Observação — ok"})
+    with pymupdf.open(stream=relatorio_multa.gerar_relatorios(relatorios), filetype="pdf") as documento:
+        marcadores = [titulo for _, titulo, _ in documento.get_toc()]
+        texto = "".join(pagina.get_text() for pagina in documento)
+    assert marcadores == ["Processo 0800000", "Processo 0800001", "Processo 0800002"]
+    assert texto.count("Multa corrigida") == 3
+
+
+def test_pdf_usa_as_faixas_do_calculo():
+    faixas = [{'inicio': date(2024, 1, 1), 'fim': date(2024, 1, 31), 'valor': 123.45, 'dias_uteis': False, 'dias_abatidos': 0}]
+    res = calcular_resultado(faixas, date(2023, 12, 1), 15, "Dias corridos", date(2025, 1, 1), indices={})
+    faixas[0]['valor'] = 999.0  # faixa editada na tela depois do cálculo
+    faixas.append({**faixas[0], 'inicio': date(2024, 2, 1), 'fim': date(2024, 2, 29)})
+    texto = "".join(_paginas(relatorio_multa.gerar_relatorio(res, res['faixas'], "0800001-00.2020.4.05.8300")))
+    assert moeda_br(123.45) in texto and moeda_br(999.0) not in texto
@@ -0,0 +1,77 @@
+import base64
+import gzip
+import json
+import os
+import subprocess
+import sys
+from datetime import date
+
+import pytest
+
+from conftest import RAIZ
+from sessao_multa import EXTENSAO_SESSAO, ler_sessao, serializar_sessao
+
+SESSAO = {
+    "data_despacho": date(2023, 12, 15),
+    "prazo_cumprimento": 15,
+    "tipo_prazo": "Dias úteis",
+    "faixas": [
+        {"inicio": date(2024, 1, 10), "fim": date(2024, 3, 31), "valor": 100.0, "dias_uteis": True, "dias_abatidos": 2},
+        {"inicio": date(2024, 4, 1), "fim": date(2024, 4, 30), "valor": 75.5, "dias_uteis": False, "dias_abatidos": 0},
+    ],
+    "data_atualizacao": date(2025, 6, 1),
+    "indices_selic": {"2024-01": 12.5, "2024-02": 11.75},
+    "indices_manuais": {"indice_2024-02": 11.0},
+    "numero_processo": "0800001-00.2020.4.05.8300",
+    "nome_autor": "José da Silva",
+    "observacao": "",
+}
+
+
+def _sessao_antiga(dados):
+    """.txt das calculadoras antigas: JSON indentado, datas em ISO, em base64"""
+    conteudo = {**dados, "data_despacho": dados["data_despacho"].isoformat(),
+                "data_atualizacao": dados["data_atualizacao"].isoformat()}
+    conteudo["faixas"] = [{**f, "inicio": f["inicio"].isoformat(), "fim": f["fim"].isoformat()} for f in dados["faixas"]]
+    return base64.b64encode(json.dumps(conteudo, ensure_ascii=False, indent=2).encode("utf-8"))
+
+
+def test_sessao_volta_igual():
+    arquivo = serializar_sessao(SESSAO)
+    assert arquivo[:2] == b"\x1f\x8b"
+    assert ler_sessao(arquivo) == SESSAO
+    assert serializar_sessao(SESSAO) == arquivo  # sem data no cabeçalho do gzip
+
+
+def test_faixas_em_colunas():
+    conteudo = json.loads(gzip.decompress(serializar_sessao(SESSAO)))
+    assert (conteudo["formato"], conteudo["versao"]) == ("calculadora-multa", 2)
+    assert conteudo["faixas"]["inicio"] == [19732, 19814]
+    assert conteudo["faixas"]["dias_uteis"] == [1, 0]
+    assert conteudo["indices_selic"] == {"chaves": ["2024-01", "2024-02"], "valores": [12.5, 11.75]}
+
+
+@pytest.mark.parametrize("como_texto", [False, True])
+def test_le_sessao_antiga_em_base64(como_texto):
+    antiga = _sessao_antiga(SESSAO)
+    assert ler_sessao(antiga.decode("ascii") + "\n" if como_texto else antiga) == SESSAO
+
+
+@pytest.mark.parametrize("cabecalho, mensagem", [
+    ({"formato": "outra-coisa", "versao": 2}, "não é uma sessão"),
+    ({"formato": "calculadora-multa", "versao": 99}, "versão mais nova"),
+])
+def test_recusa_arquivo_desconhecido(cabecalho, mensagem):
+    with pytest.raises(ValueError, match=mensagem):
+        ler_sessao(gzip.compress(json.dumps({**cabecalho, "faixas": {}}).encode("utf-8")))
+
+
+def test_linha_de_comando_converte_sessao_antiga(tmp_path):
+    origem = tmp_path / "sessao.txt"
+    origem.write_bytes(_sessao_antiga(SESSAO))
+    execucao = subprocess.run(
+        [sys.executable, os.path.join(RAIZ, "sessao_multa.py"), "converter", str(origem)],
+        capture_output=True, text=True,
+    )
+    assert execucao.returncode == 0, execucao.stderr
+    assert ler_sessao((tmp_path / ("sessao" + EXTENSAO_SESSAO)).read_bytes()) == SESSAO